@@ -11,6 +11,7 @@ bg = None
 
 import sys
 import utils
+import imagenes
 from mundo import Mundo
 import actores
 import fondos
@@ -55,7 +56,7 @@ def iniciar(ancho=640, alto=480, titulo='Pilas', usar_motor='sugar',
     :ancho: el tamaño en pixels para la ventana.
     :alto: el tamaño en pixels para la ventana.
     :titulo: el titulo a mostrar en la ventana.
-    :usar_motor: el motor multimedia a utilizar, puede ser 'qt' o 'qtgl'.
+    :usar_motor: el motor multimedia a utilizar, puede ser 'sugar' o 'sin_ventana'.
     :rendimiento: cantidad de cuadros por segundo a mostrar.
     :modo: si se utiliza modo interactivo o no.
     :economico: si tiene que evitar consumir muchos recursos de procesador
@@ -69,6 +70,10 @@ def iniciar(ancho=640, alto=480, titulo='Pilas', usar_motor='sugar',
     if motor == None:
         motor = __crear_motor(usar_motor)
 
+    # Las imagenes cargadas pertenecen al motor anterior.
+    imagenes.cache.limpiar()
+    utils.indice_de_recursos.construir()
+
     mundo = Mundo(motor, ancho, alto, titulo, rendimiento, economico, gravedad, pantalla_completa)
     escenas.Normal(colores.grisclaro)
 
@@ -115,9 +120,13 @@ def __crear_motor(usar_motor):
         from motores import motor_activity
         motor = motor_activity.ActivityBase()
 
+    elif usar_motor == 'sin_ventana':
+        from motores import motor_sin_ventana
+        motor = motor_sin_ventana.MotorSinVentana()
+
     else:
         print "El motor multimedia seleccionado (%s) no esta disponible" % (usar_motor)
-        print "Las opciones de motores que puedes probar son 'gtk'."
+        print "Las opciones de motores que puedes probar son 'sugar' y 'sin_ventana'."
         sys.exit(1)
 
     return motor
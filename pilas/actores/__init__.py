@@ -11,9 +11,17 @@ import math
 
 import pilas
 import utils
+import capas
+import registro_de_actores
 from actor import Actor
 
-todos = []
+registro = registro_de_actores.RegistroDeActores()
+
+# Vista de solo lectura del registro, se mantiene por compatibilidad.
+todos = registro.vista()
+
+# Los mismos actores de ``todos``, en el orden en que se dibujan.
+lista_de_dibujado = capas.ListaDeDibujado()
 
 __doc__ = """
 Módulo pilas.actores
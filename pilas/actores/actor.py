@@ -62,6 +62,9 @@ class Actor(object, Estudiante):
             raise Exception(mensaje)
 
         Estudiante.__init__(self)
+        self._eliminado = False
+        self._movido = True
+        self._etiquetas = set()
         self._actor = pilas.mundo.motor.obtener_actor(imagen, x=x, y=y)
         self.centro = ('centro', 'centro')
 
@@ -92,6 +95,7 @@ class Actor(object, Estudiante):
 
         self._centro = (x, y)
         self._actor.definir_centro(x, y)
+        self._avisar_cambio_de_area()
     
     def _interpretar_y_convertir_posicion(self, posicion, maximo_valor):
         if posicion in IZQUIERDA + ARRIBA:
@@ -136,6 +140,12 @@ class Actor(object, Estudiante):
 
     def definir_posicion(self, x, y):
         self._actor.definir_posicion(x, y)
+        self._avisar_cambio_de_area()
+
+    def _avisar_cambio_de_area(self):
+        "Indica que el actor se movio o cambio de tamano, para las colisiones y el puntero."
+        self._movido = True
+        pilas.mundo.puntero.marcar_movido(self)
 
     def obtener_posicion(self):
         return self._actor.obtener_posicion()
@@ -157,7 +167,7 @@ class Actor(object, Estudiante):
     @pilas.utils.interpolable
     def set_z(self, z):
         self._z = z
-        pilas.actores.utils.ordenar_actores_por_valor_z()
+        pilas.actores.utils.actualizar_valor_z(self)
 
     @pilas.utils.interpolable
     def set_y(self, y):
@@ -187,12 +197,14 @@ class Actor(object, Estudiante):
         if s < 0:
             return
         self._actor.definir_escala_x(s)
+        self._avisar_cambio_de_area()
 
     @pilas.utils.interpolable
     def set_scale_y(self, s):
         if s < 0:
             return
         self._actor.definir_escala_y(s)
+        self._avisar_cambio_de_area()
     
 
 
@@ -243,6 +255,12 @@ class Actor(object, Estudiante):
     def set_fijo(self, fijo):
         self._actor.fijo = fijo
 
+    def get_radio_de_colision(self):
+        return self._radio_de_colision
+
+    def set_radio_de_colision(self, radio):
+        self._radio_de_colision = radio
+        self._movido = True
 
     espejado = property(get_espejado, set_espejado, doc="Indica si se tiene que invertir horizonaltamente la imagen del actor.")
     z = property(get_z, set_z, doc="Define lejania respecto del observador.")
@@ -255,6 +273,7 @@ class Actor(object, Estudiante):
     transparencia = property(get_transparencia, set_transparencia, doc="Define el nivel de transparencia, 0 indica opaco y 100 la maxima transparencia.")
     imagen = property(get_imagen, set_imagen, doc="Define la imagen a mostrar.")
     fijo = property(get_fijo, set_fijo, doc="Indica si el actor debe ser independiente a la camara.")
+    radio_de_colision = property(get_radio_de_colision, set_radio_de_colision, doc="Radio del circulo que se usa para detectar colisiones.")
 
     def eliminar(self):
         """Elimina el actor de la lista de actores que se imprimen en pantalla."""
@@ -263,10 +282,36 @@ class Actor(object, Estudiante):
     
     def destruir(self):
         """Elimina a un actor pero de manera inmediata."""
+        self._eliminado = True
         pilas.actores.utils.eliminar_un_actor(self)
+        pilas.mundo.tweener.removeTweeningFrom(self)
         self.eliminar_habilidades()
         self.eliminar_comportamientos()
 
+    def esta_eliminado(self):
+        "Indica si el actor ya fue eliminado de la escena."
+        return self._eliminado
+
+    def agregar_etiqueta(self, etiqueta):
+        """Marca al actor con una etiqueta para buscarlo luego.
+
+        Por ejemplo:
+
+            >>> mono.agregar_etiqueta('enemigo')
+            >>> pilas.actores.registro.obtener_por_etiqueta('enemigo')
+        """
+        if etiqueta not in self._etiquetas:
+            self._etiquetas.add(etiqueta)
+            pilas.actores.registro.etiquetar(self, etiqueta)
+
+    def quitar_etiqueta(self, etiqueta):
+        if etiqueta in self._etiquetas:
+            self._etiquetas.discard(etiqueta)
+            pilas.actores.registro.desetiquetar(self, etiqueta)
+
+    def tiene_etiqueta(self, etiqueta):
+        return etiqueta in self._etiquetas
+
     def actualizar(self):
         """Actualiza el estado del actor. 
         
@@ -389,12 +434,16 @@ class Actor(object, Estudiante):
 
     def definir_escala(self, escala):
         self._actor.definir_escala(escala)
+        self._avisar_cambio_de_area()
 
     def definir_transparencia(self, valor):
         self._actor.definir_transparencia(valor)
 
     def imitar(self, otro_actor_o_figura):
-        self.aprender(pilas.habilidades.Imitar, otro_actor_o_figura)
+        if isinstance(otro_actor_o_figura, pilas.fisica.Figura):
+            self.aprender(pilas.habilidades.ImitarFigura, otro_actor_o_figura)
+        else:
+            self.aprender(pilas.habilidades.Imitar, otro_actor_o_figura)
 
     def esta_fuera_de_la_pantalla(self):
         # TODO: detectar area de la pantalla con las funciones que exporta el motor.
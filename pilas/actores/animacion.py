@@ -41,7 +41,7 @@ class Animacion(Animado):
         self.definir_velocidad_de_animacion(velocidad)
 
     def definir_velocidad_de_animacion(self, velocidad_de_animacion):
-        self._velocidad_de_animacion = (1000.0 / 60) * velocidad_de_animacion
+        self._velocidad_de_animacion = velocidad_de_animacion
 
     def obtener_velocidad_de_animacion(self):
         return self._velocidad_de_animacion
@@ -49,7 +49,9 @@ class Animacion(Animado):
     velocidad_de_animacion = property(obtener_velocidad_de_animacion, definir_velocidad_de_animacion, doc="Es la cantidad de cuadros por segundo a mostrar")
 
     def actualizar(self):
-        self.tick += self.velocidad_de_animacion
+        # El tiempo del paso viene del reloj del mundo, asi la animacion
+        # respeta la pausa y la escala de tiempo.
+        self.tick += 1000.0 * self.velocidad_de_animacion * pilas.mundo.reloj.dt
 
         if self.tick > 1000.0:
             self.tick -= 1000.0
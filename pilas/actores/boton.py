@@ -33,9 +33,7 @@ class Boton(Actor):
         Actor.__init__(self, ruta_normal, x=x, y=y)
         self._cargar_imagenes(self.ruta_normal, self.ruta_press, self.ruta_over)
 
-        pilas.eventos.mueve_mouse.conectar(self.detection_move_mouse)
-        pilas.eventos.click_de_mouse.conectar(self.detection_click_mouse)
-        pilas.eventos.termina_click.conectar(self.detection_end_click_mouse)
+        pilas.mundo.puntero.conectar(self, self)
 
     def _cargar_imagenes(self, ruta_normal, ruta_press, ruta_over):
         self.ruta_normal = ruta_normal
@@ -128,15 +126,12 @@ class Boton(Actor):
     def pintar_sobre(self):
         self.definir_imagen(self.imagen_over) 
 
-    def detection_move_mouse(self, evento):
-        if self.colisiona_con_un_punto(evento.x, evento.y):
-            self.ejecutar_funciones_over()
-        else:
-            self.ejecutar_funciones_normal()
+    # funciones que recibe desde pilas.mundo.puntero
+    def cuando_entra_el_puntero(self, evento):
+        self.ejecutar_funciones_over()
 
-    def detection_click_mouse(self, click):
-        if self.colisiona_con_un_punto(click.x, click.y):
-            self.ejecutar_funciones_press()
+    def cuando_sale_el_puntero(self, evento):
+        self.ejecutar_funciones_normal()
 
-    def detection_end_click_mouse(self, end_click):
-        pass
+    def cuando_pulsa_el_puntero(self, evento):
+        self.ejecutar_funciones_press()
@@ -0,0 +1,178 @@
+# -*- encoding: utf-8 -*-
+# Pilas engine - A video game framework.
+#
+# Copyright 2010 - Hugo Ruscitti
+# License: LGPLv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# Website - http://www.pilas-engine.com.ar
+
+import bisect
+
+
+class ListaDeDibujado(object):
+    """Mantiene a los actores en el orden en que se tienen que dibujar.
+
+    Los actores se agrupan en capas, una por cada valor de ``z``. Las
+    capas se recorren de la mas lejana (``z`` mas grande) a la mas
+    cercana, y dentro de una capa los actores se recorren en el orden
+    en que llegaron a ella.
+
+    Cambiar el ``z`` de un actor solo lo mueve de una capa a otra, sin
+    volver a ordenar a todos los actores. Ademas la lista se puede
+    recorrer mientras se agregan o eliminan actores: los eliminados
+    dejan un hueco que se limpia cuando ningun recorrido esta en curso.
+    Los cambios de ``z`` durante un recorrido tambien esperan a que
+    termine, asi ningun actor se visita dos veces ni se saltea.
+    """
+
+    def __init__(self):
+        self.capas = {}
+        # Valores de z de todas las capas, de menor a mayor.
+        self.valores_z = []
+        # Capa y posicion de cada actor dentro de ella.
+        self.posiciones = {}
+        self.huecos = 0
+        self.recorridos = 0
+        # Cambios de z pedidos durante un recorrido.
+        self.cambios_de_z = []
+        self.reordenar_pendiente = False
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def __contains__(self, actor):
+        return actor in self.posiciones
+
+    def __iter__(self):
+        self.recorridos += 1
+
+        try:
+            # Solo se copian los valores de z, que suelen ser pocos.
+            for z in reversed(list(self.valores_z)):
+                capa = self.capas[z]
+                indice = 0
+
+                # Se consulta el largo en cada vuelta, asi tambien se
+                # recorren los actores que se agregan durante el recorrido.
+                while indice < len(capa):
+                    actor = capa[indice]
+                    indice += 1
+
+                    if actor is not None:
+                        yield actor
+        finally:
+            self.recorridos -= 1
+            self._compactar_si_es_necesario()
+
+    def recorrer_desde_arriba(self):
+        "Recorre los actores desde el mas cercano al observador al mas lejano."
+        self.recorridos += 1
+
+        try:
+            for z in list(self.valores_z):
+                capa = self.capas[z]
+
+                for indice in xrange(len(capa) - 1, -1, -1):
+                    if capa[indice] is not None:
+                        yield capa[indice]
+        finally:
+            self.recorridos -= 1
+            self._compactar_si_es_necesario()
+
+    def agregar(self, actor):
+        if actor in self.posiciones:
+            return
+
+        z = actor.z
+
+        if z not in self.capas:
+            self.capas[z] = []
+            bisect.insort(self.valores_z, z)
+
+        capa = self.capas[z]
+        self.posiciones[actor] = (z, len(capa))
+        capa.append(actor)
+
+    def quitar(self, actor):
+        posicion = self.posiciones.pop(actor, None)
+
+        if posicion is None:
+            return
+
+        z, indice = posicion
+        self.capas[z][indice] = None
+        self.huecos += 1
+        self._compactar_si_es_necesario()
+
+    def actualizar_z(self, actor):
+        "Mueve al actor a la capa que corresponde a su valor de z actual."
+        if self.recorridos:
+            self.cambios_de_z.append(actor)
+            return
+
+        posicion = self.posiciones.get(actor)
+
+        if posicion is not None and posicion[0] != actor.z:
+            self.quitar(actor)
+            self.agregar(actor)
+
+    def reordenar(self):
+        "Vuelve a armar todas las capas leyendo el z de cada actor."
+        if self.recorridos:
+            self.reordenar_pendiente = True
+            return
+
+        actores = list(self)
+        self.limpiar()
+
+        for actor in actores:
+            self.agregar(actor)
+
+    def limpiar(self):
+        self.capas = {}
+        self.valores_z = []
+        self.posiciones = {}
+        self.huecos = 0
+        self.cambios_de_z = []
+        self.reordenar_pendiente = False
+
+    def _compactar_si_es_necesario(self):
+        """Quita los huecos que dejaron los actores eliminados.
+
+        Solo se compacta si no hay un recorrido en curso, y cuando los
+        huecos son una parte importante de la lista, asi el costo se
+        reparte entre muchas eliminaciones. Antes se aplican los
+        cambios de z que esperaban a que termine el recorrido."""
+        if self.recorridos:
+            return
+
+        self._aplicar_cambios_pendientes()
+
+        if self.huecos <= max(16, len(self.posiciones)):
+            return
+
+        for z in list(self.valores_z):
+            capa = [actor for actor in self.capas[z] if actor is not None]
+
+            if capa:
+                self.capas[z] = capa
+
+                for indice, actor in enumerate(capa):
+                    self.posiciones[actor] = (z, indice)
+            else:
+                del self.capas[z]
+                self.valores_z.remove(z)
+
+        self.huecos = 0
+
+    def _aplicar_cambios_pendientes(self):
+        if self.reordenar_pendiente:
+            self.reordenar_pendiente = False
+            self.cambios_de_z = []
+            self.reordenar()
+            return
+
+        cambios, self.cambios_de_z = self.cambios_de_z, []
+
+        for actor in cambios:
+            self.actualizar_z(actor)
@@ -24,13 +24,18 @@ class Mapa(Actor):
     **tiled** puedes escribir:
 
         >>> mapa = pilas.actores.Mapa('untitled2.tmx')
+
+    Los bloques se pueden cambiar luego, indicando la fila, la columna
+    y el cuadro de la grilla que se tiene que mostrar:
+
+        >>> mapa.definir_bloque(0, 3, 12)
     """
 
-    def __init__(self, grilla_o_mapa=None, x=0, y=0, restitucion=0.56):
+    def __init__(self, grilla_o_mapa=None, x=0, y=0, restitucion=0.56, filas=None, columnas=None):
         Actor.__init__(self, 'invisible.png', x, y)
         self.restitucion = restitucion
         self.figuras = []
-        self.bloques = []
+        self._desplazamiento = (x, y)
 
         if not grilla_o_mapa:
             grilla_o_mapa = grilla = pilas.imagenes.cargar_grilla("grillas/plataformas_10_10.png", 10, 10)
@@ -44,6 +49,24 @@ class Mapa(Actor):
             self._ancho_cuadro = grilla_o_mapa.cuadro_ancho
             self._alto_cuadro = grilla_o_mapa.cuadro_alto
 
+            # Si no se indica el tamano del mapa ocupa toda la ventana.
+            ancho, alto = pilas.mundo.motor.obtener_area()
+            self.columnas = columnas or ancho / self._ancho_cuadro
+            self.filas = filas or alto / self._alto_cuadro
+            self._crear_imagen()
+
+    def _crear_imagen(self):
+        "Genera la imagen que dibuja todos los bloques del mapa."
+        x, y = self._desplazamiento
+        self.imagen = pilas.mundo.motor.obtener_capas_de_bloques(self.grilla, self.filas, self.columnas)
+
+        # El punto (x, y) del mapa es su esquina superior izquierda, que
+        # inicialmente coincide con la esquina superior de la ventana.
+        izquierda, derecha, arriba, abajo = pilas.utils.obtener_bordes()
+        self.centro = ("izquierda", "arriba")
+        self.x = izquierda + x
+        self.y = arriba + y
+
     def _cargar_mapa(self, archivo):
         "Carga el escenario desde un archivo .tmz (del programa tiled)."
 
@@ -71,6 +94,7 @@ class Mapa(Actor):
         self.grilla = pilas.imagenes.cargar_grilla(self._ruta, 
                 self._ancho_imagen / self._ancho_cuadro, 
                 self._alto_imagen / self._alto_cuadro)
+        self._crear_imagen()
 
         # Carga las capas del mapa.
         layers = nodo.getChild('map').getChildren('layer')
@@ -79,14 +103,14 @@ class Mapa(Actor):
             raise Exception("Debe tener al menos una capa (layer).")
 
         # La capa 0 (inferior) define los bloques no-solidos.
-        self._crear_bloques(layers[0], solidos=False)
+        self._crear_bloques(layers[0], 0, solidos=False)
 
         # El resto de las capas definen bloques solidos
-        for layer in layers[1:]:
-            self._crear_bloques(layer, solidos=True)
+        for (numero, layer) in enumerate(layers[1:]):
+            self._crear_bloques(layer, numero + 1, solidos=True)
 
-    def _crear_bloques(self, capa, solidos):
-        "Genera actores que representan los bloques del escenario."
+    def _crear_bloques(self, capa, numero_de_capa, solidos):
+        "Agrega a una capa de la imagen los bloques del escenario."
         datos = capa.getChild('data').getData()
 
         # Convierte todo el mapa en una matriz de numeros.
@@ -95,19 +119,27 @@ class Mapa(Actor):
         for (y, fila) in enumerate(bloques):
             for (x, bloque) in enumerate(fila):
                 if bloque:
-                    self.pintar_bloque(y, x, bloque -1, solidos)
+                    self.pintar_bloque(y, x, bloque -1, solidos, numero_de_capa)
+
+    def definir_bloque(self, fila, columna, indice, capa=0):
+        """Cambia el cuadro de la grilla que se muestra en un bloque.
 
-    def pintar_bloque(self, fila, columna, indice, es_bloque_solido=False):
-        nuevo_bloque = pilas.actores.Actor('invisible.png')
-        nuevo_bloque.imagen = self.grilla
-        nuevo_bloque.imagen.definir_cuadro(indice)
-        nuevo_bloque.izquierda = columna * self._ancho_cuadro - 320
-        nuevo_bloque.arriba = -fila * self._alto_cuadro + 240
-        self.bloques.append(nuevo_bloque)
+        Si ``indice`` es None el bloque queda vacio. Solo se vuelve a
+        dibujar la porcion del mapa que contiene al bloque."""
+        self.imagen.definir_bloque(fila, columna, indice, capa)
+
+    def obtener_bloque(self, fila, columna, capa=0):
+        return self.imagen.obtener_bloque(fila, columna, capa)
+
+    def pintar_bloque(self, fila, columna, indice, es_bloque_solido=False, capa=0):
+        self.definir_bloque(fila, columna, indice, capa)
 
         if es_bloque_solido:
-            figura = pilas.fisica.Rectangulo(nuevo_bloque.izquierda + self._ancho_cuadro / 2, 
-                    nuevo_bloque.arriba - self._alto_cuadro / 2,
+            izquierda = self.x + columna * self._ancho_cuadro
+            arriba = self.y - fila * self._alto_cuadro
+
+            figura = pilas.fisica.Rectangulo(izquierda + self._ancho_cuadro / 2, 
+                    arriba - self._alto_cuadro / 2,
                     self._ancho_cuadro, self._alto_cuadro, dinamica=False, 
                     restitucion=self.restitucion)
             self.figuras.append(figura)
@@ -115,16 +147,17 @@ class Mapa(Actor):
 
     def reiniciar(self):
         self._eliminar_bloques()
+        self.imagen.limpiar()
 
         if isinstance(self.grilla_o_mapa, str):
             self._cargar_mapa(self.grilla_o_mapa)
 
     def eliminar(self):
         self._eliminar_bloques()
+        Actor.eliminar(self)
 
     def _eliminar_bloques(self):
-        for b in self.bloques:
-            b.eliminar()
-
         for f in self.figuras:
             f.eliminar()
+
+        self.figuras = []
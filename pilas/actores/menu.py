@@ -28,12 +28,12 @@ class Menu(Actor):
         self.activar()
 
     def activar(self):
-        pilas.eventos.mueve_mouse.conectar(self.cuando_mueve_el_mouse)
-        pilas.eventos.click_de_mouse.conectar(self.cuando_hace_click_con_el_mouse)
+        for opcion in self.opciones_como_actores:
+            pilas.mundo.puntero.conectar(opcion, self)
 
     def desactivar(self):
-        pilas.eventos.mueve_mouse.desconectar(self.cuando_mueve_el_mouse)
-        pilas.eventos.click_de_mouse.desconectar(self.cuando_hace_click_con_el_mouse)
+        for opcion in self.opciones_como_actores:
+            pilas.mundo.puntero.desconectar(opcion, self)
 
     def crear_texto_de_las_opciones(self, opciones):
         "Genera un actor por cada opcion del menu."
@@ -97,19 +97,18 @@ class Menu(Actor):
 
         Actor.__setattr__(self, atributo, valor)
 
-    def cuando_mueve_el_mouse(self, evento):
-        "Permite cambiar la opcion actual moviendo el mouse. Retorna True si el mouse esta sobre alguna opcion."
-        for indice, opcion in enumerate(self.opciones_como_actores):
-            if opcion.colisiona_con_un_punto(evento.x, evento.y):
-                if indice != self.opcion_actual:
-                    self._deshabilitar_opcion_actual()
-                    self.opcion_actual = indice
-                    self.opciones_como_actores[indice].resaltar()
-                return True
-                    
+    def cuando_entra_el_puntero(self, evento):
+        "Permite cambiar la opcion actual moviendo el mouse sobre otra opcion."
+        indice = self.opciones_como_actores.index(evento.actor)
+
+        if indice != self.opcion_actual:
+            self._deshabilitar_opcion_actual()
+            self.opcion_actual = indice
+            self.opciones_como_actores[indice].resaltar()
+
     def _deshabilitar_opcion_actual(self):
         self.opciones_como_actores[self.opcion_actual].resaltar(False)
 
-    def cuando_hace_click_con_el_mouse(self, evento):
-        if self.cuando_mueve_el_mouse(evento):
-            self.seleccionar_opcion_actual()
+    def cuando_pulsa_el_puntero(self, evento):
+        self.cuando_entra_el_puntero(evento)
+        self.seleccionar_opcion_actual()
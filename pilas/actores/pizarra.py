@@ -63,3 +63,17 @@ class Pizarra(Actor):
     def poligono(self, puntos, color=pilas.colores.negro, grosor=1):
         puntos = [self.obtener_coordenada_fisica(*p) for p in puntos]
         self.imagen.poligono(puntos, color, grosor)
+
+    def lote(self):
+        """Retorna un lote para dibujar muchas figuras sobre la pizarra de una sola vez.
+
+        Por ejemplo:
+
+            >>> with pizarra.lote() as lote:
+            ...     for x in range(0, 200, 10):
+            ...         lote.linea(x, 0, x, 100)
+
+        Las figuras se dibujan todas juntas al terminar el bloque ``with``.
+        """
+        centro = (self.imagen.obtener_ancho() / 2, self.imagen.obtener_alto() / 2)
+        return self.imagen.lote(centro)
@@ -0,0 +1,178 @@
+# -*- encoding: utf-8 -*-
+# Pilas engine - A video game framework.
+#
+# Copyright 2010 - Hugo Ruscitti
+# License: LGPLv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# Website - http://www.pilas-engine.com.ar
+
+import collections
+
+
+class RegistroDeActores(object):
+    """Guarda a todos los actores de la escena en el orden en que se crearon.
+
+    Agregar o quitar un actor cuesta lo mismo sin importar cuantos
+    actores haya. Ademas se mantienen indices por clase y por
+    etiqueta, por ejemplo::
+
+        >>> pilas.actores.registro.obtener_por_clase(pilas.actores.Bomba)
+        [<Bomba ...>, <Bomba ...>]
+        >>> mono.agregar_etiqueta('enemigo')
+        >>> pilas.actores.registro.obtener_por_etiqueta('enemigo')
+        [<Mono ...>]
+
+    Si se quita un actor mientras se recorre el registro, el actor
+    se saltea en lo que queda del recorrido y se quita realmente al
+    terminar el ultimo recorrido en curso.
+    """
+
+    def __init__(self):
+        self.actores = collections.OrderedDict()
+        self.por_clase = {}
+        self.por_etiqueta = {}
+        self.pendientes = set()
+        self.recorridos = 0
+        self._lista = None
+
+    def __len__(self):
+        return len(self.actores) - len(self.pendientes)
+
+    def __contains__(self, actor):
+        return actor in self.actores and actor not in self.pendientes
+
+    def __iter__(self):
+        self.recorridos += 1
+
+        try:
+            # Los actores nuevos se agregan al final, asi que tambien
+            # se recorren si se crean durante el recorrido.
+            for actor in self.actores:
+                if actor not in self.pendientes:
+                    yield actor
+        finally:
+            self.recorridos -= 1
+
+            if not self.recorridos:
+                self.aplicar_eliminaciones()
+
+    def agregar(self, actor):
+        if actor in self.pendientes:
+            self.pendientes.discard(actor)
+            self._lista = None
+            return
+
+        if actor in self.actores:
+            return
+
+        self.actores[actor] = None
+        self._lista = None
+        self.por_clase.setdefault(actor.__class__, collections.OrderedDict())[actor] = None
+
+        for etiqueta in getattr(actor, '_etiquetas', ()):
+            self._indexar_etiqueta(actor, etiqueta)
+
+    def quitar(self, actor):
+        "Quita al actor del registro, o lo demora si hay un recorrido en curso."
+        if actor not in self.actores:
+            return
+
+        if self.recorridos:
+            self.pendientes.add(actor)
+            self._lista = None
+        else:
+            self._quitar(actor)
+
+    def aplicar_eliminaciones(self):
+        "Quita a los actores que se eliminaron durante algun recorrido."
+        for actor in self.pendientes:
+            self._quitar(actor)
+
+        self.pendientes.clear()
+
+    def _quitar(self, actor):
+        del self.actores[actor]
+        self._lista = None
+
+        clase = actor.__class__
+        del self.por_clase[clase][actor]
+
+        if not self.por_clase[clase]:
+            del self.por_clase[clase]
+
+        for etiqueta in getattr(actor, '_etiquetas', ()):
+            self._desindexar_etiqueta(actor, etiqueta)
+
+    def _indexar_etiqueta(self, actor, etiqueta):
+        self.por_etiqueta.setdefault(etiqueta, collections.OrderedDict())[actor] = None
+
+    def _desindexar_etiqueta(self, actor, etiqueta):
+        actores = self.por_etiqueta.get(etiqueta)
+
+        if actores is not None:
+            actores.pop(actor, None)
+
+            if not actores:
+                del self.por_etiqueta[etiqueta]
+
+    def etiquetar(self, actor, etiqueta):
+        "Lo invoca el actor al recibir una etiqueta nueva."
+        if actor in self.actores:
+            self._indexar_etiqueta(actor, etiqueta)
+
+    def desetiquetar(self, actor, etiqueta):
+        "Lo invoca el actor al perder una etiqueta."
+        self._desindexar_etiqueta(actor, etiqueta)
+
+    def obtener_por_clase(self, clase):
+        "Retorna los actores de la clase indicada, o de alguna clase derivada."
+        resultado = []
+
+        for clase_del_actor, actores in self.por_clase.items():
+            if issubclass(clase_del_actor, clase):
+                resultado.extend(a for a in actores if a not in self.pendientes)
+
+        return resultado
+
+    def obtener_por_etiqueta(self, etiqueta):
+        "Retorna los actores que tienen la etiqueta indicada."
+        actores = self.por_etiqueta.get(etiqueta, ())
+        return [a for a in actores if a not in self.pendientes]
+
+    def como_lista(self):
+        """Retorna los actores en una lista, que se arma de nuevo solo si el registro cambio.
+
+        La lista no se debe modificar."""
+        if self._lista is None:
+            self._lista = [a for a in self.actores if a not in self.pendientes]
+
+        return self._lista
+
+    def vista(self):
+        return VistaDeActores(self)
+
+
+class VistaDeActores(object):
+    """Acceso de solo lectura a los actores de un registro.
+
+    Se comporta como la lista ``pilas.actores.todos`` de versiones
+    anteriores: se puede recorrer, consultar su largo, preguntar si
+    contiene a un actor y acceder por indice."""
+
+    def __init__(self, registro):
+        self._registro = registro
+
+    def __iter__(self):
+        return iter(self._registro)
+
+    def __len__(self):
+        return len(self._registro)
+
+    def __contains__(self, actor):
+        return actor in self._registro
+
+    def __getitem__(self, indice):
+        return self._registro.como_lista()[indice]
+
+    def __repr__(self):
+        return repr(self._registro.como_lista())
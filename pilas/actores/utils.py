@@ -10,22 +10,30 @@ import random
 import pilas
 
 def ordenar_actores_por_valor_z():
-    "Ordena todos los actores para que se impriman con 'z' como criterio de orden."
-    pilas.actores.todos.sort()
+    """Vuelve a ordenar a todos los actores para que se impriman con 'z' como criterio de orden.
+
+    No es necesario invocarla al cambiar el atributo ``z`` de un actor,
+    la lista de dibujado lo cambia de capa automaticamente."""
+    pilas.actores.lista_de_dibujado.reordenar()
+
+def actualizar_valor_z(actor):
+    "Mueve al actor a la capa de dibujado que corresponde a su nuevo 'z'."
+    pilas.actores.lista_de_dibujado.actualizar_z(actor)
 
 def insertar_como_nuevo_actor(actor):
     "Coloca a un actor en la lista de actores a imprimir en pantalla."
-    pilas.actores.todos.append(actor)
+    pilas.actores.registro.agregar(actor)
+    pilas.actores.lista_de_dibujado.agregar(actor)
+    pilas.mundo.puntero.marcar_movido(actor)
     
 def eliminar_un_actor(actor):
-    try:
-        pilas.actores.todos.remove(actor)
-    except ValueError:
-        #TODO: quitar este silenciador de excepcion.
-        pass
+    "Quita al actor de la escena, no hace nada si ya se habia eliminado."
+    pilas.actores.lista_de_dibujado.quitar(actor)
+    pilas.actores.registro.quitar(actor)
+    pilas.mundo.puntero.olvidar(actor)
 
 def eliminar_a_todos():
-    a_eliminar = list(pilas.actores.todos)
+    a_eliminar = list(pilas.actores.lista_de_dibujado)
     a_eliminar = a_eliminar[1:]    # evita borrar el fondo.
 
     for x in a_eliminar:
@@ -40,13 +48,7 @@ def destruir_a_todos():
 
 def obtener_actor_en(x, y):
     "Intenta obtener el actor mas cerca de la pantalla (z mas pequeño) en la posición (x, y)"
-
-    # Busca el objeto que colisiones ordenando en sentido inverso.
-    for sprite in pilas.actores.todos[::-1]:
-        if sprite.colisiona_con_un_punto(x, y):
-            return sprite
-
-    return None
+    return pilas.mundo.puntero.obtener_actor_en(x, y)
 
 
 def fabricar(clase, cantidad=1, posiciones_al_azar=True, *k, **kv):
@@ -6,39 +6,328 @@
 #
 # website - http://www.pilas-engine.com.ar
 
+import math
+
 import utils
 import pilas
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Por debajo de esta cantidad de pares conviene comparar todos
+# contra todos, armar la grilla cuesta mas de lo que ahorra.
+PARES_PARA_USAR_GRILLA = 64
+
+# Cantidad de actores de un grupo a partir de la cual se usa numpy (si
+# esta disponible) para calcular todas las distancias de una sola vez.
+ACTORES_PARA_USAR_NUMPY = 100
+
+# Cantidad de filas de la matriz de distancias que se calculan juntas,
+# limita la memoria que se usa con grupos muy grandes.
+FILAS_POR_BLOQUE = 256
+
+
+def esta_eliminado(actor):
+    return getattr(actor, '_eliminado', False)
+
+
+class GrillaEspacial(object):
+    """Reparte puntos en celdas cuadradas para encontrar rapido a sus vecinos.
+
+    Si el tamano de celda es mayor o igual a la distancia maxima
+    de colision, todos los vecinos de un punto estan en su celda o
+    en alguna de las ocho celdas que la rodean.
+    """
+
+    def __init__(self, tamano_de_celda):
+        self.tamano_de_celda = float(tamano_de_celda)
+        self.celdas = {}
+
+    def _obtener_celda(self, x, y):
+        return (int(math.floor(x / self.tamano_de_celda)),
+                int(math.floor(y / self.tamano_de_celda)))
+
+    def agregar(self, indice, x, y):
+        self.celdas.setdefault(self._obtener_celda(x, y), []).append(indice)
+
+    def obtener_vecinos(self, x, y):
+        "Retorna los indices de los puntos cercanos a (x, y), ordenados."
+        columna, fila = self._obtener_celda(x, y)
+        vecinos = []
+
+        for i in (columna - 1, columna, columna + 1):
+            for j in (fila - 1, fila, fila + 1):
+                celda = self.celdas.get((i, j))
+
+                if celda:
+                    vecinos.extend(celda)
+
+        vecinos.sort()
+        return vecinos
+
+
+class ColisionEntreGrupos(object):
+    """Dos grupos de actores que se analizan juntos.
+
+    Ademas de las funciones a invocar, recuerda los pares de actores
+    que estaban en contacto en la ultima verificacion, para saber
+    cuando una colision comienza, continua o termina.
+    """
+
+    def __init__(self, grupo_a, grupo_b, funcion_a_llamar=None,
+            al_comenzar=None, al_continuar=None, al_terminar=None):
+        self.grupo_a = grupo_a
+        self.grupo_b = grupo_b
+        self.funcion_a_llamar = funcion_a_llamar
+        self.al_comenzar = al_comenzar
+        self.al_continuar = al_continuar
+        self.al_terminar = al_terminar
+        self.pares = {}
+        self.conocidos_a = set()
+        self.conocidos_b = set()
+
+
 class Colisiones:
-    "Administra todas las colisiones entre actores."
+    """Administra todas las colisiones entre actores.
+
+    Los pares de actores en contacto se recuerdan entre un cuadro y
+    el siguiente, y solo se vuelven a comparar los actores que se
+    movieron (o cambiaron su radio de colision) desde la ultima
+    verificacion.
+    """
 
     def __init__(self):
         self.colisiones = []
+        self.usar_numpy = numpy is not None
+        self.actores_para_usar_numpy = ACTORES_PARA_USAR_NUMPY
 
     def verificar_colisiones(self):
-        for x in self.colisiones:
-            self._verificar_colisiones_en_tupla(x)
+        movidos = self._obtener_actores_movidos()
+
+        for x in list(self.colisiones):
+            self._verificar_colisiones_en_grupo(x, movidos)
+
+    def _obtener_actores_movidos(self):
+        """Retorna los ids de los actores que se movieron desde la ultima verificacion.
+
+        Los movimientos que ocurran de ahora en adelante, incluso
+        dentro de las funciones de colision, se tendran en cuenta
+        en la proxima verificacion."""
+        movidos = set()
+
+        for colision in self.colisiones:
+            for grupo in (colision.grupo_a, colision.grupo_b):
+                for actor in grupo:
+                    # Los objetos que no son actores no avisan cuando se
+                    # mueven, asi que siempre se vuelven a comparar.
+                    if getattr(actor, '_movido', True):
+                        movidos.add(id(actor))
+
+                        if hasattr(actor, '_movido'):
+                            actor._movido = False
 
-    def _verificar_colisiones_en_tupla(self, tupla):
+        return movidos
+
+    def _obtener_datos(self, grupo):
+        "Toma la posicion y el radio de los actores que siguen con vida."
+        return [(actor, actor.x, actor.y, actor.radio_de_colision)
+                for actor in grupo if not esta_eliminado(actor)]
+
+    def _obtener_pares(self, datos_a, datos_b):
+        pares = {}
+
+        for (i, j) in self._buscar_pares(datos_a, datos_b):
+            a = datos_a[i][0]
+            b = datos_b[j][0]
+            pares[(id(a), id(b))] = (a, b)
+
+        return pares
+
+    def _verificar_colisiones_en_grupo(self, colision, movidos):
         "Toma dos grupos de actores y analiza colisiones entre ellos."
-        (grupo_a, grupo_b, funcion_a_llamar) = tupla
+        datos_a = self._obtener_datos(colision.grupo_a)
+        datos_b = self._obtener_datos(colision.grupo_b)
+        hay_eliminados = len(datos_a) != len(colision.grupo_a) or len(datos_b) != len(colision.grupo_b)
+
+        # Los actores que se agregan a un grupo se comparan aunque no se muevan.
+        movidos_a = [d for d in datos_a if id(d[0]) in movidos or id(d[0]) not in colision.conocidos_a]
+        movidos_b = [d for d in datos_b if id(d[0]) in movidos or id(d[0]) not in colision.conocidos_b]
+        anteriores = colision.pares
+
+        if len(movidos_a) == len(datos_a) or len(movidos_b) == len(datos_b):
+            actuales = self._obtener_pares(datos_a, datos_b)
+        else:
+            vivos_a = set(id(d[0]) for d in datos_a)
+            vivos_b = set(id(d[0]) for d in datos_b)
+            cambiaron = set(id(d[0]) for d in movidos_a + movidos_b)
+            actuales = {}
+
+            # Los pares entre actores que no se movieron siguen en contacto.
+            for (clave, par) in anteriores.iteritems():
+                id_a, id_b = clave
+
+                if id_a in vivos_a and id_b in vivos_b and id_a not in cambiaron and id_b not in cambiaron:
+                    actuales[clave] = par
 
-        for a in grupo_a:
-            for b in grupo_b:
-                if id(a) != id(b) and utils.colisionan(a, b):
-                    funcion_a_llamar(a, b)
+            actuales.update(self._obtener_pares(movidos_a, datos_b))
+            actuales.update(self._obtener_pares(datos_a, movidos_b))
 
-                    # verifica si alguno de los dos objetos muere en la colision.
-                    if a not in pilas.actores.todos:
-                        if a in grupo_a:
-                            list.remove(grupo_a, a)
+        colision.conocidos_a = set(id(d[0]) for d in datos_a)
+        colision.conocidos_b = set(id(d[0]) for d in datos_b)
 
-                    if b not in pilas.actores.todos:
-                        if b in grupo_b:
-                            list.remove(grupo_b, b)
+        # Los pares se notifican en el mismo orden en que aparecen
+        # los actores en cada grupo.
+        orden_a = dict((id(d[0]), i) for (i, d) in enumerate(datos_a))
+        orden_b = dict((id(d[0]), j) for (j, d) in enumerate(datos_b))
+        ordenados = sorted(actuales.iteritems(), key=lambda x: (orden_a[x[0][0]], orden_b[x[0][1]]))
+
+        for (clave, (a, b)) in ordenados:
+            if esta_eliminado(a) or esta_eliminado(b):
+                continue
+
+            if clave in anteriores:
+                if colision.al_continuar:
+                    colision.al_continuar(a, b)
+            elif colision.al_comenzar:
+                colision.al_comenzar(a, b)
+
+            if colision.funcion_a_llamar:
+                colision.funcion_a_llamar(a, b)
+
+            # verifica si alguno de los dos objetos muere en la colision.
+            if esta_eliminado(a) or esta_eliminado(b):
+                hay_eliminados = True
+
+        if colision.al_terminar:
+            for (clave, (a, b)) in anteriores.iteritems():
+                if clave not in actuales and not esta_eliminado(a) and not esta_eliminado(b):
+                    colision.al_terminar(a, b)
+
+        colision.pares = dict((clave, (a, b)) for (clave, (a, b)) in actuales.iteritems()
+                              if not esta_eliminado(a) and not esta_eliminado(b))
+
+        if hay_eliminados:
+            self._quitar_eliminados(colision.grupo_a)
+            self._quitar_eliminados(colision.grupo_b)
+
+    def _quitar_eliminados(self, grupo):
+        grupo[:] = [x for x in grupo if not esta_eliminado(x)]
+
+    def _buscar_pares(self, datos_a, datos_b):
+        "Retorna los pares de indices (i, j) de los actores que colisionan."
+        if not datos_a or not datos_b:
+            return []
+
+        if self.usar_numpy and max(len(datos_a), len(datos_b)) >= self.actores_para_usar_numpy:
+            return self._buscar_pares_con_numpy(datos_a, datos_b)
+
+        if len(datos_a) * len(datos_b) <= PARES_PARA_USAR_GRILLA:
+            return self._buscar_pares_comparando_todos(datos_a, datos_b)
+        else:
+            return self._buscar_pares_con_grilla(datos_a, datos_b)
+
+    def _buscar_pares_comparando_todos(self, datos_a, datos_b):
+        pares = []
+
+        for (i, (a, ax, ay, ar)) in enumerate(datos_a):
+            for (j, (b, bx, by, br)) in enumerate(datos_b):
+                dx = ax - bx
+                dy = ay - by
+                distancia = ar + br
+
+                if dx * dx + dy * dy < distancia * distancia and a is not b:
+                    pares.append((i, j))
+
+        return pares
+
+    def _buscar_pares_con_grilla(self, datos_a, datos_b):
+        radio_maximo_a = max(r for (_, _, _, r) in datos_a)
+        radio_maximo_b = max(r for (_, _, _, r) in datos_b)
+        grilla = GrillaEspacial(max(radio_maximo_a + radio_maximo_b, 1))
+
+        for (j, (b, bx, by, br)) in enumerate(datos_b):
+            grilla.agregar(j, bx, by)
+
+        pares = []
+
+        for (i, (a, ax, ay, ar)) in enumerate(datos_a):
+            for j in grilla.obtener_vecinos(ax, ay):
+                b, bx, by, br = datos_b[j]
+                dx = ax - bx
+                dy = ay - by
+                distancia = ar + br
+
+                if dx * dx + dy * dy < distancia * distancia and a is not b:
+                    pares.append((i, j))
+
+        return pares
+
+    def _buscar_pares_con_numpy(self, datos_a, datos_b):
+        """Compara todos los pares con operaciones sobre vectores de numpy.
+
+        La matriz de distancias se calcula por bloques de filas, y
+        numpy.argwhere retorna los pares en el mismo orden que los
+        otros metodos de busqueda."""
+        ax, ay, ar = self._obtener_vectores(datos_a)
+        bx, by, br = self._obtener_vectores(datos_b)
+
+        # Un actor que esta en los dos grupos no colisiona consigo mismo.
+        indices_b = dict((id(b), j) for (j, (b, _, _, _)) in enumerate(datos_b))
+        propios = [(i, indices_b[id(a)]) for (i, (a, _, _, _)) in enumerate(datos_a)
+                   if id(a) in indices_b]
+
+        pares = []
+
+        for inicio in range(0, len(datos_a), FILAS_POR_BLOQUE):
+            fin = inicio + FILAS_POR_BLOQUE
+            dx = ax[inicio:fin, numpy.newaxis] - bx
+            dy = ay[inicio:fin, numpy.newaxis] - by
+            distancia = ar[inicio:fin, numpy.newaxis] + br
+            colisionan = dx * dx + dy * dy < distancia * distancia
+
+            for (i, j) in propios:
+                if inicio <= i < fin:
+                    colisionan[i - inicio, j] = False
+
+            indices = numpy.argwhere(colisionan)
+            indices[:, 0] += inicio
+            pares.extend([(i, j) for (i, j) in indices.tolist()])
+
+        return pares
+
+    def _obtener_vectores(self, datos):
+        x = numpy.array([d[1] for d in datos], dtype=float)
+        y = numpy.array([d[2] for d in datos], dtype=float)
+        r = numpy.array([d[3] for d in datos], dtype=float)
+        return x, y, r
 
     def agregar(self, grupo_a, grupo_b, funcion_a_llamar):
-        "Agrega dos listas de actores para analizar colisiones."
+        """Agrega dos listas de actores para analizar colisiones.
+
+        La funcion se invoca en cada cuadro, para cada par de actores
+        que estan en contacto."""
+        self.agregar_con_eventos(grupo_a, grupo_b, funcion_a_llamar=funcion_a_llamar)
+
+    def agregar_con_eventos(self, grupo_a, grupo_b, al_comenzar=None,
+            al_continuar=None, al_terminar=None, funcion_a_llamar=None):
+        """Agrega dos listas de actores, distinguiendo cada momento de la colision.
+
+        ``al_comenzar`` se invoca en el primer cuadro en que dos actores
+        se tocan, ``al_continuar`` en los cuadros siguientes mientras
+        sigan en contacto y ``al_terminar`` cuando se separan. Por
+        ejemplo::
+
+            def tocar(mono, banana):
+                mono.sonreir()
+
+            def soltar(mono, banana):
+                mono.normal()
+
+            pilas.mundo.colisiones.agregar_con_eventos(mono, bananas,
+                    al_comenzar=tocar, al_terminar=soltar)
+        """
 
         if not isinstance(grupo_a, list):
             grupo_a = [grupo_a]
@@ -46,7 +335,10 @@ class Colisiones:
         if not isinstance(grupo_b, list):
             grupo_b = [grupo_b]
 
-        self.colisiones.append((grupo_a, grupo_b, funcion_a_llamar))
+        colision = ColisionEntreGrupos(grupo_a, grupo_b, funcion_a_llamar,
+                al_comenzar, al_continuar, al_terminar)
+        self.colisiones.append(colision)
+        return colision
 
     def obtener_colisiones(self, actor, grupo_de_actores):
         "Retorna una lista de los actores que colisionan con uno en particular."
@@ -106,6 +106,10 @@ class Control(object):
         if mapa.has_key(codigo):
             setattr(self, mapa[codigo], estado)
 
+    def hay_teclas_pulsadas(self):
+        "Indica si alguna de las teclas del control esta pulsada."
+        return self.izquierda or self.derecha or self.arriba or self.abajo or self.boton
+
     def __str__(self):
         return "<Control izquierda: %s derecha: %s arriba: %s abajo: %s boton: %s>" %(
                 str(self.izquierda), str(self.derecha), str(self.arriba), 
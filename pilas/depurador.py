@@ -53,7 +53,9 @@ class Depurador(object):
                 m.termina_dibujado(motor, self.lienzo)
     
     def cuando_pulsa_tecla(self, evento):
-        if evento.codigo == 'F7':
+        if evento.codigo == 'F6':
+            self._alternar_modo(ModoRendimiento)
+        elif evento.codigo == 'F7':
             self._alternar_modo(ModoInformacionDeSistema)
         elif evento.codigo == 'F8':
             self._alternar_modo(ModoPuntosDeControl)
@@ -144,24 +146,42 @@ class ModoDepurador(object):
     def orden_de_tecla(self):
         return int(self.tecla[1:])
     
-class ModoPuntosDeControl(ModoDepurador):
+class ModoDeFiguras(ModoDepurador):
+    """Modo que dibuja una figura por cada actor.
+
+    Las figuras de todos los actores se juntan en un lote y se
+    dibujan de una sola vez al terminar el cuadro."""
+
+    def comienza_dibujado(self, motor, lienzo):
+        self.lote = lienzo.lote(motor)
+
+    def dibuja_al_actor(self, motor, lienzo, actor):
+        self.agregar_figura(self.lote, actor)
+
+    def termina_dibujado(self, motor, lienzo):
+        self.lote.dibujar()
+
+    def agregar_figura(self, lote, actor):
+        pass
+
+class ModoPuntosDeControl(ModoDeFiguras):
     tecla = "F8"
     
-    def dibuja_al_actor(self, motor, lienzo, actor):
-        lienzo.cruz(motor, actor.x, actor.y, color=pilas.colores.rojo, grosor=ModoDepurador.grosor_de_lineas)
+    def agregar_figura(self, lote, actor):
+        lote.cruz(actor.x, actor.y, color=pilas.colores.rojo, grosor=ModoDepurador.grosor_de_lineas)
         
-class ModoRadiosDeColision(ModoDepurador):
+class ModoRadiosDeColision(ModoDeFiguras):
     tecla = "F9"
     
-    def dibuja_al_actor(self, motor, lienzo, actor):
-        lienzo.circulo(motor, actor.x, actor.y, actor.radio_de_colision, color=pilas.colores.verde, grosor=ModoDepurador.grosor_de_lineas)
+    def agregar_figura(self, lote, actor):
+        lote.circulo(actor.x, actor.y, actor.radio_de_colision, color=pilas.colores.verde, grosor=ModoDepurador.grosor_de_lineas)
  
-class ModoArea(ModoDepurador):
+class ModoArea(ModoDeFiguras):
     tecla = "F10"
     
-    def dibuja_al_actor(self, motor, lienzo, actor):
+    def agregar_figura(self, lote, actor):
         dx, dy = actor.centro
-        lienzo.rectangulo(motor, actor.x - dx, actor.y + dy, actor.ancho, actor.alto, color=pilas.colores.azul, grosor=ModoDepurador.grosor_de_lineas)
+        lote.rectangulo(actor.x - dx, actor.y + dy, actor.ancho, actor.alto, color=pilas.colores.azul, grosor=ModoDepurador.grosor_de_lineas)
 
 class ModoPosicion(ModoDepurador):
     tecla = "F12"
@@ -200,3 +220,59 @@ class ModoInformacionDeSistema(ModoDepurador):
         for (i, texto) in enumerate(self.informacion):
             posicion_y = abajo + 50 + i * 20
             lienzo.texto(motor, texto, izquierda + 10, posicion_y, color=pilas.colores.negro)
+
+class ModoRendimiento(ModoDepurador):
+    """Muestra cuanto demora cada etapa de los ultimos cuadros.
+
+    Cada cuadro se dibuja como una barra vertical, apilando el tiempo
+    de cada etapa con un color distinto. La linea horizontal indica
+    el tiempo disponible para cada cuadro."""
+
+    tecla = "F6"
+    pixeles_por_milisegundo = 4
+    colores_de_etapas = [
+        ('entrada', pilas.colores.amarillo),
+        ('interpolaciones', pilas.colores.azul),
+        ('tareas', pilas.colores.cyan),
+        ('fisica', pilas.colores.verdeoscuro),
+        ('colisiones', pilas.colores.naranja),
+        ('actores', pilas.colores.rojo),
+        ('dibujado_fondo', pilas.colores.grisoscuro),
+        ('dibujado_actores', pilas.colores.violeta),
+        ('dibujado_depurador', pilas.colores.rosa),
+        ]
+
+    def termina_dibujado(self, motor, lienzo):
+        perfilador = motor.perfilador
+        izquierda, derecha, arriba, abajo = pilas.utils.obtener_bordes()
+        escala = self.pixeles_por_milisegundo
+        base = abajo + 60
+        x = derecha - 10 - perfilador.muestras * 2
+
+        # Las barras de cada etapa se rellenan juntas, una vez por color.
+        with lienzo.lote(motor) as lote:
+            for cuadro in perfilador.historial:
+                y = base
+
+                for etapa, color in self.colores_de_etapas:
+                    alto = cuadro.get(etapa, 0) * 1000 * escala
+
+                    if alto >= 1:
+                        lote.rectangulo(x, y + alto, 2, alto, color=color, relleno=True)
+                        y += alto
+
+                x += 2
+
+        presupuesto = 1000.0 / self.depurador.fps.rendimiento
+        y = base + presupuesto * escala
+        lienzo.linea(motor, derecha - 10 - perfilador.muestras * 2, y, derecha - 10, y, color=pilas.colores.negro)
+
+        estadisticas = perfilador.estadisticas()
+
+        for (i, (etapa, color)) in enumerate(self.colores_de_etapas):
+            datos = estadisticas.get(etapa)
+
+            if datos:
+                texto = "%s: %.2f / %.2f ms" %(etapa, datos['p50'], datos['p90'])
+                lienzo.texto_absoluto(motor, texto, derecha - 220, arriba - 20 - i * 15, magnitud=10, color=color)
+
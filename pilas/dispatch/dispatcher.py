@@ -4,6 +4,10 @@ from pilas.dispatch import saferef
 
 WEAKREF_TYPES = (weakref.ReferenceType, saferef.BoundMethodWeakref)
 
+# Cantidad maxima de emisores distintos con su lista de receptores
+# guardada, para no acumular listas de emisores temporales.
+MAXIMO_DE_LISTAS_EN_CACHE = 64
+
 
 class DictObj(object):
     def __init__(self, d):
@@ -38,6 +42,9 @@ class Signal(object):
             A list of the arguments this signal can pass along in a send() call.
         """
         self.receivers = []
+        # Receptores de cada emisor, se arman la primera vez que se
+        # emite y se descartan al conectar o desconectar un receptor.
+        self.cache_de_receptores = {}
         if providing_args is None:
             providing_args = []
         self.providing_args = set(providing_args)
@@ -94,6 +101,7 @@ class Signal(object):
                 break
         else:
             self.receivers.append((lookup_key, receiver))
+            self.cache_de_receptores.clear()
 
     def desconectar(self, receptor=None, emisor=None, weak=True, uid=None):
         self.disconnect(receptor, emisor, weak, uid)
@@ -129,6 +137,7 @@ class Signal(object):
             (r_key, _) = self.receivers[index]
             if r_key == lookup_key:
                 del self.receivers[index]
+                self.cache_de_receptores.clear()
                 break
 
     def send(self, sender, **named):
@@ -153,11 +162,62 @@ class Signal(object):
         if not self.receivers:
             return responses
 
-        for receiver in self._live_receivers(_make_id(sender)):
-            response = receiver(DictObj(named))
-            responses.append((receiver, response))
+        # Todos los receptores comparten el mismo evento.
+        evento = DictObj(named)
+
+        for receiver, es_debil in self._obtener_receptores(sender):
+            if es_debil:
+                receiver = receiver()
+                if receiver is None:
+                    continue
+
+            responses.append((receiver, receiver(evento)))
         return responses
 
+    def send_sin_respuestas(self, sender, **named):
+        """
+        Igual que ``send``, pero no arma la lista de respuestas.
+
+        Conviene usarlo para los eventos que se emiten muy seguido,
+        como ``actualizar`` o ``mueve_mouse``.
+        """
+        if not self.receivers:
+            return
+
+        evento = DictObj(named)
+
+        for receiver, es_debil in self._obtener_receptores(sender):
+            if es_debil:
+                receiver = receiver()
+                if receiver is None:
+                    continue
+
+            receiver(evento)
+
+    def _obtener_receptores(self, sender):
+        """
+        Retorna los receptores para un emisor, armando la lista solo si cambio.
+
+        Cada elemento es un par (receptor, es_debil): las referencias
+        debiles se resuelven al emitir, para no mantener vivos a los
+        receptores desde la cache.
+        """
+        senderkey = _make_id(sender)
+        receptores = self.cache_de_receptores.get(senderkey)
+
+        if receptores is None:
+            none_senderkey = _make_id(None)
+            receptores = tuple((receiver, isinstance(receiver, WEAKREF_TYPES))
+                    for (receiverkey, r_senderkey), receiver in self.receivers
+                    if r_senderkey == none_senderkey or r_senderkey == senderkey)
+
+            if len(self.cache_de_receptores) >= MAXIMO_DE_LISTAS_EN_CACHE:
+                self.cache_de_receptores.clear()
+
+            self.cache_de_receptores[senderkey] = receptores
+
+        return receptores
+
     def send_robust(self, sender, **named):
         """
         Send signal from sender to all connected receivers catching errors.
@@ -231,6 +291,8 @@ class Signal(object):
                 if r_key == key:
                     del self.receivers[idx]
 
+        self.cache_de_receptores.clear()
+
     def esta_conectado(self):
         "Indica si tiene alguna funcion conectada."
         return self.receivers
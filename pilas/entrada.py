@@ -0,0 +1,93 @@
+# -*- encoding: utf-8 -*-
+# Pilas engine - A video game framework.
+#
+# Copyright 2010 - Hugo Ruscitti
+# License: LGPLv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# Website - http://www.pilas-engine.com.ar
+
+import collections
+
+from pilas import eventos
+from pilas import reloj
+
+__doc__ = """
+Módulo pilas.entrada
+====================
+
+Guarda los eventos del mouse y del teclado que llegan entre dos
+cuadros, y los emite todos juntos al comenzar el siguiente.
+
+Los movimientos del mouse consecutivos se combinan en uno solo,
+sumando sus desplazamientos, asi quien arrastra un actor recibe un
+solo aviso por cuadro. Los clicks y las teclas se emiten siempre, en
+el mismo orden en que ocurrieron.
+"""
+
+
+class ColaDeEntrada(object):
+    """Cola de eventos de entrada pendientes de emitir.
+
+    Si se indica un ``perfilador``, en cada llamada a ``despachar``
+    se registra cuanto demora emitir los eventos (etapa ``entrada``),
+    cuantos eventos habia en la cola (``eventos_en_cola``) y cuantos
+    milisegundos espero el evento mas antiguo (``latencia_de_entrada``).
+    """
+
+    def __init__(self, perfilador=None):
+        self.perfilador = perfilador
+        self.pendientes = collections.deque()
+        self.recibidos = 0
+        self.combinados = 0
+
+    def __len__(self):
+        return len(self.pendientes)
+
+    def agregar(self, senal, emisor, **datos):
+        "Guarda un evento para emitirlo en el proximo cuadro."
+        self.recibidos += 1
+
+        if senal is eventos.mueve_mouse and self.pendientes:
+            ultimo = self.pendientes[-1]
+
+            if ultimo[0] is eventos.mueve_mouse:
+                # Se conserva la posicion final y el desplazamiento total.
+                anteriores = ultimo[2]
+                datos['dx'] = anteriores.get('dx', 0) + datos.get('dx', 0)
+                datos['dy'] = anteriores.get('dy', 0) + datos.get('dy', 0)
+                ultimo[2] = datos
+                self.combinados += 1
+                return
+
+        self.pendientes.append([senal, emisor, datos, reloj.tiempo_monotonico()])
+
+    def despachar(self):
+        "Emite todos los eventos pendientes, en el orden en que llegaron."
+        if not self.pendientes:
+            return
+
+        perfilador = self.perfilador
+
+        if perfilador:
+            ahora = reloj.tiempo_monotonico()
+            perfilador.registrar_medicion('eventos_en_cola', len(self.pendientes))
+            perfilador.registrar_medicion('latencia_de_entrada', (ahora - self.pendientes[0][3]) * 1000)
+            perfilador.comenzar('entrada')
+
+        # Los receptores pueden generar eventos nuevos, esos esperan
+        # al cuadro siguiente.
+        pendientes = self.pendientes
+        self.pendientes = collections.deque()
+
+        for senal, emisor, datos, instante in pendientes:
+            senal.send_sin_respuestas(emisor, **datos)
+
+        # Un solo pedido de redibujado por cuadro, por ejemplo para
+        # mostrar la posicion del mouse en el modo depuracion.
+        eventos.redibujar.avisar()
+
+        if perfilador:
+            perfilador.terminar('entrada')
+
+    def limpiar(self):
+        self.pendientes.clear()
@@ -8,6 +8,34 @@
 
 import dispatch
 
+
+class AvisoDeRedibujado(object):
+    """Canal liviano para indicar que algo visible ha cambiado.
+
+    A diferencia de las señales, avisar un cambio no ejecuta a
+    ningun receptor de la simulacion: solo marca la pantalla como
+    pendiente de redibujar. El primer aviso de cada cuadro invoca a la
+    funcion conectada (generalmente el motor pidiendo un redibujado),
+    los siguientes se ignoran hasta que el motor llama a ``limpiar``.
+    """
+
+    def __init__(self):
+        self.pendiente = False
+        self.funcion = None
+
+    def conectar(self, funcion):
+        self.funcion = funcion
+
+    def avisar(self):
+        if not self.pendiente:
+            self.pendiente = True
+
+            if self.funcion:
+                self.funcion()
+
+    def limpiar(self):
+        self.pendiente = False
+
 mueve_mouse = dispatch.Signal(providing_args=['x', 'y', 'dx', 'dy'])
 click_de_mouse = dispatch.Signal(providing_args=['button', 'x', 'y'])
 termina_click = dispatch.Signal(providing_args=['button', 'x', 'y'])
@@ -18,6 +46,9 @@ pulsa_tecla_escape = dispatch.Signal(providing_args=[])
 actualizar = dispatch.Signal(providing_args=[])
 post_dibujar = dispatch.Signal(providing_args=[])
 
+# Se avisa cada vez que un actor cambia de posicion, imagen, rotacion etc.
+redibujar = AvisoDeRedibujado()
+
 # Se emite cuando el mundo ingresa o sale del modo depuracion (pulsando F12)
 inicia_modo_depuracion = dispatch.Signal(providing_args=[]) 
 sale_modo_depuracion = dispatch.Signal(providing_args=[])
@@ -8,6 +8,7 @@
 
 import pilas
 from pilas import colores
+from pilas import eventos
 
 try:
     import Box2D as box2d
@@ -17,11 +18,129 @@ except ImportError:
 
 import math
 
+# Cada cuadro de 1/60 segundos siempre avanzo 1/20 segundos de box2d,
+# los juegos existentes estan ajustados a ese ritmo.
+VELOCIDAD_DE_SIMULACION = 3.0
+
+# Segundos de box2d que avanza cada paso de la simulacion.
+PASO_DE_SIMULACION = 1 / 20.0
+
+# Pasos que se pueden ejecutar en un solo cuadro para recuperar tiempo.
+MAXIMO_DE_PASOS = 5
+
+# Cantidad maxima de figuras que retorna una consulta a box2d.
+MAXIMO_DE_RESULTADOS = 64
+
+# Lugar donde esperan los cuerpos guardados en la reserva, lejos de la
+# pantalla pero dentro del area que simula box2d.
+LUGAR_DE_RESERVA = (-990, -990)
+
+
+class Impacto(object):
+    """Representa el lugar donde un segmento toca a un cuerpo.
+
+    ``fraccion`` indica que parte del segmento se recorrio hasta el
+    impacto, entre 0 y 1, y ``normal`` es la direccion de la
+    superficie tocada."""
+
+    def __init__(self, origen, destino, fraccion, normal, cuerpo):
+        self.x = origen[0] + (destino[0] - origen[0]) * fraccion
+        self.y = origen[1] + (destino[1] - origen[1]) * fraccion
+        self.punto = (self.x, self.y)
+        self.fraccion = fraccion
+        self.normal = normal
+        self.cuerpo = cuerpo
+
+    def __repr__(self):
+        return "<Impacto en (%.1f, %.1f) fraccion=%.2f>" %(self.x, self.y, self.fraccion)
+
+
+class ReservaDeFiguras(object):
+    """Guarda los cuerpos de las figuras eliminadas para reutilizarlos.
+
+    Los cuerpos se agrupan por tipo de figura y parametros, un nuevo
+    ``Circulo`` de igual radio, densidad, etc. toma el cuerpo de uno
+    eliminado en lugar de crear otro y volver a calcular su masa.
+
+    Mientras esperan, los cuerpos no chocan con nada, estan dormidos
+    y se ubican en ``LUGAR_DE_RESERVA``."""
+
+    def __init__(self, mundo, maximo_por_tipo=64):
+        self.mundo = mundo
+        self.maximo_por_tipo = maximo_por_tipo
+        self.libres = {}
+        self.guardados = 0
+        self.reutilizados = 0
+
+    def guardar(self, clave, cuerpo):
+        "Desactiva el cuerpo y lo guarda, retorna False si ya hay demasiados de su tipo."
+        libres = self.libres.setdefault(clave, [])
+
+        if len(libres) >= self.maximo_por_tipo:
+            return False
+
+        filtros = []
+
+        for figura in cuerpo.shapeList:
+            filtro = figura.GetFilterData()
+            filtros.append((figura, filtro.categoryBits, filtro.maskBits))
+            filtro.maskBits = 0
+            figura.SetFilterData(filtro)
+            self.mundo.Refilter(figura)
+
+        cuerpo.SetLinearVelocity((0, 0))
+        cuerpo.SetAngularVelocity(0)
+        cuerpo.SetXForm(LUGAR_DE_RESERVA, 0)
+        cuerpo.PutToSleep()
+
+        libres.append((cuerpo, filtros))
+        self.guardados += 1
+        return True
+
+    def obtener(self, clave, x, y):
+        "Retorna un cuerpo guardado listo para usar en (x, y), o None si no hay."
+        libres = self.libres.get(clave)
+
+        if not libres:
+            return None
+
+        cuerpo, filtros = libres.pop()
+
+        for figura, categoria, mascara in filtros:
+            filtro = figura.GetFilterData()
+            filtro.categoryBits = categoria
+            filtro.maskBits = mascara
+            figura.SetFilterData(filtro)
+            self.mundo.Refilter(figura)
+
+        cuerpo.SetXForm((x, y), 0)
+        cuerpo.WakeUp()
+        self.reutilizados += 1
+        return cuerpo
+
+    def limpiar(self):
+        self.libres = {}
+
+
 class Fisica(object):
-    """Representa un simulador de mundo fisico, usando la biblioteca box2d."""
+    """Representa un simulador de mundo fisico, usando la biblioteca box2d.
+
+    La simulacion avanza siempre en pasos de ``paso`` segundos, sin
+    importar cuanto dure cada cuadro: el tiempo de cada cuadro se
+    acumula y se ejecutan tantos pasos como entren en el, hasta
+    ``maximo_de_pasos``. Con un paso mas largo la fisica consume
+    menos, y los actores se dibujan interpolando entre los dos
+    ultimos pasos para que el movimiento se vea suave."""
 
-    def __init__(self, area, gravedad=(0, -90)):
+    def __init__(self, area, gravedad=(0, -90), paso=PASO_DE_SIMULACION,
+            maximo_de_pasos=MAXIMO_DE_PASOS):
         self.area = area
+        self.definir_paso(paso, maximo_de_pasos)
+        self.acumulado = 0
+        self.alfa = 1.0
+        self.figuras = set()
+        self.sincronizados = 0
+        self.omitidos = 0
         try:
             self.escenario = box2d.b2AABB()
             self.escenario.lowerBound = (-1000.0, -1000.0)
@@ -43,7 +162,8 @@ class Fisica(object):
         self.constante_mouse = None
         self.i = 0
         self.crear_bordes_del_escenario()
-        self.figuras_a_eliminar = []
+        self.figuras_a_eliminar = set()
+        self.reserva = None
 
     def crear_bordes_del_escenario(self):
         self.crear_techo(self.area)
@@ -54,8 +174,29 @@ class Fisica(object):
         for x in self.mundo.bodyList:
             self.mundo.DestroyBody(x)
 
+        for figura in self.figuras:
+            figura._cuerpo = None
+
+        self.figuras.clear()
+        self.figuras_a_eliminar.clear()
+
+        if self.reserva:
+            self.reserva.limpiar()
+
+        self.acumulado = 0
+        self.alfa = 1.0
         self.crear_bordes_del_escenario()
 
+    def definir_paso(self, paso, maximo_de_pasos=None):
+        "Cambia los segundos de box2d que avanza cada paso de la simulacion."
+        if paso <= 0:
+            raise Exception("El paso de la simulacion tiene que ser positivo, ahora vale '%f'." %(paso))
+
+        self.paso = paso
+
+        if maximo_de_pasos is not None:
+            self.maximo_de_pasos = maximo_de_pasos
+
     def capturar_figura_con_el_mouse(self, figura):
         if self.constante_mouse:
             self.cuando_suelta_el_mouse()
@@ -71,47 +212,156 @@ class Fisica(object):
             self.constante_mouse.eliminar()
             self.constante_mouse = None
 
-    def actualizar(self):
-        if self.mundo:
-            self.mundo.Step(1.0 / 20.0, 10, 8)
+    def actualizar(self, dt=1 / 60.0):
+        "Acumula ``dt`` segundos de juego y ejecuta los pasos que correspondan."
+        if not self.mundo or not dt:
+            return
+
+        self.acumulado += dt * VELOCIDAD_DE_SIMULACION
+        # El margen evita perder un paso por errores de redondeo.
+        pasos = int(self.acumulado / self.paso + 1e-9)
+
+        if pasos > self.maximo_de_pasos:
+            pasos = self.maximo_de_pasos
+            self.acumulado = 0
+        else:
+            self.acumulado = max(0, self.acumulado - pasos * self.paso)
+
+        for i in xrange(pasos):
+            # Solo interesa la posicion previa al ultimo paso.
+            if i == pasos - 1:
+                self._guardar_transformaciones()
+
+            self.mundo.Step(self.paso, 10, 8)
             self.i += 1
+
+        if pasos:
             self._procesar_figuras_a_eliminar()
 
+        self.alfa = min(1.0, self.acumulado / self.paso)
+        self.sincronizar_actores()
+
+    def sincronizar_actores(self):
+        """Copia la posicion de cada figura al actor que la imita.
+
+        Solo se recorren los cuerpos despiertos, o los que se movieron
+        a mano, y los valores se escriben directamente en el actor sin
+        pasar por sus propiedades. Al final se pide un solo redibujado.
+        En ``sincronizados`` y ``omitidos`` queda cuantos actores se
+        actualizaron y cuantos no hizo falta tocar."""
+        sincronizados = 0
+        omitidos = 0
+
+        for figura in self.figuras:
+            actor = figura.actor
+
+            if actor is None:
+                continue
+
+            cuerpo = figura._cuerpo
+
+            if not figura._desactualizada and (cuerpo.IsSleeping() or cuerpo.IsStatic()):
+                omitidos += 1
+                continue
+
+            x, y, rotacion = figura.obtener_transformacion_interpolada()
+            actor._actor.x = x
+            actor._actor.y = y
+            actor._actor._rotacion = rotacion % 360
+            actor._avisar_cambio_de_area()
+            figura._desactualizada = False
+            sincronizados += 1
+
+        self.sincronizados = sincronizados
+        self.omitidos = omitidos
+
+        if sincronizados:
+            eventos.redibujar.avisar()
+
+    def _guardar_transformaciones(self):
+        "Recuerda la posicion de cada figura antes de avanzar la simulacion."
+        for figura in self.figuras:
+            figura.guardar_transformacion()
+
+    def hay_cuerpos_despiertos(self):
+        "Indica si algun cuerpo dinamico sigue en movimiento."
+        if not self.mundo:
+            return False
+
+        if self.constante_mouse:
+            return True
+
+        for cuerpo in self.mundo.bodyList:
+            if not cuerpo.IsStatic() and not cuerpo.IsSleeping():
+                return True
+
+        return False
+
     def _procesar_figuras_a_eliminar(self):
         "Elimina las figuras que han sido marcadas para quitar."
         if self.figuras_a_eliminar:
-            for x in self.figuras_a_eliminar:
-                # Solo elimina las figuras que actualmente existen.
-                if x in self.mundo.bodyList:
-                    self.mundo.DestroyBody(x)
-            self.figuras_a_eliminar = []
+            for figura in self.figuras_a_eliminar:
+                cuerpo = figura._cuerpo
+
+                # Solo elimina las figuras que todavia tienen un cuerpo.
+                if cuerpo is None:
+                    continue
+
+                figura._cuerpo = None
+
+                if self.reserva and figura._clave and self.reserva.guardar(figura._clave, cuerpo):
+                    continue
+
+                self.mundo.DestroyBody(cuerpo)
+
+            self.figuras_a_eliminar.clear()
+
+    def usar_reserva_de_figuras(self, maximo_por_tipo=64):
+        """Hace que los cuerpos de las figuras eliminadas se reutilicen.
+
+        Es util en juegos que crean y eliminan muchas figuras iguales,
+        por ejemplo proyectiles. ``maximo_por_tipo`` limita cuantos
+        cuerpos de cada tipo se guardan."""
+        if not self.reserva:
+            self.reserva = ReservaDeFiguras(self.mundo, maximo_por_tipo)
+
+        self.reserva.maximo_por_tipo = maximo_por_tipo
+
+    def obtener_cuerpo_de_reserva(self, clave, x, y):
+        "Retorna un cuerpo guardado con la clave indicada, o None."
+        if self.reserva:
+            return self.reserva.obtener(clave, x, y)
+
+        return None
 
     def dibujar_figuras_sobre_lienzo(self, motor, lienzo, grosor=1):
         "Dibuja todas las figuras en una pizarra. Indicado para depuracion."
         cuerpos = self.mundo.bodyList
         cantidad_de_figuras = 0
 
-        for cuerpo in cuerpos:
-            xform = cuerpo.GetXForm()
+        # Todas las figuras se dibujan juntas, con un solo trazo.
+        with lienzo.lote(motor) as lote:
+            for cuerpo in cuerpos:
+                xform = cuerpo.GetXForm()
 
-            for figura in cuerpo.shapeList:
-                cantidad_de_figuras += 1
-                tipo_de_figura = figura.GetType()
+                for figura in cuerpo.shapeList:
+                    cantidad_de_figuras += 1
+                    tipo_de_figura = figura.GetType()
 
-                if tipo_de_figura == box2d.e_polygonShape:
-                    vertices = []
+                    if tipo_de_figura == box2d.e_polygonShape:
+                        vertices = []
 
-                    for v in figura.vertices:
-                        pt = box2d.b2Mul(xform, v)
-                        vertices.append((pt.x, pt.y))
+                        for v in figura.vertices:
+                            pt = box2d.b2Mul(xform, v)
+                            vertices.append((pt.x, pt.y))
 
-                    lienzo.poligono(motor, vertices, color=colores.rojo, grosor=grosor, cerrado=True)
+                        lote.poligono(vertices, color=colores.rojo, grosor=grosor, cerrado=True)
 
-                elif tipo_de_figura == box2d.e_circleShape:
-                    lienzo.circulo(motor, cuerpo.position.x, cuerpo.position.y, figura.radius, colores.rojo, grosor=grosor)
+                    elif tipo_de_figura == box2d.e_circleShape:
+                        lote.circulo(cuerpo.position.x, cuerpo.position.y, figura.radius, colores.rojo, grosor=grosor)
 
-                else:
-                    print "no puedo identificar el tipo de figura."
+                    else:
+                        print "no puedo identificar el tipo de figura."
 
     def crear_cuerpo(self, definicion_de_cuerpo):
         return self.mundo.CreateBody(definicion_de_cuerpo)
@@ -144,7 +394,9 @@ class Fisica(object):
             self.pared_izquierda = None
 
     def eliminar_figura(self, figura):
-        self.figuras_a_eliminar.append(figura)
+        "Marca una figura para quitarla de la simulacion luego del paso actual."
+        self.figuras.discard(figura)
+        self.figuras_a_eliminar.add(figura)
 
     def obtener_distancia_al_suelo(self, x, y, dy):
         """Obtiene la distancia hacia abajo desde el punto (x,y).
@@ -159,39 +411,92 @@ class Fisica(object):
         if dy < 0:
             raise Exception("El valor de 'dy' debe ser positivo, ahora vale '%f'." %(dy))
 
-        delta = 0
-
-        while delta < dy:
+        if dy == 0 or self.obtener_cuerpos_en(x, y):
+            return 0
 
-            if self.obtener_cuerpos_en(x, y - delta):
-                return delta
+        impacto = self.raycast((x, y), (x, y - dy))
 
-            delta += 1
+        if impacto:
+            return impacto.fraccion * dy
 
-        return delta
+        return dy
 
     def obtener_cuerpos_en(self, x, y):
         "Retorna una lista de cuerpos que se encuentran en la posicion (x, y) o retorna una lista vacia []."
+        lista_de_cuerpos = []
 
-        AABB = box2d.b2AABB()
-        f = 1
-        AABB.lowerBound = (x - f, y - f)
-        AABB.upperBound = (x + f, y + f)
+        for s in self._consultar_figuras(x - 1, y - 1, x + 1, y + 1):
+            cuerpo = s.GetBody()
+
+            if s.TestPoint(cuerpo.GetXForm(), (x, y)) and cuerpo not in lista_de_cuerpos:
+                lista_de_cuerpos.append(cuerpo)
 
-        cuantos, cuerpos = self.mundo.Query(AABB, 2)
+        return lista_de_cuerpos
 
-        if cuantos == 0:
-            return []
+    def consultar_area(self, rectangulo):
+        """Retorna los cuerpos que tocan el rectangulo ``(x, y, ancho, alto)``.
 
-        lista_de_cuerpos = []
+        Como en la figura ``Rectangulo``, ``x`` e ``y`` indican el
+        centro. La consulta compara los rectangulos que envuelven a
+        cada figura, asi que es muy rapida pero puede incluir cuerpos
+        que solo estan cerca del area."""
+        x, y, ancho, alto = rectangulo
+        cuerpos = []
 
-        for s in cuerpos:
+        for s in self._consultar_figuras(x - ancho / 2.0, y - alto / 2.0, x + ancho / 2.0, y + alto / 2.0):
             cuerpo = s.GetBody()
 
-            if s.TestPoint(cuerpo.GetXForm(), (x, y)):
-                lista_de_cuerpos.append(cuerpo)
+            if cuerpo not in cuerpos:
+                cuerpos.append(cuerpo)
 
-        return lista_de_cuerpos
+        return cuerpos
+
+    def _consultar_figuras(self, izquierda, abajo, derecha, arriba):
+        "Retorna las figuras de box2d cuyo rectangulo envolvente toca el area indicada."
+        AABB = box2d.b2AABB()
+        AABB.lowerBound = (izquierda, abajo)
+        AABB.upperBound = (derecha, arriba)
+
+        cuantos, figuras = self.mundo.Query(AABB, MAXIMO_DE_RESULTADOS)
+        return figuras[:cuantos]
+
+    def raycast_todos(self, origen, destino):
+        """Retorna todos los impactos del segmento que va de ``origen`` a ``destino``.
+
+        Los impactos se ordenan desde el mas cercano al origen. Cada
+        uno es un objeto ``Impacto``."""
+        segmento = box2d.b2Segment()
+        segmento.p1 = origen
+        segmento.p2 = destino
+
+        cuantos, figuras = self.mundo.Raycast(segmento, MAXIMO_DE_RESULTADOS, True, None)
+        impactos = []
+
+        for figura in figuras[:cuantos]:
+            cuerpo = figura.GetBody()
+            resultado, fraccion, normal = figura.TestSegment(cuerpo.GetXForm(), segmento, 1.0)
+
+            if resultado == box2d.e_missCollide:
+                continue
+
+            if resultado == box2d.e_startsInsideCollide:
+                # El segmento comienza dentro de la figura.
+                fraccion = 0
+                normal = box2d.b2Vec2(0, 0)
+
+            impactos.append(Impacto(origen, destino, fraccion, (normal.x, normal.y), cuerpo))
+
+        impactos.sort(key=lambda impacto: impacto.fraccion)
+        return impactos
+
+    def raycast(self, origen, destino):
+        "Retorna el primer impacto entre ``origen`` y ``destino``, o None si no hay obstaculos."
+        impactos = self.raycast_todos(origen, destino)
+
+        if impactos:
+            return impactos[0]
+
+        return None
 
     def definir_gravedad(self, x, y):
         pilas.fisica.definir_gravedad(x, y)
@@ -209,18 +514,24 @@ class Figura(object):
 
     def definir_x(self, x):
         self._cuerpo.SetXForm((x, self.y), self._cuerpo.GetAngle())
+        self.anterior = None
+        self._desactualizada = True
 
     def obtener_y(self):
         return self._cuerpo.position.y
 
     def definir_y(self, y):
         self._cuerpo.SetXForm((self.x, y), self._cuerpo.GetAngle())
+        self.anterior = None
+        self._desactualizada = True
 
     def obtener_rotacion(self):
         return - math.degrees(self._cuerpo.GetAngle())
 
     def definir_rotacion(self, angulo):
         self._cuerpo.SetXForm((self.x, self.y), math.radians(-angulo))
+        self.anterior = None
+        self._desactualizada = True
 
     def impulsar(self, dx, dy):
         self._cuerpo.ApplyImpulse((dx, dy), self._cuerpo.GetWorldCenter())
@@ -248,7 +559,46 @@ class Figura(object):
 
     def eliminar(self):
         """Quita una figura de la simulación."""
-        pilas.mundo.fisica.eliminar_figura(self._cuerpo)
+        self._fisica.eliminar_figura(self)
+
+    def _iniciar(self, fisica, cuerpo, clave=None):
+        self._cuerpo = cuerpo
+        self._fisica = fisica
+        self._clave = clave
+        self.anterior = None
+        self.actor = None
+        self._desactualizada = True
+        fisica.figuras.add(self)
+
+    def vincular(self, actor):
+        "Hace que el actor copie la posicion de la figura luego de cada paso de la simulacion."
+        self.actor = actor
+        self._desactualizada = True
+
+    def desvincular(self):
+        self.actor = None
+
+    def guardar_transformacion(self):
+        "Recuerda la posicion y el angulo actuales del cuerpo."
+        posicion = self._cuerpo.position
+        self.anterior = (posicion.x, posicion.y, self._cuerpo.GetAngle())
+
+    def obtener_transformacion_interpolada(self):
+        """Retorna la posicion y rotacion entre los dos ultimos pasos de la simulacion.
+
+        El resultado es ``(x, y, rotacion)``, con la rotacion en grados
+        como la propiedad ``rotacion``."""
+        posicion = self._cuerpo.position
+        angulo = self._cuerpo.GetAngle()
+
+        if self.anterior is None:
+            return (posicion.x, posicion.y, - math.degrees(angulo))
+
+        alfa = self._fisica.alfa
+        x, y, angulo_anterior = self.anterior
+        return (x + (posicion.x - x) * alfa,
+                y + (posicion.y - y) * alfa,
+                - math.degrees(angulo_anterior + (angulo - angulo_anterior) * alfa))
 
     x = property(obtener_x, definir_x, doc="define la posición horizontal.")
     y = property(obtener_y, definir_y, doc="define la posición vertical.")
@@ -279,6 +629,13 @@ class Circulo(Figura):
         if not fisica:
             fisica = pilas.mundo.fisica
 
+        clave = ('circulo', radio, dinamica, densidad, restitucion, friccion, amortiguacion)
+        body = fisica.obtener_cuerpo_de_reserva(clave, x, y)
+
+        if body:
+            self._iniciar(fisica, body, clave)
+            return
+
         bodyDef = box2d.b2BodyDef()
         bodyDef.position=(x, y)
         bodyDef.linearDamping = amortiguacion
@@ -302,7 +659,7 @@ class Circulo(Figura):
         body.CreateShape(circleDef)
         body.SetMassFromShapes()
 
-        self._cuerpo = body
+        self._iniciar(fisica, body, clave)
 
 class Rectangulo(Figura):
     """Representa un rectángulo que puede colisionar con otras figuras.
@@ -322,6 +679,13 @@ class Rectangulo(Figura):
         if not fisica:
             fisica = pilas.mundo.fisica
 
+        clave = ('rectangulo', ancho, alto, dinamica, densidad, restitucion, friccion, amortiguacion)
+        body = fisica.obtener_cuerpo_de_reserva(clave, x, y)
+
+        if body:
+            self._iniciar(fisica, body, clave)
+            return
+
         bodyDef = box2d.b2BodyDef()
         bodyDef.position=(x, y)
         bodyDef.linearDamping = amortiguacion
@@ -347,7 +711,7 @@ class Rectangulo(Figura):
 
         body.SetMassFromShapes()
 
-        self._cuerpo = body
+        self._iniciar(fisica, body, clave)
 
 
 class Poligono(Figura):
@@ -370,6 +734,15 @@ class Poligono(Figura):
         if not fisica:
             fisica = pilas.mundo.fisica
 
+        # Los vertices se indican respecto del primer punto, asi que
+        # solo se reutiliza el cuerpo de un poligono identico.
+        clave = ('poligono', tuple(map(tuple, puntos)), dinamica, densidad, restitucion, friccion, amortiguacion)
+        body = fisica.obtener_cuerpo_de_reserva(clave, puntos[0][0], puntos[0][1])
+
+        if body:
+            self._iniciar(fisica, body, clave)
+            return
+
         bodyDef = box2d.b2BodyDef()
         bodyDef.position=puntos[0]
         bodyDef.linearDamping = amortiguacion
@@ -399,7 +772,7 @@ class Poligono(Figura):
 
         body.CreateShape(poligono_def)
         body.SetMassFromShapes()
-        self._cuerpo = body
+        self._iniciar(fisica, body, clave)
 
 class ConstanteDeMovimiento():
 
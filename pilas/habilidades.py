@@ -30,7 +30,7 @@ class RebotarComoPelota(Habilidad):
         circulo = pilas.fisica.Circulo(receptor.x + error, 
                                        receptor.y + error, 
                                        receptor.radio_de_colision)
-        receptor.aprender(pilas.habilidades.Imitar, circulo)
+        receptor.aprender(pilas.habilidades.ImitarFigura, circulo)
         self.circulo = circulo
         receptor.impulsar = self.impulsar
         receptor.empujar = self.empujar
@@ -54,7 +54,7 @@ class RebotarComoCaja(Habilidad):
                                              receptor.radio_de_colision*2 - 4,
                                              receptor.radio_de_colision*2 - 4,
                                              )
-        receptor.aprender(pilas.habilidades.Imitar, rectangulo)
+        receptor.aprender(pilas.habilidades.ImitarFigura, rectangulo)
         self.rectangulo = rectangulo
 
     def eliminar(self):
@@ -120,16 +120,16 @@ class Arrastrable(Habilidad):
 
     def __init__(self, receptor):
         Habilidad.__init__(self, receptor)
-        pilas.eventos.click_de_mouse.connect(self.cuando_intenta_arrastrar)
+        pilas.mundo.puntero.conectar(receptor, self)
 
-    def cuando_intenta_arrastrar(self, evento):
-        "Intenta mover el objeto con el mouse cuando se pulsa sobre el."
-        if self.receptor.colisiona_con_un_punto(evento.x, evento.y):
-            pilas.eventos.termina_click.connect(self.cuando_termina_de_arrastrar)
-            pilas.eventos.mueve_mouse.connect(self.cuando_arrastra, uid='cuando_arrastra')
-            self.comienza_a_arrastrar()
+    def cuando_pulsa_el_puntero(self, evento):
+        "Comienza a mover el objeto cuando se pulsa sobre el."
+        self.comienza_a_arrastrar()
 
-    def cuando_arrastra(self, evento):
+        # Captura al puntero para seguir recibiendo sus movimientos.
+        return True
+
+    def cuando_arrastra_el_puntero(self, evento):
         "Arrastra el actor a la posicion indicada por el puntero del mouse."
         if self._el_receptor_tiene_fisica():
             pilas.mundo.fisica.cuando_mueve_el_mouse(evento.x, evento.y)
@@ -137,11 +137,13 @@ class Arrastrable(Habilidad):
             self.receptor.x += evento.dx
             self.receptor.y += evento.dy
 
-    def cuando_termina_de_arrastrar(self, evento):
+    def cuando_suelta_el_puntero(self, evento):
         "Suelta al actor porque se ha soltado el botón del mouse."
-        pilas.eventos.mueve_mouse.disconnect(uid='cuando_arrastra')
         self.termina_de_arrastrar()
 
+    def eliminar(self):
+        pilas.mundo.puntero.desconectar(self.receptor, self)
+
     def comienza_a_arrastrar(self):
         if self._el_receptor_tiene_fisica():
             pilas.mundo.fisica.capturar_figura_con_el_mouse(self.receptor.figura)
@@ -249,3 +251,20 @@ class Imitar(Habilidad):
         if isinstance(self.objeto_a_imitar, pilas.fisica.Figura):
             self.objeto_a_imitar.eliminar()
 
+class ImitarFigura(Habilidad):
+    """Hace que el actor siga a una figura de la simulacion fisica.
+
+    La fisica actualiza al actor luego de cada paso, usando una
+    posicion intermedia entre los dos ultimos, asi que esta habilidad
+    no necesita actualizarse en cada cuadro."""
+
+    def __init__(self, receptor, figura):
+        Habilidad.__init__(self, receptor)
+        self.objeto_a_imitar = figura
+        receptor.figura = figura
+        figura.vincular(receptor)
+
+    def eliminar(self):
+        self.objeto_a_imitar.desvincular()
+        self.objeto_a_imitar.eliminar()
+
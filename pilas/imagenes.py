@@ -8,6 +8,94 @@
 
 import pilas
 import os
+import copy
+import collections
+
+
+class CacheDeImagenes(object):
+    """Mantiene las imagenes cargadas para no leerlas del disco otra vez.
+
+    Las imagenes se comparten entre todos los que las cargan, asi que
+    se deben tratar como objetos de solo lectura. Cuando la memoria
+    ocupada supera ``presupuesto`` (en bytes) se descartan las imagenes
+    que hace mas tiempo no se solicitan.
+
+    Las imagenes descartadas siguen existiendo mientras algun actor
+    las use, la cache simplemente deja de recordarlas.
+    """
+
+    def __init__(self, presupuesto=32 * 1024 * 1024):
+        self.presupuesto = presupuesto
+        self.imagenes = collections.OrderedDict()
+        self.bytes_en_uso = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, clave, crear):
+        """Retorna la imagen asociada a ``clave``.
+
+        Si la imagen no esta en la cache se genera llamando a la
+        funcion ``crear``."""
+
+        if clave in self.imagenes:
+            # Vuelve a insertar la imagen para marcarla como la mas reciente.
+            imagen, tamano = self.imagenes.pop(clave)
+            self.imagenes[clave] = (imagen, tamano)
+            self.aciertos += 1
+            return imagen
+
+        self.fallos += 1
+        imagen = crear()
+        tamano = imagen.tamano_en_bytes()
+
+        self.imagenes[clave] = (imagen, tamano)
+        self.bytes_en_uso += tamano
+        self._desalojar()
+        return imagen
+
+    def _desalojar(self):
+        # La imagen recien cargada se conserva aunque supere el presupuesto.
+        while self.bytes_en_uso > self.presupuesto and len(self.imagenes) > 1:
+            clave, (imagen, tamano) = self.imagenes.popitem(last=False)
+            self.bytes_en_uso -= tamano
+            self.desalojos += 1
+
+    def definir_presupuesto(self, presupuesto):
+        "Define la cantidad maxima de bytes que pueden ocupar las imagenes."
+        self.presupuesto = presupuesto
+        self._desalojar()
+
+    def limpiar(self):
+        "Olvida todas las imagenes y reinicia los contadores."
+        self.imagenes.clear()
+        self.bytes_en_uso = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def estadisticas(self):
+        return {
+                'imagenes': len(self.imagenes),
+                'bytes_en_uso': self.bytes_en_uso,
+                'presupuesto': self.presupuesto,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                }
+
+    def __str__(self):
+        return "<CacheDeImagenes imagenes: %(imagenes)d bytes: %(bytes_en_uso)d aciertos: %(aciertos)d fallos: %(fallos)d desalojos: %(desalojos)d>" %(self.estadisticas())
+
+
+cache = CacheDeImagenes()
+
+
+def _verificar_que_pilas_este_iniciado():
+    if not pilas.mundo:
+        mensaje = "Tiene que invocar a la funcion ``pilas.iniciar()`` para comenzar."
+        print mensaje
+        raise Exception(mensaje)
 
 def cargar(ruta):
     """Intenta cargar la imagen indicada por el argumento ``ruta``.
@@ -28,15 +116,14 @@ def cargar(ruta):
         * por último en el directorio estándar de la biblioteca.
 
     En caso de error genera una excepción de tipo IOError.
+
+    Las imagenes se leen del disco una sola vez, las siguientes
+    llamadas con la misma ruta retornan el mismo objeto Image.
     """
 
-    if not pilas.mundo:
-        mensaje = "Tiene que invocar a la funcion ``pilas.iniciar()`` para comenzar."
-        print mensaje
-        raise Exception(mensaje)
-    
+    _verificar_que_pilas_este_iniciado()
     ruta = pilas.utils.obtener_ruta_al_recurso(ruta)
-    return pilas.mundo.motor.cargar_imagen(ruta)
+    return cache.obtener(('imagen', ruta), lambda: pilas.mundo.motor.cargar_imagen(ruta))
 
 def cargar_grilla(ruta, columnas=1, filas=1):
     """Representa una grilla de imagenes con varios cuadros de animación.
@@ -59,13 +146,28 @@ def cargar_grilla(ruta, columnas=1, filas=1):
         grilla.avanzar()
         grilla.asignar(actor)
     """
-    if not pilas.mundo:
-        mensaje = "Tiene que invocar a la funcion ``pilas.iniciar()`` para comenzar."
-        print mensaje
-        raise Exception(mensaje)
-    
+    _verificar_que_pilas_este_iniciado()
     ruta = pilas.utils.obtener_ruta_al_recurso(ruta)
-    return pilas.mundo.motor.obtener_grilla(ruta, columnas, filas)
+    clave = ('grilla', ruta, columnas, filas)
+    grilla = cache.obtener(clave, lambda: pilas.mundo.motor.obtener_grilla(ruta, columnas, filas))
+
+    # Cada grilla tiene su propio cuadro actual, pero todas las copias
+    # comparten la misma imagen.
+    return copy.copy(grilla)
+
+def precargar(rutas):
+    """Carga varias imagenes de una sola vez, por ejemplo al iniciar un juego.
+
+    Cada elemento puede ser la ruta a una imagen o una tupla con
+    la ruta, las columnas y las filas de una grilla::
+
+        pilas.imagenes.precargar(["mono.png", ("pingu.png", 10)])
+    """
+    for ruta in rutas:
+        if isinstance(ruta, tuple):
+            cargar_grilla(*ruta)
+        else:
+            cargar(ruta)
 
 def cargar_lienzo():
     """Representa un rectangulo (inicialmente transparente) para dibujar."""
@@ -22,8 +22,7 @@ class Boton(pilas.actores.Actor):
         else:
             self.icono = None
 
-        pilas.eventos.mueve_mouse.conectar(self.cuando_mueve_el_mouse)
-        pilas.eventos.click_de_mouse.conectar(self.cuando_hace_click)
+        pilas.mundo.puntero.conectar(self, self)
 
     def conectar(self, funcion):
         self.funcion = funcion
@@ -39,13 +38,13 @@ class Boton(pilas.actores.Actor):
 
         self.imagen = self.imagen_normal
 
-    def cuando_mueve_el_mouse(self, evento):
-        if self.colisiona_con_un_punto(evento.x, evento.y):
-            self.imagen = self.imagen_sobre
-        else:
-            self.imagen = self.imagen_normal
+    def cuando_entra_el_puntero(self, evento):
+        self.imagen = self.imagen_sobre
+
+    def cuando_sale_el_puntero(self, evento):
+        self.imagen = self.imagen_normal
 
-    def cuando_hace_click(self, evento):
+    def cuando_pulsa_el_puntero(self, evento):
         if self.imagen == self.imagen_sobre:
             self.imagen = self.imagen_click
 
@@ -24,9 +24,8 @@ class Deslizador(Actor):
         
         self.click = False
         
-        pilas.eventos.click_de_mouse.conectar(self.click_del_mouse)
-        pilas.eventos.mueve_mouse.conectar(self.movimiento_del_mouse)
-        pilas.eventos.termina_click.conectar(self.termino_del_click)
+        # Solo el actor que se desliza recibe los clicks.
+        pilas.mundo.puntero.conectar(self.deslizador, self)
 
         self.progreso = 0
         self.posicion_relativa_x = 0
@@ -46,6 +45,8 @@ class Deslizador(Actor):
         self.limite_der = self.x + self.obtener_ancho()
 
         self._actor.definir_posicion(x, y)
+        self._avisar_cambio_de_area()
+
         if self.deslizador:
             self.deslizador.definir_posicion(x + self.posicion_relativa_x, y)
 
@@ -59,12 +60,13 @@ class Deslizador(Actor):
         for i in self.funciones:
             i(valor)
     
-    def click_del_mouse(self, click):
- 
-        if self.deslizador.colisiona_con_un_punto(click.x, click.y):
-            self.click = True
+    def cuando_pulsa_el_puntero(self, click):
+        self.click = True
+
+        # Captura al puntero hasta que se suelte el boton.
+        return True
 
-    def movimiento_del_mouse(self, movimiento):
+    def cuando_arrastra_el_puntero(self, movimiento):
         if self.click == True:
             ancho = self.obtener_ancho()
             factor = (self.deslizador.x + (ancho - abs(self.x))) / ancho - 1
@@ -83,5 +85,5 @@ class Deslizador(Actor):
             self.posicion_relativa_x = self.deslizador.x - self.x
                 
 
-    def termino_del_click(self, noclick):
+    def cuando_suelta_el_puntero(self, noclick):
         self.click = False
@@ -21,9 +21,8 @@ class ListaSeleccion(Actor):
 
         self._pintar_opciones()
         
-        pilas.eventos.mueve_mouse.conectar(self.cuando_mueve_el_mouse)
-        pilas.eventos.click_de_mouse.conectar(self.cuando_hace_click_con_el_mouse)
         self.centro = ("centro", "centro")
+        pilas.mundo.puntero.conectar(self, self)
         
     def _pintar_opciones(self, pinta_indice_opcion=None):
         self.imagen.pintar(pilas.colores.blanco)
@@ -34,18 +33,16 @@ class ListaSeleccion(Actor):
         for indice, opcion in enumerate(self.opciones):
             self.imagen.texto(opcion, 15, y=12 + indice * 20, color=pilas.colores.negro)
         
-    def cuando_mueve_el_mouse(self, evento):
-        if self.colisiona_con_un_punto(evento.x, evento.y):
-            opcion_seleccionada = self._detectar_opcion_bajo_el_mouse(evento)
-            self._pintar_opciones(opcion_seleccionada)
+    def cuando_mueve_el_puntero(self, evento):
+        opcion_seleccionada = self._detectar_opcion_bajo_el_mouse(evento)
+        self._pintar_opciones(opcion_seleccionada)
 
-    def cuando_hace_click_con_el_mouse(self, evento):
-        if self.colisiona_con_un_punto(evento.x, evento.y):
-            opcion = self._detectar_opcion_bajo_el_mouse(evento)
-            if self.funcion_a_ejecutar:
-                self.funcion_a_ejecutar(self.opciones[opcion])
-            else:
-                print "Cuidado, no has definido funcion a ejecutar en la lista de seleccion."
+    def cuando_pulsa_el_puntero(self, evento):
+        opcion = self._detectar_opcion_bajo_el_mouse(evento)
+        if self.funcion_a_ejecutar:
+            self.funcion_a_ejecutar(self.opciones[opcion])
+        else:
+            print "Cuidado, no has definido funcion a ejecutar en la lista de seleccion."
 
     def _detectar_opcion_bajo_el_mouse(self, evento):
         opcion = int((self.arriba - evento.y ) / 20)
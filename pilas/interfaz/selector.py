@@ -21,7 +21,7 @@ class Selector(pilas.actores.Actor):
         self.funcion_de_respuesta = None
 
         self.deseleccionar()
-        pilas.eventos.click_de_mouse.conectar(self.detection_click_mouse)
+        pilas.mundo.puntero.conectar(self, self)
 
     def _cargar_imagenes(self):
         self.imagen_selector = pilas.imagenes.cargar("interfaz/selector.png")
@@ -47,9 +47,8 @@ class Selector(pilas.actores.Actor):
         self.pintar_texto()
         self.centro = ("centro", "centro")
                 
-    def detection_click_mouse(self, click):
-        if self.colisiona_con_un_punto(click.x, click.y):
-            self.alternar_seleccion()
+    def cuando_pulsa_el_puntero(self, evento):
+        self.alternar_seleccion()
                 
     def alternar_seleccion(self):
         if self.seleccionado:
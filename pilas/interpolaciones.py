@@ -63,24 +63,17 @@ class Lineal(Interpolacion):
 
         import pilas
 
-        # Tiempo que se debe invertir para hacer cada interpolacion
-        # individual.
-        step = self.duration / float(len(self.values))
-        step *= 1000.0
-
         # En base a la funcion busca el getter que le dara
         # el valor inicial.
         getter = function.replace('set_', 'get_')
         function_to_get_value = getattr(target, getter)
         fist_value = function_to_get_value()
 
-        # Le indica al objeto que tiene que hacer para cumplir
-        # con cada paso de la interpolacion.
-        for index, value in enumerate(self.values):
-            pilas.mundo.tweener.addTweenNoArgs(target, function=function, 
-                    initial_value=fist_value,
-                    value=value, 
-                    tweenDelay=self.delay * 1000.0 + (index * step),
-                    tweenTime=step)
-            # El siguiente valor inicial sera el que ha alcanzado.
-            fist_value = value
+        # Todos los pasos de la interpolacion se agregan juntos, cada
+        # uno dura lo mismo y comienza donde termino el anterior.
+        pilas.mundo.tweener.agregar_secuencia(target, function,
+                [fist_value] + list(self.values),
+                duracion=self.duration * 1000.0,
+                demora=self.delay * 1000.0)
+
+        pilas.mundo.despertar()
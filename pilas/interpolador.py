@@ -0,0 +1,350 @@
+# -*- encoding: utf-8 -*-
+# Pilas engine - A video game framework.
+#
+# Copyright 2010 - Hugo Ruscitti
+# License: LGPLv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# Website - http://www.pilas-engine.com.ar
+
+from pytweener import Easing
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__doc__ = """
+Módulo pilas.interpolador
+=========================
+
+Actualiza todas las interpolaciones del juego en cada cuadro.
+
+A diferencia de ``pytweener.Tweener``, que crea un objeto ``Tween``
+por cada movimiento, aqui cada dato de las interpolaciones se guarda
+en una lista paralela (inicio, cambio, duracion, tiempo transcurrido,
+tipo de curva...). Asi se pueden evaluar las curvas de muchas
+interpolaciones juntas y aplicar los valores en una sola pasada.
+"""
+
+# Cantidad de interpolaciones con la misma curva a partir de la cual
+# se usa numpy (si esta disponible) para calcularlas todas juntas.
+INTERPOLACIONES_PARA_USAR_NUMPY = 64
+
+# Curvas que funcionan sin cambios sobre vectores de numpy, porque
+# solo usan operaciones aritmeticas.
+CURVAS_VECTORIZABLES = set([
+    Easing.Linear.easeNone,
+    Easing.Linear.easeIn,
+    Easing.Linear.easeOut,
+    Easing.Linear.easeInOut,
+    Easing.Quad.easeIn,
+    Easing.Quad.easeOut,
+    Easing.Quart.easeIn,
+    ])
+
+
+class Interpolador(object):
+    """Administra todas las interpolaciones activas.
+
+    Mantiene los mismos metodos que ``pytweener.Tweener``, pero cada
+    interpolacion se identifica con un numero en lugar de un objeto.
+    Por ejemplo::
+
+        >>> identificador = interpolador.addTweenNoArgs(mono, 'set_x',
+        ...     initial_value=0, value=100, tweenTime=1000)
+        >>> interpolador.removeTween(identificador)
+
+    Una interpolacion puede pasar por varios valores seguidos (ver
+    ``agregar_secuencia``), asi ``actor.x = [10, 20, 30], 2`` ocupa
+    un solo lugar en lugar de uno por cada valor.
+    """
+
+    def __init__(self, duration=0.5, tween=None):
+        self.defaultTweenType = tween or Easing.Linear.easeNone
+        self.defaultDuration = duration or 1.0
+
+        # Una entrada por interpolacion en cada lista, todas en el mismo orden.
+        self.identificadores = []
+        self.objetivos = []
+        self.asignadores = []
+        self.inicios = []
+        self.cambios = []
+        self.duraciones = []
+        self.transcurridos = []
+        self.curvas = []
+        self.valores = []
+        self.tramos = []
+        self.al_terminar = []
+        self.al_actualizar = []
+
+        # Posicion de cada identificador dentro de las listas.
+        self.posiciones = {}
+        # Identificadores de las interpolaciones de cada objeto, por id(objeto).
+        self.por_objetivo = {}
+        self.siguiente_identificador = 0
+
+    def hasTweens(self):
+        return len(self.identificadores) > 0
+
+    def __len__(self):
+        return len(self.identificadores)
+
+    def addTweenNoArgs(self, obj, function, initial_value, value, **kwargs):
+        "Similar a addTween, solo que se especifica la funcion y el valor de forma explicita."
+        t_time = kwargs.pop("tweenTime", self.defaultDuration)
+        t_type = kwargs.pop("tweenType", self.defaultTweenType)
+        t_completeFunc = kwargs.pop("onCompleteFunction", None)
+        t_updateFunc = kwargs.pop("onUpdateFunction", None)
+        t_delay = kwargs.pop("tweenDelay", 0)
+
+        if kwargs:
+            raise ValueError("No puede llamar a esta funcion con argumentos nombrados, use addTween en su lugar.")
+
+        return self.agregar_secuencia(obj, function, [initial_value, value],
+                t_time, t_delay, t_type, t_completeFunc, t_updateFunc)
+
+    def addTween(self, obj, **kwargs):
+        """Agrega una interpolacion por cada propiedad o funcion indicada.
+
+        Por ejemplo::
+
+            tweener.addTween(mono, set_x=100, tweenTime=500)
+
+        El valor inicial se lee de la propiedad, o del metodo ``get_``
+        que corresponde a la funcion ``set_``. Si se indica
+        ``initial_value`` se usa ese valor en su lugar.
+
+        Retorna el identificador de la ultima interpolacion agregada.
+        """
+        t_time = kwargs.pop("tweenTime", self.defaultDuration)
+        t_type = kwargs.pop("tweenType", self.defaultTweenType)
+        t_completeFunc = kwargs.pop("onCompleteFunction", None)
+        t_updateFunc = kwargs.pop("onUpdateFunction", None)
+        t_delay = kwargs.pop("tweenDelay", 0)
+        initial_value = kwargs.pop("initial_value", None)
+
+        identificador = None
+
+        for nombre, valor in kwargs.items():
+            if not hasattr(obj, nombre):
+                print "TWEEN ERROR: " + str(obj) + " has no function " + nombre
+                continue
+
+            if initial_value is not None:
+                inicial = initial_value
+            elif not callable(getattr(obj, nombre)):
+                inicial = getattr(obj, nombre)
+            else:
+                getter = getattr(obj, nombre.replace('set', 'get'), None)
+
+                if getter is not None and getter != getattr(obj, nombre):
+                    inicial = getter()
+                else:
+                    inicial = valor * 0
+
+            identificador = self.agregar_secuencia(obj, nombre, [inicial, valor],
+                    t_time, t_delay, t_type, t_completeFunc, t_updateFunc)
+
+        return identificador
+
+    def agregar_secuencia(self, obj, function, valores, duracion, demora=0,
+            curva=None, al_terminar=None, al_actualizar=None):
+        """Interpola ``function`` pasando por todos los ``valores`` en orden.
+
+        ``duracion`` es el tiempo total en milisegundos, que se reparte
+        en partes iguales entre cada par de valores consecutivos.
+        ``function`` puede ser el nombre de un metodo o de un atributo
+        del objeto.
+        """
+        if len(valores) < 2:
+            raise Exception("Se necesitan al menos dos valores para interpolar.")
+
+        asignador = getattr(obj, function)
+
+        if not callable(asignador):
+            asignador = _AsignarAtributo(obj, function)
+
+        tramo = duracion / float(len(valores) - 1)
+
+        identificador = self.siguiente_identificador
+        self.siguiente_identificador += 1
+
+        self.posiciones[identificador] = len(self.identificadores)
+        self.por_objetivo.setdefault(id(obj), set()).add(identificador)
+
+        self.identificadores.append(identificador)
+        self.objetivos.append(obj)
+        self.asignadores.append(asignador)
+        self.inicios.append(valores[0])
+        self.cambios.append(valores[1] - valores[0])
+        self.duraciones.append(tramo)
+        # Un tiempo transcurrido negativo indica que la interpolacion
+        # todavia esta esperando su demora.
+        self.transcurridos.append(-demora)
+        self.curvas.append(curva or self.defaultTweenType)
+        self.valores.append(valores)
+        self.tramos.append(0)
+        self.al_terminar.append(al_terminar)
+        self.al_actualizar.append(al_actualizar)
+
+        return identificador
+
+    def removeTween(self, identificador):
+        "Detiene una interpolacion sin llamar a su funcion de finalizacion."
+        if identificador in self.posiciones:
+            self._quitar(self.posiciones[identificador])
+
+    def getTweensAffectingObject(self, obj):
+        "Retorna los identificadores de las interpolaciones que modifican a ``obj``."
+        return list(self.por_objetivo.get(id(obj), ()))
+
+    def removeTweeningFrom(self, obj):
+        """Detiene todas las interpolaciones de un objeto, sin completar
+        el movimiento ni llamar a las funciones de finalizacion."""
+        for identificador in self.getTweensAffectingObject(obj):
+            self.removeTween(identificador)
+
+    def finish(self):
+        "Lleva todas las interpolaciones a su valor final y las elimina."
+        for indice in range(len(self.identificadores)):
+            self.asignadores[indice](self.valores[indice][-1])
+
+            if self.al_terminar[indice]:
+                self.al_terminar[indice]()
+
+        self.__init__(self.defaultDuration, self.defaultTweenType)
+
+    def update(self, timeSinceLastFrame):
+        "Avanza todas las interpolaciones ``timeSinceLastFrame`` milisegundos."
+        cantidad = len(self.identificadores)
+
+        if not cantidad:
+            return
+
+        transcurridos = self.transcurridos
+        duraciones = self.duraciones
+        activas = []
+
+        for indice in xrange(cantidad):
+            transcurridos[indice] += timeSinceLastFrame
+
+            if transcurridos[indice] >= 0:
+                activas.append(indice)
+
+        nuevos_valores = self._evaluar(activas)
+
+        terminadas = []
+        asignadores = self.asignadores
+
+        for indice, valor in zip(activas, nuevos_valores):
+            asignadores[indice](valor)
+
+            if transcurridos[indice] >= duraciones[indice]:
+                if not self._avanzar_tramo(indice):
+                    terminadas.append(indice)
+
+        funciones = [f for f in self.al_actualizar if f]
+        funciones += [self.al_terminar[i] for i in terminadas if self.al_terminar[i]]
+
+        # Se quitan desde el final para que el intercambio con el
+        # ultimo elemento no mueva una entrada que falta quitar.
+        for indice in reversed(terminadas):
+            self._quitar(indice)
+
+        # Las funciones se llaman al final porque pueden agregar o
+        # quitar interpolaciones.
+        for funcion in funciones:
+            funcion()
+
+    def _evaluar(self, activas):
+        "Calcula el valor actual de cada interpolacion activa, agrupando por curva."
+        resultado = [0] * len(activas)
+        grupos = {}
+
+        for posicion, indice in enumerate(activas):
+            grupos.setdefault(self.curvas[indice], []).append(posicion)
+
+        for curva, posiciones in grupos.items():
+            indices = [activas[p] for p in posiciones]
+            valores = self._evaluar_curva(curva, indices)
+
+            for p, valor in zip(posiciones, valores):
+                resultado[p] = valor
+
+        return resultado
+
+    def _evaluar_curva(self, curva, indices):
+        # Una interpolacion sin duracion salta directamente al valor final.
+        tiempos = [min(self.transcurridos[i], self.duraciones[i]) if self.duraciones[i] else 1
+                for i in indices]
+        inicios = [self.inicios[i] for i in indices]
+        cambios = [self.cambios[i] for i in indices]
+        duraciones = [self.duraciones[i] or 1 for i in indices]
+
+        if (numpy is not None and curva in CURVAS_VECTORIZABLES and
+                len(indices) >= INTERPOLACIONES_PARA_USAR_NUMPY):
+            try:
+                valores = curva(numpy.array(tiempos, dtype=float),
+                        numpy.array(inicios, dtype=float),
+                        numpy.array(cambios, dtype=float),
+                        numpy.array(duraciones, dtype=float))
+                return valores.tolist()
+            except (TypeError, ValueError):
+                # Algun valor no es numerico, se resuelve uno por uno.
+                pass
+
+        return [curva(float(t), b, c, d) for t, b, c, d in zip(tiempos, inicios, cambios, duraciones)]
+
+    def _avanzar_tramo(self, indice):
+        """Pasa al siguiente par de valores de una secuencia.
+
+        Retorna False si la interpolacion ya no tiene mas valores."""
+        tramo = self.tramos[indice] + 1
+        valores = self.valores[indice]
+
+        if tramo >= len(valores) - 1:
+            return False
+
+        self.tramos[indice] = tramo
+        self.inicios[indice] = valores[tramo]
+        self.cambios[indice] = valores[tramo + 1] - valores[tramo]
+        self.transcurridos[indice] -= self.duraciones[indice]
+        return True
+
+    def _quitar(self, indice):
+        """Elimina la interpolacion de la posicion ``indice``.
+
+        Mueve la ultima entrada a ese lugar, asi quitar cuesta lo
+        mismo sin importar cuantas interpolaciones haya."""
+        identificador = self.identificadores[indice]
+        objetivo = self.objetivos[indice]
+
+        del self.posiciones[identificador]
+        identificadores = self.por_objetivo[id(objetivo)]
+        identificadores.discard(identificador)
+
+        if not identificadores:
+            del self.por_objetivo[id(objetivo)]
+
+        ultimo = len(self.identificadores) - 1
+
+        for lista in (self.identificadores, self.objetivos, self.asignadores,
+                self.inicios, self.cambios, self.duraciones, self.transcurridos,
+                self.curvas, self.valores, self.tramos, self.al_terminar,
+                self.al_actualizar):
+            lista[indice] = lista[ultimo]
+            lista.pop()
+
+        if indice != ultimo:
+            self.posiciones[self.identificadores[indice]] = indice
+
+
+class _AsignarAtributo(object):
+    "Permite interpolar un atributo como si fuera un metodo ``set_``."
+
+    def __init__(self, objeto, nombre):
+        self.objeto = objeto
+        self.nombre = nombre
+
+    def __call__(self, valor):
+        setattr(self.objeto, self.nombre, valor)
@@ -20,6 +20,9 @@ class Motor(object):
     def obtener_texto(self, texto, x, y):
         abstract()
 
+    def obtener_capas_de_bloques(self, grilla, filas, columnas):
+        abstract()
+
     def obtener_canvas(self, ancho, alto):
         abstract()
 
@@ -73,3 +76,9 @@ class Motor(object):
 
     def ejecutar_bucle_principal(self, mundo, ignorar_errores):
         abstract()
+
+    def definir_rendimiento(self, rendimiento, economico):
+        abstract()
+
+    def despertar(self):
+        abstract()
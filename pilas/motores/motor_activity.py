@@ -6,25 +6,34 @@
 #
 # website - http://www.pilas-engine.com.ar
 
-import os
 import sys
-import copy
+import traceback
 
 from gi.repository import Gtk
 from gi.repository import Gdk
 from gi.repository import GLib
-from gi.repository import GdkPixbuf
 
 import motor
-from pilas import imagenes
+import motor_cairo
+from motor_cairo import BaseActor
+from motor_cairo import GtkImagen
+from motor_cairo import GtkGrilla
+from motor_cairo import GtkCapasDeBloques
+from motor_cairo import GtkTexto
+from motor_cairo import GtkLienzo
+from motor_cairo import GtkSuperficie
+from motor_cairo import GtkActor
+from motor_cairo import GtkSonido
+from motor_cairo import Fondo
 from pilas import actores
 from pilas import eventos
 from pilas import utils
 from pilas import depurador
+from pilas import perfilador
+from pilas import entrada
+from pilas import reloj
 
-from pilas import fps
 from pilas import simbolos
-from pilas import colores
 
 from sugar3.activity import activity
 from sugar3.graphics.toolbarbox import ToolbarBox
@@ -34,498 +43,99 @@ from sugar3.activity.widgets import StopButton
 from sugar3.activity.widgets import ShareButton
 
 
-class BaseActor(object):
+class PlanificadorDeCuadros(object):
+    """Mantiene el bucle de juego sincronizado con el reloj de cuadros de GTK.
 
-    def __init__(self):
-        self._rotacion = 0
-        self._transparencia = 0
-        self.centro_x = 0
-        self.centro_y = 0
-        self._escala_x = 1
-        self._escala_y = 1
-        self._espejado = False
-        self.fijo = 0
+    En cada cuadro del display se consulta al ``reloj`` del motor
+    cuantos pasos fijos de logica corresponden, y la pantalla se
+    dibuja a lo sumo una vez por cuadro.
 
-    def definir_centro(self, x, y):
-        self.centro_x = x
-        self.centro_y = y
-
-    def obtener_posicion(self):
-        return self.x, self.y
-
-    def definir_posicion(self, x, y):
-        self.x, self.y = x, y
-        eventos.actualizar.send("update")
-
-    def obtener_escala(self):
-        return 1 #self._escala_x
-
-    def definir_escala(self, s):
-        #self._escala_x = s
-        #self._escala_y = s
-        #eventos.actualizar.send("update")
-        self._escala_x = 1
-        self._escala_y = 1
-
-    def definir_escala_x(self, s):
-        self._escala_x = s
-
-    def definir_escala_y(self, s):
-        self._escala_y = s
-        eventos.actualizar.send("update")
-
-    def definir_transparencia(self, nuevo_valor):
-        self._transparencia = nuevo_valor
-        eventos.actualizar.send("update")
-
-    def obtener_transparencia(self):
-        return self._transparencia
-
-    def obtener_rotacion(self):
-        return self._rotacion
-
-    def definir_rotacion(self, r):
-        self._rotacion = r
-        eventos.actualizar.send("update")
-
-    def set_espejado(self, espejado):
-        self._espejado = espejado
-        eventos.actualizar.send("update")
-
-
-class GtkImagen(object):
-
-    def __init__(self, ruta):
-        self.ruta_original = ruta
-        self._imagen = GdkPixbuf.Pixbuf.new_from_file(ruta)
-
-    def ancho(self):
-        return self._imagen.get_width()
-
-    def alto(self):
-        return self._imagen.get_height()
-
-    def obtener_ancho(self):
-        return self.ancho()
-
-    def obtener_alto(self):
-        return self.alto()
-
-    def centro(self):
-        "Retorna una tupla con la coordenada del punto medio del la imagen."
-        return (self.ancho() / 2, self.alto() / 2)
-
-    def avanzar(self):
-        pass
-
-    def dibujar(self, motor, x, y, dx=0, dy=0, escala_x=1, escala_y=1, rotacion=0, transparencia=0):
-        """Dibuja la imagen sobre la ventana que muestra el motor.
-
-           x, y: indican la posicion dentro del mundo.
-           dx, dy: es el punto centro de la imagen (importante para rotaciones).
-           escala_x, escala_yindican cambio de tamano (1 significa normal).
-           rotacion: angulo de inclinacion en sentido de las agujas del reloj.
-        """
-
-        motor.context.save()
-        centro_x, centro_y = motor.centro_fisico()
-
-        motor.context.translate(x + centro_x, centro_y - y)
-        motor.context.rotate(rotacion)
-        motor.context.scale(escala_x, escala_y)
-
-        #if transparencia:
-        #    motor.context.setOpacity(1 - transparencia/100.0)
-
-        self._dibujar_pixbuf(motor.context, -dx, -dy)
-        motor.context.restore()
-
-    def _dibujar_pixbuf(self, context, x, y):
-        Gdk.cairo_set_source_pixbuf(context, self._imagen, 0, 0)
-        context.paint()
-
-    def __str__(self):
-        nombre_imagen = os.path.basename(self.ruta_original)
-        return "<Imagen del archivo '%s'>" %(nombre_imagen)
-
-
-class GtkGrilla(GtkImagen):
-
-    """Representa una grilla regular, que se utiliza en animaciones.
-
-       La grilla regular se tiene que crear indicando la cantidad
-       de filas y columnas. Una vez definida se puede usar como
-       una imagen normal, solo que tiene dos metodos adicionales
-       para ``definir_cuadro`` y ``avanzar`` el cuadro actual.
+    En modo economico el planificador se detiene cuando el mundo no
+    tiene nada que simular, y vuelve a funcionar al invocar
+    ``despertar``.
     """
 
-    def __init__(self, ruta, columnas=1, filas=1):
-        GtkImagen.__init__(self, ruta)
-
-        self.cantidad_de_cuadros = columnas * filas
-        self.columnas = columnas
-        self.filas = filas
-        self.cuadro_ancho = GtkImagen.ancho(self) / columnas
-        self.cuadro_alto = GtkImagen.alto(self) / filas
-        self.definir_cuadro(0)
-
-    def ancho(self):
-        return self.cuadro_ancho
-
-    def alto(self):
-        return self.cuadro_alto
-
-    def _dibujar_pixmap(self, motor, x, y):
-        Gdk.cairo_set_source_pixbuf(context, self._imagen, self._image.width(), self._image.height())
-        #motor.context.drawPixmap(x, y, self._imagen, self.dx, self.dy,
-        #        self.cuadro_ancho, self.cuadro_alto)
-
-    def definir_cuadro(self, cuadro):
-        self._cuadro = cuadro
-
-        frame_col = cuadro % self.columnas
-        frame_row = cuadro / self.columnas
-
-        self.dx = frame_col * self.cuadro_ancho
-        self.dy = frame_row * self.cuadro_alto
-        eventos.actualizar.send("update")
-
-    def avanzar(self):
-        ha_reiniciado = False
-        cuadro_actual = self._cuadro + 1
-
-        if cuadro_actual >= self.cantidad_de_cuadros:
-            cuadro_actual = 0
-            ha_reiniciado = True
-
-        self.definir_cuadro(cuadro_actual)
-        return ha_reiniciado
-
-    def obtener_cuadro(self):
-        return self._cuadro
-
-    def dibujarse_sobre_una_pizarra(self, pizarra, x, y):
-        pizarra.pintar_parte_de_imagen(self, self.dx, self.dy, self.cuadro_ancho, self.cuadro_alto, x, y)
-
-
-class GtkTexto(GtkImagen):
-
-    def __init__(self, texto, magnitud, motor):
-        self._ancho, self._alto = motor.obtener_area_de_texto(texto, magnitud)
-
-    def _dibujar_pixmap(self, motor, dx, dy):
-        nombre_de_fuente = motor.context.get_font_face()
-        tamano = 12
-        r, g, b, a = self.color.obtener_componentes()
-
-        motor.context.set_font_face(nombre_de_fuente)
-        motor.context.set_font_size(tamano)
-        motor.context.set_source_rgb(r, g, b)
-
-        lines = self.texto.split('\n')
-
-        for line in lines:
-            extents = motor.context.text_extents(line)
-            motor.context.show_text(dx, dy + self._alto, line)
-            dy += extents[3]
-
-    def ancho(self):
-        return self._ancho
-
-    def alto(self):
-        return self._alto
-
-    def obtener_ancho(self):
-        return self.ancho()
-
-    def obtener_alto(self):
-        return self.alto()
-
-
-class GtkLienzo(GtkImagen):
-
-    def __init__(self):
-        pass
-
-    def texto(self, motor, cadena, x=0, y=0, magnitud=10, fuente=None, color=colores.negro):
-        "Imprime un texto respespetando el desplazamiento de la camara."
-        self.texto_absoluto(motor, cadena, x, y, magnitud, fuente, color)
-
-    def texto_absoluto(self, motor, cadena, x=0, y=0, magnitud=10, fuente=None, color=colores.negro):
-        "Imprime un texto sin respetar al camara."
-        x, y = utils.hacer_coordenada_pantalla_absoluta(x, y)
-
-        r, g, b, a = color.obtener_componentes()
-        motor.context.set_source_rgb(r, g, b)
-
-        if not fuente:
-            fuente = motor.context.get_font_face()
-
-        motor.context.set_font_face(fuente)
-        motor.context.set_font_size(magnitud)
-        motor.context.show_text(x, y, cadena)
-
-    def pintar(self, motor, color):
-        r, g, b, a = color.obtener_componentes()
-        ancho, alto = motor.obtener_area()
-        motor.context.set_source_rgb(r, g, b)
-        motor.context.rectangle(0, 0, ancho, alto)
-
-    def linea(self, motor, x0, y0, x1, y1, color=colores.negro, grosor=1):
-        x0, y0 = utils.hacer_coordenada_pantalla_absoluta(x0, y0)
-        x1, y1 = utils.hacer_coordenada_pantalla_absoluta(x1, y1)
-
-        r, g, b, a = color.obtener_componentes()
-
-        motor.context.set_source_rgb(r, g, b)
-        motor.context.set_line_width(grosor)
-        motor.context.move_to(x0, y0)
-        motor.context.line_to(x1, y1)
-        motor.context.stroke()
-
-    def poligono(self, motor, puntos, color=colores.negro, grosor=1, cerrado=False):
-        x, y = puntos[0]
-        if cerrado:
-            puntos.append((x, y))
-
-        for p in puntos[1:]:
-            nuevo_x, nuevo_y = p
-            self.linea(motor, x, y, nuevo_x, nuevo_y, color, grosor)
-            x, y = nuevo_x, nuevo_y
-
-    def cruz(self, motor, x, y, color=colores.negro, grosor=1):
-        t = 3
-        self.linea(motor, x - t, y - t, x + t, y + t, color, grosor)
-        self.linea(motor, x + t, y - t, x - t, y + t, color, grosor)
-
-    def circulo(self, motor, x, y, radio, color=colores.negro, grosor=1):
-        x, y = utils.hacer_coordenada_pantalla_absoluta(x, y)
-        r, g, b, a = color.obtener_componentes()
-
-        motor.context.set_source_rgb(r, g, b)
-        motor.context.set_line_width(grosor)
-
-        motor.context.arc(x -radio, y - radio, radio * 2, radio * 2)
-        motor.stroke()
-
-    def rectangulo(self, motor, x, y, ancho, alto, color=colores.negro, grosor=1):
-        x, y = utils.hacer_coordenada_pantalla_absoluta(x, y)
-        r, g, b, a = color.obtener_componentes()
-
-        motor.context.set_source_rgb(r, g, b)
-        motor.context.set_line_width(grosor)
-        motor.context.rectangle(x, y, ancho, alto)
-        motor.context.stroke()
-
-
-class GtkSuperficie(GtkImagen):
-
-    def __init__(self, ancho, alto, motor):
-        self.ancho = ancho
-        self.alto = alto
+    def __init__(self, motor, reloj, economico=True):
         self.motor = motor
+        self.reloj = reloj
+        self.economico = economico
 
-    def obtener_ancho(self):
-        return self.ancho
-
-    def obtener_alto(self):
-        return self.alto
-
-    def pintar(self, color):
-        r, g, b, a = color.obtener_componentes()
-        self.motor.context.set_source_rgb(r, g, b)
-        self.motor.context.rectangle(0, 0, self.obtener_ancho(), self.obtener_alto())
-
-    def pintar_parte_de_imagen(self, imagen, origen_x, origen_y, ancho, alto, x, y):
-        #self.motor.area.begin(self._imagen)
-        #self.motor.area.drawPixmap(x, y, imagen._imagen, origen_x, origen_y, ancho, alto)
-        #self.motor.area.end()
-
-        #Gdk.cairo_set_source_pixbuf(self.motor.context, imagen._imagen, x, y)
-        #self.motor.context.paint()
-        print("It's broken")
-
-    def pintar_imagen(self, imagen, x=0, y=0):
-        self.pintar_parte_de_imagen(imagen, 0, 0, imagen.ancho, imagen.alto, x, y)
-
-    def texto(self, cadena, x=0, y=0, magnitud=10, fuente=None, color=colores.negro):
-        #self.motor.area.begin(self._imagen)
-        r, g, b, a = color.obtener_componentes()
-        self.motor.context.set_source_rgb(r, g, b)
-
-        dx = x
-        dy = y
-
-        if not fuente:
-            fuente = self.motor.context.get_font_face()
-
-        self.motor.context.set_font_face(fuente)
-        self.motor.context.set_font_size(magnitud)
-
-        for line in cadena.split('\n'):
-            extents = self.motor.context.text_extents(line)
-            self.motor.context.move_to(dx, dy)
-            self.motor.context.show_text(line)
-            dy += extents[3]
-
-            self.motor.context.move_to(dx, dy)
-            self.motor.context.show_text(cadena)
-
-    def circulo(self, x, y, radio, color=colores.negro, relleno=False, grosor=1):
-        r, g, b, a = color.obtener_componentes()
-        self.motor.context.set_source_rgb(r, g, b)
-        self.motor.context.set_line_width(grosor)
-        self.motor.context.arc(x -radio, y - radio, radio * 2, radio * 2)
-
-        if relleno:
-            self.motor.context.fill()
-
-        else:
-            self.motor.context.stroke()
-
-    def rectangulo(self, x, y, ancho, alto, color=colores.negro, relleno=False, grosor=1):
-        r, g, b, a = color.obtener_componentes()
-        self.motor.context.set_source_rgb(r, g, b)
-        self.motor.context.set_line_width(grosor)
-        self.area.rectangle(x, y, ancho, alto)
-
-        if relleno:
-            self.motor.context.fill()
-
-        else:
-            self.motor.context.stroke()
-
-    def linea(self, x, y, x2, y2, color=colores.negro, grosor=1):
-        r, g, b, a = color.obtener_componentes()
-        self.motor.context.set_source_rgb(r, g, b)
-        self.motor.context.set_line_width(grosor)
-
-        self.motor.context.move_to(x, y)
-        self.motor.context.line_to(x2, y2)
-
-    def poligono(self, puntos, color, grosor, cerrado=False):
-        x, y = puntos[0]
+        self.identificador = None
+        self.usa_reloj_de_cuadros = hasattr(motor.area, 'add_tick_callback')
 
-        if cerrado:
-            puntos.append((x, y))
+    def definir_rendimiento(self, rendimiento):
+        self.reloj.definir_rendimiento(rendimiento)
 
-        for p in puntos[1:]:
-            nuevo_x, nuevo_y = p
-            self.linea(x, y, nuevo_x, nuevo_y, color, grosor)
-            x, y = nuevo_x, nuevo_y
+        # El reloj de cuadros de GTK no depende del rendimiento, pero
+        # el temporizador se crea con el intervalo de cada paso.
+        if self.esta_funcionando() and not self.usa_reloj_de_cuadros:
+            GLib.source_remove(self.identificador)
+            self.identificador = GLib.timeout_add(int(1000 * self.reloj.paso), self._cuando_vence_el_temporizador)
 
-    def dibujar_punto(self, x, y, color=colores.negro):
-        self.circulo(x, y, 3, color=color, relleno=True)
+    def esta_funcionando(self):
+        return self.identificador is not None
 
-    def limpiar(self):
-        self.motor.context.set_source_rgb(0, 0, 0)
-        self.motor.context.rectangle(0, 0, self.alto, self.ancho)
-        self.motor.context.fill()
-
-
-class GtkActor(BaseActor):
-
-    def __init__(self, imagen="sin_imagen.png", x=0, y=0):
+    def iniciar(self):
+        if self.esta_funcionando():
+            return
 
-        if isinstance(imagen, str):
-            self.imagen = imagenes.cargar(imagen)
+        self.reloj.reiniciar()
 
+        if self.usa_reloj_de_cuadros:
+            self.identificador = self.motor.area.add_tick_callback(self._cuando_cambia_el_cuadro)
         else:
-            self.imagen = imagen
-
-        self.x = x
-        self.y = y
-        BaseActor.__init__(self)
+            self.identificador = GLib.timeout_add(int(1000 * self.reloj.paso), self._cuando_vence_el_temporizador)
 
-    def definir_imagen(self, imagen):
-        # permite que varios actores usen la misma grilla.
-        if isinstance(imagen, GtkGrilla):
-            self.imagen = copy.copy(imagen)
+    def detener(self):
+        if not self.esta_funcionando():
+            return
 
+        if self.usa_reloj_de_cuadros:
+            self.motor.area.remove_tick_callback(self.identificador)
         else:
-            self.imagen = imagen
-
-        eventos.actualizar.send("update")
-
-    def obtener_imagen(self):
-        return self.imagen
-
-    def dibujar(self, motor):
-        escala_x, escala_y = self._escala_x, self._escala_y
+            GLib.source_remove(self.identificador)
 
-        if self._espejado:
-            escala_x *= -1
+        self.identificador = None
 
-        #if not self.fijo:
-        #    x = self.x - motor.camara_x
-        #    y = self.y - motor.camara_y
-        #else:
-        #    x = self.x
-        #    y = self.y
+    def despertar(self):
+        "Vuelve a poner en funcionamiento el bucle si estaba detenido."
+        self.iniciar()
 
-        x = self.x
-        y = self.y
-        self.imagen.dibujar(motor, x, y,
-                self.centro_x, self.centro_y,
-                escala_x, escala_y, self._rotacion, self._transparencia)
+    def _cuando_cambia_el_cuadro(self, area, reloj):
+        return self._avanzar(reloj.get_frame_time() / 1000000.0)
 
-    def actualizar(self):
-        eventos.actualizar.send("update")
+    def _cuando_vence_el_temporizador(self):
+        return self._avanzar(GLib.get_monotonic_time() / 1000000.0)
 
+    def _avanzar(self, ahora):
+        # Los eventos del mouse y teclado se emiten al comenzar el
+        # cuadro, antes de actualizar la logica.
+        self.motor.entrada.despachar()
 
-class GtkSonido:
+        for x in range(self.reloj.avanzar(ahora)):
+            self.motor.realizar_actualizacion_logica()
 
-    def __init__(self, ruta):
-        try:
-            import pygame
-            pygame.mixer.init()
-            self.sonido = pygame.mixer.Sound(ruta)
+        if eventos.redibujar.pendiente:
+            self.motor.area.queue_draw()
 
-        except (ImportError, pygame.error):
-            self.sonido = None
+        if self.economico and self._mundo_inactivo():
+            # Al retornar False GTK quita la funcion, asi que solo
+            # se olvida el identificador.
+            self.identificador = None
+            return False
 
-    def reproducir(self):
-        if self.sonido != None:
-            self.sonido.play()
+        return True
 
+    def _mundo_inactivo(self):
+        import pilas
 
-class Fondo(object):
+        if self.motor.pausa_habilitada:
+            return True
 
-    def __init__(self, r=1, g=1, b=1):
-        self.r = r
-        self.g = g
-        self.b = b
+        return pilas.mundo is not None and pilas.mundo.esta_inactivo()
 
-    def pintar(self, motor, x, y, ancho, alto):
-        motor.context.set_source_rgb(self.r, self.g, self.b)
-        motor.context.rectangle(x, y, ancho, alto)
-        motor.context.fill()
-
-    def establecer_rojo(self, valor):
-        "Establce el valor de rojo. Valor: dentro de 0 y 1"
-        self.r = valor
-        eventos.actualizar.send("update")
-
-    def establecer_verde(self, valor):
-        "Establece el valor de verde. Valor: dentro de 0 y 1"
-        self.g = valor
-        eventos.actualizar.send("update")
-
-    def establecer_azul(self, valor):
-        "Establece el valor de azul. Valor: dentro de 0 y 1"
-        self.b = valor
-        eventos.actualizar.send("update")
-
-    def establecer_color(self, r, g, b):
-        """
-        Establece los valores del color (r: Rojo, g: Verde, b: Azul
-        Todos deben ser valores entre 0 y 1
-        """
-
-        self.r = r
-        self.g = g
-        self.b = b
-        eventos.actualizar.send("update")
+    def contar_cuadro_dibujado(self):
+        self.reloj.contar_cuadro(GLib.get_monotonic_time() / 1000000.0)
 
 
 class ActivityBase(activity.Activity, motor.Motor):
@@ -553,10 +163,14 @@ class ActivityBase(activity.Activity, motor.Motor):
         self.area.connect("key-press-event", self.keyPressEvent)
         self.area.connect("key-release-event", self.keyReleaseEvent)
 
-        self.fps = fps.FPS(60, True)
+        self.reloj = reloj.Reloj()
+        self.planificador = PlanificadorDeCuadros(self, self.reloj)
         self.pausa_habilitada = False
+        self.ultimo_error = None
 
-        self.depurador = depurador.Depurador(self.obtener_lienzo(), self.fps)
+        self.perfilador = perfilador.Perfilador()
+        self.entrada = entrada.ColaDeEntrada(self.perfilador)
+        self.depurador = depurador.Depurador(self.obtener_lienzo(), self.reloj)
         self.mouse_x = 0
         self.mouse_y = 0
         self.camara_x = 0
@@ -565,7 +179,7 @@ class ActivityBase(activity.Activity, motor.Motor):
 
         self.__fullscreen = False
 
-        eventos.actualizar.connect(self.actualizar_pantalla)
+        eventos.redibujar.conectar(self.actualizar_pantalla)
 
     def __make_toolbar(self):
         # toolbar with the new toolbar redesign
@@ -614,8 +228,7 @@ class ActivityBase(activity.Activity, motor.Motor):
         self.area.set_size_request(ancho, alto)
 
         self.__make_toolbar()
-        # Activa la invocacion al evento timerEvent.
-        #self.startTimer(1000 / 60.0)
+        self.planificador.iniciar()
 
     def pantalla_completa(self):
         self.__fullscreen = True
@@ -660,8 +273,20 @@ class ActivityBase(activity.Activity, motor.Motor):
     def obtener_grilla(self, ruta, columnas, filas):
         return GtkGrilla(ruta, columnas, filas)
 
+    def obtener_capas_de_bloques(self, grilla, filas, columnas):
+        return GtkCapasDeBloques(grilla, filas, columnas)
+
     def actualizar_pantalla(self, *args):
-        GLib.idle_add(self.area.queue_draw)
+        # Mientras el planificador funciona el dibujado ocurre en el
+        # siguiente cuadro, si esta detenido hay que despertarlo.
+        self.planificador.despertar()
+
+    def definir_rendimiento(self, rendimiento, economico):
+        self.planificador.definir_rendimiento(rendimiento)
+        self.planificador.economico = economico
+
+    def despertar(self):
+        self.planificador.despertar()
 
     def definir_centro_de_la_camara(self, x, y):
         self.camara_x = x
@@ -688,50 +313,37 @@ class ActivityBase(activity.Activity, motor.Motor):
 
     def paintEvent(self, area, context):
         self.context = context
+        eventos.redibujar.limpiar()
 
         alloc = self.area.get_allocation()
         ancho = self.alto * self.ancho_original / self.alto_original
         alto = self.alto
 
+        self.perfilador.comenzar('dibujado_fondo')
         self.fondo.pintar(self, alloc.width / 2 - ancho / 2, 0, ancho, self.alto)
+        self.perfilador.terminar('dibujado_fondo')
 
         alto = self.alto / float(self.alto_original)
         self.context.scale(alto, alto)
 
-        self.depurador.comienza_dibujado(self)
-
-        for actor in actores.todos:
-            try:
-                actor.dibujar(self)
-
-            except Exception as e:
-                actor.eliminar()
-
-            self.depurador.dibuja_al_actor(self, actor)
-
-        self.depurador.termina_dibujado(self)
-
+        motor_cairo.dibujar_actores(self)
+        self.planificador.contar_cuadro_dibujado()
         return False
 
-    def timerEvent(self, event):
+    def realizar_actualizacion_logica(self):
+        "Avanza un solo paso de la simulacion, lo invoca el planificador."
         if not self.pausa_habilitada:
             try:
-                self.realizar_actualizacion_logica()
+                motor_cairo.actualizar_actores(self)
 
-            except Exception as e:
-                pass
+            except Exception:
+                # El mismo error suele repetirse en cada paso, solo se
+                # informa la primera vez.
+                error = traceback.format_exc()
 
-        # Invoca el dibujado de la pantalla.
-        self.update()
-
-    def realizar_actualizacion_logica(self):
-        for x in range(self.fps.actualizar()):
-            if not self.pausa_habilitada:
-                eventos.actualizar.send("update")
-
-                for actor in actores.todos:
-                    actor.pre_actualizar()
-                    actor.actualizar()
+                if error != self.ultimo_error:
+                    self.ultimo_error = error
+                    sys.stderr.write(error)
 
     def resizeEvent(self, area, event):
         self.ancho = event.size().width()
@@ -740,12 +352,14 @@ class ActivityBase(activity.Activity, motor.Motor):
     def mousePressEvent(self, area, e):
         escala = self.escala()
         x, y = utils.convertir_de_posicion_fisica_relativa(e.x / escala, e.y / escala)
-        eventos.click_de_mouse.send("button-press-event", x=x, y=y, dx=0, dy=0)
+        self.planificador.despertar()
+        self.entrada.agregar(eventos.click_de_mouse, "button-press-event", x=x, y=y, dx=0, dy=0)
 
     def mouseReleaseEvent(self, area, e):
         escala = self.escala()
         x, y = utils.convertir_de_posicion_fisica_relativa(e.x / escala, e.y / escala)
-        eventos.termina_click.send("button-release-event", x=x, y=y, dx=0, dy=0)
+        self.planificador.despertar()
+        self.entrada.agregar(eventos.termina_click, "button-release-event", x=x, y=y, dx=0, dy=0)
 
     def wheelEvent(self, area, e):
         #eventos.mueve_rueda.send("scroll-event", delta=e.delta() / 120)
@@ -756,19 +370,20 @@ class ActivityBase(activity.Activity, motor.Motor):
         escala = self.escala()
         x, y = utils.convertir_de_posicion_fisica_relativa(e.x / escala, e.y / escala)
         dx, dy = x - self.mouse_x, y - self.mouse_y
+        self.planificador.despertar()
 
-        eventos.mueve_mouse.send("motion-notify-event", x=x, y=y, dx=dx, dy=dy)
+        # Los movimientos de un mismo cuadro se combinan en la cola.
+        self.entrada.agregar(eventos.mueve_mouse, "motion-notify-event", x=x, y=y, dx=dx, dy=dy)
 
         self.mouse_x = x
         self.mouse_y = y
 
-        self.actualizar_pantalla()
-
     def keyPressEvent(self, area, event):
         codigo_de_tecla = self.obtener_codigo_de_tecla_normalizado(event.key())
+        self.planificador.despertar()
 
         if event.keyval == Gdk.KEY_Escape:
-            eventos.pulsa_tecla_escape.send("key-press-event")
+            self.entrada.agregar(eventos.pulsa_tecla_escape, "key-press-event")
 
         if event.keyval == Gdk.KEY_P:
             self.alternar_pausa()
@@ -776,11 +391,12 @@ class ActivityBase(activity.Activity, motor.Motor):
         if event.keyval == Gdk.KEY_F:
             self.alternar_pantalla_completa()
 
-        eventos.pulsa_tecla.send("key-press-event", codigo=codigo_de_tecla, texto=event.text())
+        self.entrada.agregar(eventos.pulsa_tecla, "key-press-event", codigo=codigo_de_tecla, texto=event.text())
 
     def keyReleaseEvent(self, area, event):
         codigo_de_tecla = self.obtener_codigo_de_tecla_normalizado(event.key())
-        eventos.suelta_tecla.send("key-release-event", codigo=codigo_de_tecla, texto=event.text())
+        self.planificador.despertar()
+        self.entrada.agregar(eventos.suelta_tecla, "key-release-event", codigo=codigo_de_tecla, texto=event.text())
 
     def obtener_codigo_de_tecla_normalizado(self, tecla):
         teclas = {
@@ -815,18 +431,7 @@ class ActivityBase(activity.Activity, motor.Motor):
         return self.alto / float(self.alto_original)
 
     def obtener_area_de_texto(self, texto, magnitud=10):
-        ancho = 0
-        alto = 0
-
-        self.context.set_font_size(magnitud)
-
-        lineas = texto.split('\n')
-
-        for linea in lineas:
-            extents = self.context.text_extents(texto)
-            ancho = max(ancho, extents[2])
-            alto += extents[3]
-
+        ancho, alto, ascenso = motor_cairo.textos.medir(texto, None, magnitud)
         return ancho, alto
 
     def alternar_pausa(self):
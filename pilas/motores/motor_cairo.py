@@ -0,0 +1,931 @@
+# -*- encoding: utf-8 -*-
+# pilas engine - a video game framework.
+#
+# copyright 2015 - Cristian García
+# license: lgplv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# website - http://www.pilas-engine.com.ar
+
+"""Componentes de dibujado sobre cairo compartidos por los motores.
+
+Este modulo no depende de una ventana ni de una sesion de Sugar, solo
+de cairo y GdkPixbuf, asi que lo pueden usar tanto el motor de la
+actividad como el motor sin ventana.
+"""
+
+import os
+import copy
+import math
+import timeit
+import collections
+
+import cairo
+from gi.repository import Gdk
+from gi.repository import GdkPixbuf
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pilas import imagenes
+from pilas import actores
+from pilas import eventos
+from pilas import utils
+from pilas import colores
+
+
+class BaseActor(object):
+
+    def __init__(self):
+        self._rotacion = 0
+        self._transparencia = 0
+        self.centro_x = 0
+        self.centro_y = 0
+        self._escala_x = 1
+        self._escala_y = 1
+        self._espejado = False
+        self.fijo = 0
+
+    def definir_centro(self, x, y):
+        self.centro_x = x
+        self.centro_y = y
+
+    def obtener_posicion(self):
+        return self.x, self.y
+
+    def definir_posicion(self, x, y):
+        self.x, self.y = x, y
+        eventos.redibujar.avisar()
+
+    def obtener_escala(self):
+        return 1 #self._escala_x
+
+    def definir_escala(self, s):
+        #self._escala_x = s
+        #self._escala_y = s
+        #eventos.redibujar.avisar()
+        self._escala_x = 1
+        self._escala_y = 1
+
+    def definir_escala_x(self, s):
+        self._escala_x = s
+        eventos.redibujar.avisar()
+
+    def definir_escala_y(self, s):
+        self._escala_y = s
+        eventos.redibujar.avisar()
+
+    def definir_transparencia(self, nuevo_valor):
+        self._transparencia = nuevo_valor
+        eventos.redibujar.avisar()
+
+    def obtener_transparencia(self):
+        return self._transparencia
+
+    def obtener_rotacion(self):
+        return self._rotacion
+
+    def definir_rotacion(self, r):
+        self._rotacion = r
+        eventos.redibujar.avisar()
+
+    def set_espejado(self, espejado):
+        self._espejado = espejado
+        eventos.redibujar.avisar()
+
+
+class SuperficieCacheada(object):
+    """Superficie de cairo que se genera a partir de un pixbuf.
+
+    Pasar un pixbuf a cairo implica recorrer todos sus pixeles para
+    premultiplicar el canal alpha, asi que la conversion se hace una
+    sola vez, la primera vez que se dibuja, y luego se reutiliza la
+    superficie en cada cuadro.
+
+    Si el pixbuf cambia hay que llamar a ``invalidar``.
+    """
+
+    def __init__(self, pixbuf):
+        self.pixbuf = pixbuf
+        self._superficie = None
+
+    def obtener(self):
+        if self._superficie is None:
+            ancho = self.pixbuf.get_width()
+            alto = self.pixbuf.get_height()
+
+            superficie = cairo.ImageSurface(cairo.FORMAT_ARGB32, ancho, alto)
+            context = cairo.Context(superficie)
+            Gdk.cairo_set_source_pixbuf(context, self.pixbuf, 0, 0)
+            context.paint()
+            superficie.flush()
+
+            self._superficie = superficie
+
+        return self._superficie
+
+    def invalidar(self, pixbuf=None):
+        "Descarta la superficie, se volvera a generar en el proximo dibujado."
+        if pixbuf is not None:
+            self.pixbuf = pixbuf
+
+        self._superficie = None
+
+
+class TextoDibujado(object):
+    "Un texto ya dibujado sobre una superficie, junto con sus medidas."
+
+    def __init__(self, superficie, ancho, alto, ascenso):
+        self.superficie = superficie
+        self.ancho = ancho
+        self.alto = alto
+        self.ascenso = ascenso
+
+
+class CacheDeTextos(object):
+    """Mantiene los textos dibujados para reutilizarlos en cada cuadro.
+
+    Dibujar un texto con cairo implica buscar la fuente y rasterizar
+    cada letra, asi que los textos se dibujan una sola vez sobre una
+    superficie y luego se reutiliza mientras la cadena, la fuente, la
+    magnitud y el color no cambien. Las medidas de los textos tambien
+    se recuerdan, y se usan para ``obtener_area_de_texto``.
+
+    Cuando se superan los ``capacidad`` textos se descartan los que
+    hace mas tiempo no se dibujan.
+    """
+
+    def __init__(self, capacidad=256):
+        self.capacidad = capacidad
+        self.textos = collections.OrderedDict()
+        self.medidas = collections.OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+        # Contexto auxiliar, solo se usa para medir textos.
+        self._context = cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 1, 1))
+
+    def _preparar_fuente(self, context, fuente, magnitud):
+        if isinstance(fuente, basestring):
+            context.select_font_face(fuente)
+        elif fuente:
+            context.set_font_face(fuente)
+
+        context.set_font_size(magnitud)
+
+    def medir(self, cadena, fuente=None, magnitud=10):
+        """Retorna el ancho, el alto y el ascenso de un texto.
+
+        El alto contempla todas las lineas del texto, y el ascenso
+        es la distancia entre el borde superior y la linea base de
+        la primer linea."""
+        clave = (cadena, fuente, magnitud)
+
+        if clave in self.medidas:
+            medida = self.medidas.pop(clave)
+            self.medidas[clave] = medida
+            return medida
+
+        self._preparar_fuente(self._context, fuente, magnitud)
+        ascenso, descenso, alto_de_linea = self._context.font_extents()[:3]
+        lineas = cadena.split('\n')
+        ancho = max(self._context.text_extents(linea)[4] for linea in lineas)
+
+        medida = (int(math.ceil(ancho)), int(math.ceil(alto_de_linea * len(lineas))), ascenso)
+        self.medidas[clave] = medida
+
+        if len(self.medidas) > self.capacidad:
+            self.medidas.popitem(last=False)
+
+        return medida
+
+    def obtener(self, cadena, fuente=None, magnitud=10, color=colores.negro):
+        "Retorna el texto dibujado sobre una superficie, como un objeto TextoDibujado."
+        componentes = color.obtener_componentes()
+        clave = (cadena, fuente, magnitud, componentes)
+
+        if clave in self.textos:
+            texto = self.textos.pop(clave)
+            self.textos[clave] = texto
+            self.aciertos += 1
+            return texto
+
+        self.fallos += 1
+        ancho, alto, ascenso = self.medir(cadena, fuente, magnitud)
+        superficie = cairo.ImageSurface(cairo.FORMAT_ARGB32, max(ancho, 1), max(alto, 1))
+        context = cairo.Context(superficie)
+        self._preparar_fuente(context, fuente, magnitud)
+
+        r, g, b, a = componentes
+        context.set_source_rgba(r / 255.0, g / 255.0, b / 255.0, a / 255.0)
+        alto_de_linea = context.font_extents()[2]
+
+        for indice, linea in enumerate(cadena.split('\n')):
+            context.move_to(0, ascenso + indice * alto_de_linea)
+            context.show_text(linea)
+
+        superficie.flush()
+        texto = TextoDibujado(superficie, ancho, alto, ascenso)
+        self.textos[clave] = texto
+
+        if len(self.textos) > self.capacidad:
+            self.textos.popitem(last=False)
+            self.desalojos += 1
+
+        return texto
+
+    def dibujar(self, context, cadena, x, y, magnitud=10, fuente=None, color=colores.negro):
+        "Dibuja un texto dejando la linea base de la primer linea en ``y``."
+        texto = self.obtener(cadena, fuente, magnitud, color)
+        context.set_source_surface(texto.superficie, x, y - texto.ascenso)
+        context.paint()
+
+    def limpiar(self):
+        self.textos.clear()
+        self.medidas.clear()
+
+    def estadisticas(self):
+        return {
+                'textos': len(self.textos),
+                'medidas': len(self.medidas),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                }
+
+
+textos = CacheDeTextos()
+
+
+class GtkImagen(object):
+
+    def __init__(self, ruta):
+        self.ruta_original = ruta
+        self._imagen = GdkPixbuf.Pixbuf.new_from_file(ruta)
+        self._superficie = SuperficieCacheada(self._imagen)
+
+    def invalidar(self):
+        """Indica que el contenido de la imagen ha cambiado.
+
+        Es necesario llamarlo luego de modificar el pixbuf de la
+        imagen, para que no se siga dibujando la version anterior."""
+        self._superficie.invalidar(self._imagen)
+        eventos.redibujar.avisar()
+
+    def ancho(self):
+        return self._imagen.get_width()
+
+    def alto(self):
+        return self._imagen.get_height()
+
+    def obtener_ancho(self):
+        return self.ancho()
+
+    def obtener_alto(self):
+        return self.alto()
+
+    def tamano_en_bytes(self):
+        "Memoria aproximada que ocupa la imagen, contando su superficie de cairo."
+        return self._imagen.get_rowstride() * self._imagen.get_height() * 2
+
+    def centro(self):
+        "Retorna una tupla con la coordenada del punto medio del la imagen."
+        return (self.ancho() / 2, self.alto() / 2)
+
+    def avanzar(self):
+        pass
+
+    def dibujar(self, motor, x, y, dx=0, dy=0, escala_x=1, escala_y=1, rotacion=0, transparencia=0):
+        """Dibuja la imagen sobre la ventana que muestra el motor.
+
+           x, y: indican la posicion dentro del mundo.
+           dx, dy: es el punto centro de la imagen (importante para rotaciones).
+           escala_x, escala_yindican cambio de tamano (1 significa normal).
+           rotacion: angulo de inclinacion en sentido de las agujas del reloj.
+        """
+
+        motor.context.save()
+        centro_x, centro_y = motor.centro_fisico()
+
+        motor.context.translate(x + centro_x, centro_y - y)
+        motor.context.rotate(rotacion)
+        motor.context.scale(escala_x, escala_y)
+
+        #if transparencia:
+        #    motor.context.setOpacity(1 - transparencia/100.0)
+
+        self._dibujar_pixbuf(motor.context, -dx, -dy)
+        motor.context.restore()
+
+    def _dibujar_pixbuf(self, context, x, y):
+        context.set_source_surface(self._superficie.obtener(), x, y)
+        context.paint()
+
+    def __str__(self):
+        nombre_imagen = os.path.basename(self.ruta_original)
+        return "<Imagen del archivo '%s'>" %(nombre_imagen)
+
+
+class GtkGrilla(GtkImagen):
+
+    """Representa una grilla regular, que se utiliza en animaciones.
+
+       La grilla regular se tiene que crear indicando la cantidad
+       de filas y columnas. Una vez definida se puede usar como
+       una imagen normal, solo que tiene dos metodos adicionales
+       para ``definir_cuadro`` y ``avanzar`` el cuadro actual.
+    """
+
+    def __init__(self, ruta, columnas=1, filas=1):
+        GtkImagen.__init__(self, ruta)
+
+        self.cantidad_de_cuadros = columnas * filas
+        self.columnas = columnas
+        self.filas = filas
+        self.cuadro_ancho = GtkImagen.ancho(self) / columnas
+        self.cuadro_alto = GtkImagen.alto(self) / filas
+        self.definir_cuadro(0)
+
+    def ancho(self):
+        return self.cuadro_ancho
+
+    def alto(self):
+        return self.cuadro_alto
+
+    def _dibujar_pixbuf(self, context, x, y):
+        # Las copias de la grilla comparten la misma superficie, solo
+        # se recorta el cuadro actual.
+        context.rectangle(x, y, self.cuadro_ancho, self.cuadro_alto)
+        context.clip()
+        context.set_source_surface(self._superficie.obtener(), x - self.dx, y - self.dy)
+        context.paint()
+
+    def definir_cuadro(self, cuadro):
+        self._cuadro = cuadro
+
+        frame_col = cuadro % self.columnas
+        frame_row = cuadro / self.columnas
+
+        self.dx = frame_col * self.cuadro_ancho
+        self.dy = frame_row * self.cuadro_alto
+        eventos.redibujar.avisar()
+
+    def avanzar(self):
+        ha_reiniciado = False
+        cuadro_actual = self._cuadro + 1
+
+        if cuadro_actual >= self.cantidad_de_cuadros:
+            cuadro_actual = 0
+            ha_reiniciado = True
+
+        self.definir_cuadro(cuadro_actual)
+        return ha_reiniciado
+
+    def obtener_cuadro(self):
+        return self._cuadro
+
+    def dibujarse_sobre_una_pizarra(self, pizarra, x, y):
+        pizarra.pintar_parte_de_imagen(self, self.dx, self.dy, self.cuadro_ancho, self.cuadro_alto, x, y)
+
+
+class GtkCapasDeBloques(GtkImagen):
+    """Imagen de un mapa de bloques, que se dibuja por porciones.
+
+    Cada capa guarda solamente los bloques no vacios, en un diccionario
+    de (fila, columna) a indice de cuadro dentro de la grilla. Para
+    dibujar, cada capa se divide en porciones de ``bloques_por_porcion``
+    x ``bloques_por_porcion`` bloques que se pintan una sola vez sobre
+    una superficie propia. Cuando cambia un bloque solo se vuelve a
+    pintar la porcion que lo contiene.
+    """
+
+    def __init__(self, grilla, filas, columnas, bloques_por_porcion=16):
+        self.grilla = grilla
+        self.filas = filas
+        self.columnas = columnas
+        self.bloques_por_porcion = bloques_por_porcion
+        self.capas = []
+        self.porciones = []
+        self.porciones_a_pintar = set()
+
+    def ancho(self):
+        return self.columnas * self.grilla.cuadro_ancho
+
+    def alto(self):
+        return self.filas * self.grilla.cuadro_alto
+
+    def definir_bloque(self, fila, columna, indice, capa=0):
+        "Cambia un bloque del mapa, con un indice None se borra el bloque."
+        while len(self.capas) <= capa:
+            self.capas.append({})
+            self.porciones.append({})
+
+        if indice is None:
+            self.capas[capa].pop((fila, columna), None)
+        else:
+            self.capas[capa][(fila, columna)] = indice
+
+        n = self.bloques_por_porcion
+        self.porciones_a_pintar.add((capa, fila / n, columna / n))
+        eventos.redibujar.avisar()
+
+    def obtener_bloque(self, fila, columna, capa=0):
+        if capa < len(self.capas):
+            return self.capas[capa].get((fila, columna))
+
+    def limpiar(self):
+        "Elimina todos los bloques de todas las capas."
+        self.capas = []
+        self.porciones = []
+        self.porciones_a_pintar.clear()
+        eventos.redibujar.avisar()
+
+    def _pintar_porcion(self, capa, fila_porcion, columna_porcion):
+        n = self.bloques_por_porcion
+        ancho = self.grilla.cuadro_ancho
+        alto = self.grilla.cuadro_alto
+        bloques = self.capas[capa]
+        origen = self.grilla._superficie.obtener()
+
+        superficie = None
+        context = None
+
+        for fila in range(fila_porcion * n, (fila_porcion + 1) * n):
+            for columna in range(columna_porcion * n, (columna_porcion + 1) * n):
+                indice = bloques.get((fila, columna))
+
+                if indice is None:
+                    continue
+
+                if superficie is None:
+                    superficie = cairo.ImageSurface(cairo.FORMAT_ARGB32, n * ancho, n * alto)
+                    context = cairo.Context(superficie)
+
+                x = (columna - columna_porcion * n) * ancho
+                y = (fila - fila_porcion * n) * alto
+                origen_x = (indice % self.grilla.columnas) * ancho
+                origen_y = (indice / self.grilla.columnas) * alto
+
+                context.save()
+                context.rectangle(x, y, ancho, alto)
+                context.clip()
+                context.set_source_surface(origen, x - origen_x, y - origen_y)
+                context.paint()
+                context.restore()
+
+        porciones = self.porciones[capa]
+
+        if superficie is None:
+            porciones.pop((fila_porcion, columna_porcion), None)
+        else:
+            superficie.flush()
+            porciones[(fila_porcion, columna_porcion)] = superficie
+
+    def _dibujar_pixbuf(self, context, x, y):
+        for porcion in self.porciones_a_pintar:
+            self._pintar_porcion(*porcion)
+
+        self.porciones_a_pintar.clear()
+
+        ancho = self.bloques_por_porcion * self.grilla.cuadro_ancho
+        alto = self.bloques_por_porcion * self.grilla.cuadro_alto
+        izquierda, arriba, derecha, abajo = context.clip_extents()
+
+        for porciones in self.porciones:
+            for (fila, columna), superficie in porciones.iteritems():
+                px = x + columna * ancho
+                py = y + fila * alto
+
+                # Omite las porciones que quedan fuera de la pantalla.
+                if px > derecha or py > abajo or px + ancho < izquierda or py + alto < arriba:
+                    continue
+
+                context.set_source_surface(superficie, px, py)
+                context.paint()
+
+
+class GtkTexto(GtkImagen):
+
+    def __init__(self, texto, magnitud, motor):
+        self.texto = texto
+        self.magnitud = magnitud
+        self.color = colores.negro
+
+    def _dibujar_pixbuf(self, context, x, y):
+        texto = textos.obtener(self.texto, None, self.magnitud, self.color)
+        context.set_source_surface(texto.superficie, x, y)
+        context.paint()
+
+    def ancho(self):
+        return textos.medir(self.texto, None, self.magnitud)[0]
+
+    def alto(self):
+        return textos.medir(self.texto, None, self.magnitud)[1]
+
+    def obtener_ancho(self):
+        return self.ancho()
+
+    def obtener_alto(self):
+        return self.alto()
+
+
+class LoteDeDibujo(object):
+    """Junta lineas, circulos y rectangulos para dibujarlos con pocas llamadas a cairo.
+
+    Las figuras se agrupan por color, grosor y relleno. Al dibujar el
+    lote, cada grupo se envia a cairo como un solo camino, con un solo
+    ``stroke`` o ``fill``, en lugar de uno por cada linea.
+
+    Si se indica ``centro``, las coordenadas son las de pilas: el punto
+    (0, 0) esta en ``centro`` y el eje y crece hacia arriba. Si no, se
+    usan tal cual sobre la superficie. Se usa con ``with``::
+
+        with lienzo.lote(motor) as lote:
+            lote.circulo(0, 0, 50, pilas.colores.rojo)
+            lote.poligono([(0, 0), (100, 0), (100, 100)], pilas.colores.verde, cerrado=True)
+
+    Los metodos ``poligono`` y ``segmentos`` tambien aceptan arreglos
+    de numpy, que se convierten a coordenadas de pantalla de una vez.
+    """
+
+    def __init__(self, context, centro=None):
+        self.context = context
+        self.centro = centro
+        self.grupos = collections.OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.dibujar()
+        else:
+            self.grupos.clear()
+
+    def _obtener_grupo(self, color, grosor, relleno):
+        clave = (color.obtener_componentes(), grosor, relleno)
+        grupo = self.grupos.get(clave)
+
+        if grupo is None:
+            grupo = self.grupos[clave] = []
+
+        return grupo
+
+    def _convertir(self, x, y):
+        if self.centro is None:
+            return (x, y)
+
+        return (self.centro[0] + x, self.centro[1] - y)
+
+    def _convertir_puntos(self, puntos):
+        "Convierte una secuencia de puntos (x, y), o un arreglo de numpy de Nx2."
+        if numpy is not None and isinstance(puntos, numpy.ndarray):
+            puntos = numpy.asarray(puntos, dtype=float).reshape(-1, 2)
+
+            if self.centro is not None:
+                convertidos = numpy.empty_like(puntos)
+                convertidos[:, 0] = puntos[:, 0] + self.centro[0]
+                convertidos[:, 1] = self.centro[1] - puntos[:, 1]
+                puntos = convertidos
+
+            return puntos.tolist()
+
+        return [self._convertir(x, y) for (x, y) in puntos]
+
+    def linea(self, x0, y0, x1, y1, color=colores.negro, grosor=1):
+        puntos = [self._convertir(x0, y0), self._convertir(x1, y1)]
+        self._obtener_grupo(color, grosor, False).append(('camino', puntos, False))
+
+    def poligono(self, puntos, color=colores.negro, grosor=1, cerrado=False, relleno=False):
+        "Agrega una linea que une todos los puntos, o una figura rellena."
+        puntos = self._convertir_puntos(puntos)
+
+        if len(puntos) > 1:
+            self._obtener_grupo(color, grosor, relleno).append(('camino', puntos, cerrado or relleno))
+
+    def segmentos(self, puntos, color=colores.negro, grosor=1):
+        """Agrega lineas independientes, tomando los puntos de a pares.
+
+        Con numpy se puede indicar un arreglo de Nx4 con las
+        coordenadas ``x0, y0, x1, y1`` de cada linea."""
+        puntos = self._convertir_puntos(puntos)
+
+        if len(puntos) > 1:
+            self._obtener_grupo(color, grosor, False).append(('segmentos', puntos))
+
+    def cruz(self, x, y, color=colores.negro, grosor=1):
+        t = 3
+        self.segmentos([(x - t, y - t), (x + t, y + t), (x + t, y - t), (x - t, y + t)], color, grosor)
+
+    def circulo(self, x, y, radio, color=colores.negro, grosor=1, relleno=False):
+        x, y = self._convertir(x, y)
+        self._obtener_grupo(color, grosor, relleno).append(('circulo', x, y, radio))
+
+    def rectangulo(self, x, y, ancho, alto, color=colores.negro, grosor=1, relleno=False):
+        "Agrega un rectangulo, indicando su esquina superior izquierda."
+        x, y = self._convertir(x, y)
+        self._obtener_grupo(color, grosor, relleno).append(('rectangulo', x, y, ancho, alto))
+
+    def dibujar(self):
+        "Dibuja todas las figuras agregadas y vacia el lote."
+        context = self.context
+
+        for (componentes, grosor, relleno), figuras in self.grupos.iteritems():
+            r, g, b, a = componentes
+            context.set_source_rgba(r / 255.0, g / 255.0, b / 255.0, a / 255.0)
+            context.set_line_width(grosor)
+            context.new_path()
+
+            for figura in figuras:
+                tipo = figura[0]
+
+                if tipo == 'camino':
+                    puntos = figura[1]
+                    context.move_to(*puntos[0])
+
+                    for indice in xrange(1, len(puntos)):
+                        context.line_to(*puntos[indice])
+
+                    if figura[2]:
+                        context.close_path()
+
+                elif tipo == 'segmentos':
+                    puntos = figura[1]
+
+                    for indice in xrange(0, len(puntos) - 1, 2):
+                        context.move_to(*puntos[indice])
+                        context.line_to(*puntos[indice + 1])
+
+                elif tipo == 'circulo':
+                    tipo, x, y, radio = figura
+                    context.new_sub_path()
+                    context.arc(x, y, radio, 0, 2 * math.pi)
+
+                else:
+                    tipo, x, y, ancho, alto = figura
+                    context.rectangle(x, y, ancho, alto)
+
+            if relleno:
+                context.fill()
+            else:
+                context.stroke()
+
+        self.grupos.clear()
+
+
+class GtkLienzo(GtkImagen):
+
+    def __init__(self):
+        pass
+
+    def texto(self, motor, cadena, x=0, y=0, magnitud=10, fuente=None, color=colores.negro):
+        "Imprime un texto respespetando el desplazamiento de la camara."
+        self.texto_absoluto(motor, cadena, x, y, magnitud, fuente, color)
+
+    def texto_absoluto(self, motor, cadena, x=0, y=0, magnitud=10, fuente=None, color=colores.negro):
+        "Imprime un texto sin respetar al camara."
+        x, y = utils.hacer_coordenada_pantalla_absoluta(x, y)
+        textos.dibujar(motor.context, cadena, x, y, magnitud, fuente, color)
+
+    def pintar(self, motor, color):
+        ancho, alto = motor.obtener_area()
+
+        with LoteDeDibujo(motor.context) as lote:
+            lote.rectangulo(0, 0, ancho, alto, color, relleno=True)
+
+    def linea(self, motor, x0, y0, x1, y1, color=colores.negro, grosor=1):
+        with self.lote(motor) as lote:
+            lote.linea(x0, y0, x1, y1, color, grosor)
+
+    def lote(self, motor):
+        "Retorna un ``LoteDeDibujo`` para dibujar muchas figuras juntas sobre la ventana."
+        return LoteDeDibujo(motor.context, motor.centro_fisico())
+
+    def poligono(self, motor, puntos, color=colores.negro, grosor=1, cerrado=False):
+        with self.lote(motor) as lote:
+            lote.poligono(puntos, color, grosor, cerrado)
+
+    def cruz(self, motor, x, y, color=colores.negro, grosor=1):
+        with self.lote(motor) as lote:
+            lote.cruz(x, y, color, grosor)
+
+    def circulo(self, motor, x, y, radio, color=colores.negro, grosor=1):
+        with self.lote(motor) as lote:
+            lote.circulo(x, y, radio, color, grosor)
+
+    def rectangulo(self, motor, x, y, ancho, alto, color=colores.negro, grosor=1, relleno=False):
+        with self.lote(motor) as lote:
+            lote.rectangulo(x, y, ancho, alto, color, grosor, relleno)
+
+
+class GtkSuperficie(GtkImagen):
+
+    def __init__(self, ancho, alto, motor):
+        self.ancho = ancho
+        self.alto = alto
+        self.motor = motor
+
+    def obtener_ancho(self):
+        return self.ancho
+
+    def obtener_alto(self):
+        return self.alto
+
+    def pintar(self, color):
+        with self.lote() as lote:
+            lote.rectangulo(0, 0, self.obtener_ancho(), self.obtener_alto(), color, relleno=True)
+
+    def pintar_parte_de_imagen(self, imagen, origen_x, origen_y, ancho, alto, x, y):
+        #self.motor.area.begin(self._imagen)
+        #self.motor.area.drawPixmap(x, y, imagen._imagen, origen_x, origen_y, ancho, alto)
+        #self.motor.area.end()
+
+        #Gdk.cairo_set_source_pixbuf(self.motor.context, imagen._imagen, x, y)
+        #self.motor.context.paint()
+        print("It's broken")
+
+    def pintar_imagen(self, imagen, x=0, y=0):
+        self.pintar_parte_de_imagen(imagen, 0, 0, imagen.ancho, imagen.alto, x, y)
+
+    def texto(self, cadena, x=0, y=0, magnitud=10, fuente=None, color=colores.negro):
+        textos.dibujar(self.motor.context, cadena, x, y, magnitud, fuente, color)
+
+    def lote(self, centro=None):
+        """Retorna un ``LoteDeDibujo`` para dibujar muchas figuras juntas.
+
+        Sin ``centro`` las coordenadas son las de la superficie."""
+        return LoteDeDibujo(self.motor.context, centro)
+
+    def circulo(self, x, y, radio, color=colores.negro, relleno=False, grosor=1):
+        with self.lote() as lote:
+            lote.circulo(x, y, radio, color, grosor, relleno)
+
+    def rectangulo(self, x, y, ancho, alto, color=colores.negro, relleno=False, grosor=1):
+        with self.lote() as lote:
+            lote.rectangulo(x, y, ancho, alto, color, grosor, relleno)
+
+    def linea(self, x, y, x2, y2, color=colores.negro, grosor=1):
+        with self.lote() as lote:
+            lote.linea(x, y, x2, y2, color, grosor)
+
+    def poligono(self, puntos, color, grosor, cerrado=False):
+        with self.lote() as lote:
+            lote.poligono(puntos, color, grosor, cerrado)
+
+    def dibujar_punto(self, x, y, color=colores.negro):
+        self.circulo(x, y, 3, color=color, relleno=True)
+
+    def limpiar(self):
+        self.motor.context.set_source_rgb(0, 0, 0)
+        self.motor.context.rectangle(0, 0, self.alto, self.ancho)
+        self.motor.context.fill()
+
+
+class GtkActor(BaseActor):
+
+    def __init__(self, imagen="sin_imagen.png", x=0, y=0):
+
+        if isinstance(imagen, str):
+            self.imagen = imagenes.cargar(imagen)
+
+        else:
+            self.imagen = imagen
+
+        self.x = x
+        self.y = y
+        BaseActor.__init__(self)
+
+    def definir_imagen(self, imagen):
+        # permite que varios actores usen la misma grilla.
+        if isinstance(imagen, GtkGrilla):
+            self.imagen = copy.copy(imagen)
+
+        else:
+            self.imagen = imagen
+
+        eventos.redibujar.avisar()
+
+    def obtener_imagen(self):
+        return self.imagen
+
+    def dibujar(self, motor):
+        escala_x, escala_y = self._escala_x, self._escala_y
+
+        if self._espejado:
+            escala_x *= -1
+
+        #if not self.fijo:
+        #    x = self.x - motor.camara_x
+        #    y = self.y - motor.camara_y
+        #else:
+        #    x = self.x
+        #    y = self.y
+
+        x = self.x
+        y = self.y
+        self.imagen.dibujar(motor, x, y,
+                self.centro_x, self.centro_y,
+                escala_x, escala_y, self._rotacion, self._transparencia)
+
+    def actualizar(self):
+        eventos.redibujar.avisar()
+
+
+class GtkSonido:
+
+    def __init__(self, ruta):
+        try:
+            import pygame
+            pygame.mixer.init()
+            self.sonido = pygame.mixer.Sound(ruta)
+
+        except (ImportError, pygame.error):
+            self.sonido = None
+
+    def reproducir(self):
+        if self.sonido != None:
+            self.sonido.play()
+
+
+class Fondo(object):
+
+    def __init__(self, r=1, g=1, b=1):
+        self.r = r
+        self.g = g
+        self.b = b
+
+    def pintar(self, motor, x, y, ancho, alto):
+        motor.context.set_source_rgb(self.r, self.g, self.b)
+        motor.context.rectangle(x, y, ancho, alto)
+        motor.context.fill()
+
+    def establecer_rojo(self, valor):
+        "Establce el valor de rojo. Valor: dentro de 0 y 1"
+        self.r = valor
+        eventos.redibujar.avisar()
+
+    def establecer_verde(self, valor):
+        "Establece el valor de verde. Valor: dentro de 0 y 1"
+        self.g = valor
+        eventos.redibujar.avisar()
+
+    def establecer_azul(self, valor):
+        "Establece el valor de azul. Valor: dentro de 0 y 1"
+        self.b = valor
+        eventos.redibujar.avisar()
+
+    def establecer_color(self, r, g, b):
+        """
+        Establece los valores del color (r: Rojo, g: Verde, b: Azul
+        Todos deben ser valores entre 0 y 1
+        """
+
+        self.r = r
+        self.g = g
+        self.b = b
+        eventos.redibujar.avisar()
+
+
+def dibujar_actores(motor):
+    "Dibuja a todos los actores, junto con los modos de depuracion, sobre ``motor.context``."
+    perfilador = motor.perfilador
+
+    # El depurador dibuja antes y despues de los actores, las dos
+    # partes se registran juntas como una sola muestra por cuadro.
+    inicio = timeit.default_timer()
+    motor.depurador.comienza_dibujado(motor)
+    demora_del_depurador = timeit.default_timer() - inicio
+
+    perfilador.comenzar('dibujado_actores')
+
+    for actor in actores.lista_de_dibujado:
+        try:
+            actor.dibujar(motor)
+
+        except Exception as e:
+            actor.eliminar()
+
+        motor.depurador.dibuja_al_actor(motor, actor)
+
+    perfilador.terminar('dibujado_actores')
+
+    inicio = timeit.default_timer()
+    motor.depurador.termina_dibujado(motor)
+    demora_del_depurador += timeit.default_timer() - inicio
+    perfilador.registrar('dibujado_depurador', demora_del_depurador)
+    perfilador.terminar_cuadro()
+
+
+def actualizar_actores(motor):
+    "Realiza un paso de actualizacion logica: simuladores, habilidades y actores."
+    eventos.actualizar.send_sin_respuestas("update")
+
+    motor.perfilador.comenzar('actores')
+
+    for actor in actores.lista_de_dibujado:
+        actor.pre_actualizar()
+        actor.actualizar()
+
+    motor.perfilador.terminar('actores')
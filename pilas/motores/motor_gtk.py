@@ -15,6 +15,7 @@ from gi.repository import Gdk
 from gi.repository import GdkPixbuf
 
 import motor
+import motor_cairo
 from pilas import imagenes
 from pilas import actores
 from pilas import eventos
@@ -22,6 +23,7 @@ from pilas import utils
 from pilas import depurador
 
 from pilas import fps
+from pilas import perfilador
 from pilas import simbolos
 from pilas import colores
 
@@ -455,8 +457,10 @@ class GtkBase(motor.Motor):
         self.box.pack_start(self.canvas, True, True, 0)
 
         self.fps = fps.FPS(60, True)
+        self.reloj = self.fps
         self.pausa_habilitada = False
 
+        self.perfilador = perfilador.Perfilador()
         self.depurador = depurador.Depurador(self.obtener_lienzo(), self.fps)
         self.mouse_x = 0
         self.mouse_y = 0
@@ -552,30 +556,29 @@ class GtkBase(motor.Motor):
         #sys.exit(self.app.exec_())
         pass
 
+    def definir_rendimiento(self, rendimiento, economico):
+        self.fps.definir_rendimiento(rendimiento)
+        self.fps.usar_modo_economico = economico
+
+    def despertar(self):
+        # El reloj se consulta en cada evento del temporizador, que
+        # nunca se detiene, asi que no hay nada que reanudar.
+        pass
+
     def paintEvent(self, area, context):
         print("DRAW")
         self.context = context
 
+        self.perfilador.comenzar('dibujado_fondo')
         self.context.set_source_rgb(1, 1, 1)
         self.context.rectangle(0, 0, self.alto * self.ancho_original / self.alto_original, self.alto)
         self.context.fill()
+        self.perfilador.terminar('dibujado_fondo')
 
         alto = self.alto / float(self.alto_original)
         self.context.scale(alto, alto)
 
-        self.depurador.comienza_dibujado(self)
-
-        for actor in actores.todos:
-            try:
-                actor.dibujar(self)
-
-            except Exception as e:
-                actor.eliminar()
-
-            self.depurador.dibuja_al_actor(self, actor)
-
-        self.depurador.termina_dibujado(self)
-
+        motor_cairo.dibujar_actores(self)
         return False
 
     def timerEvent(self, event):
@@ -593,11 +596,7 @@ class GtkBase(motor.Motor):
     def realizar_actualizacion_logica(self):
         for x in range(self.fps.actualizar()):
             if not self.pausa_habilitada:
-                eventos.actualizar.send("Qt::timerEvent")
-
-                for actor in actores.todos:
-                    actor.pre_actualizar()
-                    actor.actualizar()
+                motor_cairo.actualizar_actores(self)
 
     def resizeEvent(self, event):
         self.ancho = event.size().width()
@@ -620,7 +619,7 @@ class GtkBase(motor.Motor):
         escala = self.escala()
         x, y = utils.convertir_de_posicion_fisica_relativa(e.pos().x()/escala, e.pos().y()/escala)
         dx, dy = x - self.mouse_x, y - self.mouse_y
-        eventos.mueve_mouse.send("Qt::mouseMoveEvent", x=x, y=y, dx=dx, dy=dy)
+        eventos.mueve_mouse.send_sin_respuestas("Qt::mouseMoveEvent", x=x, y=y, dx=dx, dy=dy)
         self.mouse_x = x
         self.mouse_y = y
 
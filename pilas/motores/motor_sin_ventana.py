@@ -0,0 +1,236 @@
+# -*- encoding: utf-8 -*-
+# pilas engine - a video game framework.
+#
+# copyright 2010 - hugo ruscitti
+# license: lgplv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# website - http://www.pilas-engine.com.ar
+
+import time
+
+import cairo
+
+import motor
+import motor_cairo
+from motor_cairo import GtkActor
+from motor_cairo import GtkTexto
+from motor_cairo import GtkGrilla
+from motor_cairo import GtkCapasDeBloques
+from motor_cairo import GtkImagen
+from motor_cairo import GtkLienzo
+from motor_cairo import GtkSuperficie
+from motor_cairo import Fondo
+from pilas import actores
+from pilas import eventos
+from pilas import depurador
+from pilas import perfilador
+from pilas import reloj
+
+
+class CuadrosSimulados(object):
+    """Contador de cuadros para el motor sin ventana.
+
+    Cumple el mismo rol que ``fps.FPS`` para el depurador, pero no
+    consulta el reloj: cada cuadro simulado dura exactamente
+    ``1 / rendimiento`` segundos."""
+
+    def __init__(self, rendimiento):
+        self.rendimiento = rendimiento
+        self.cuadros = 0
+
+    def obtener_cuadros_por_segundo(self):
+        return str(self.rendimiento)
+
+
+class SonidoMudo(object):
+    "Sonido que no reproduce nada, el motor sin ventana no tiene salida de audio."
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def reproducir(self):
+        pass
+
+
+class MotorSinVentana(motor.Motor):
+    """Motor que dibuja sobre una superficie de cairo en memoria.
+
+    No necesita una sesion de Sugar, ni una ventana, ni un display. La
+    simulacion no avanza sola: hay que invocar a ``avanzar`` indicando
+    cuantos cuadros se quieren simular. Por ejemplo:
+
+        >>> pilas.iniciar(usar_motor='sin_ventana')
+        >>> mono = pilas.actores.Mono()
+        >>> mono.x = [200], 1
+        >>> pilas.mundo.motor.avanzar(60)
+        >>> pilas.mundo.motor.guardar("captura.png")
+
+    Es util para ejecutar escenas en pruebas automaticas, medir el
+    rendimiento del dibujado o generar muchos cuadros mas rapido
+    que en tiempo real.
+    """
+
+    def __init__(self, rendimiento=60):
+        motor.Motor.__init__(self)
+        self.fps = CuadrosSimulados(rendimiento)
+        self.reloj = reloj.Reloj(rendimiento)
+        self.pausa_habilitada = False
+
+        self.perfilador = perfilador.Perfilador()
+        self.depurador = depurador.Depurador(self.obtener_lienzo(), self.fps)
+        self.mouse_x = 0
+        self.mouse_y = 0
+        self.camara_x = 0
+        self.camara_y = 0
+        self.fondo = Fondo()
+
+    def iniciar_ventana(self, ancho, alto, titulo, pantalla_completa):
+        self.ancho = ancho
+        self.alto = alto
+        self.ancho_original = ancho
+        self.alto_original = alto
+        self.titulo = titulo
+
+        self.superficie = cairo.ImageSurface(cairo.FORMAT_ARGB32, ancho, alto)
+        self.context = cairo.Context(self.superficie)
+
+    def pantalla_completa(self):
+        pass
+
+    def pantalla_modo_ventana(self):
+        pass
+
+    def esta_en_pantalla_completa(self):
+        return False
+
+    def alternar_pantalla_completa(self):
+        pass
+
+    def centro_fisico(self):
+        "Centro de la ventana para situar el punto (0, 0)"
+        return self.ancho_original / 2, self.alto_original / 2
+
+    def obtener_area(self):
+        return (self.ancho_original, self.alto_original)
+
+    def centrar_ventana(self):
+        pass
+
+    def obtener_actor(self, imagen, x, y):
+        return GtkActor(imagen, x, y)
+
+    def obtener_texto(self, texto, magnitud):
+        return GtkTexto(texto, magnitud, self)
+
+    def obtener_grilla(self, ruta, columnas, filas):
+        return GtkGrilla(ruta, columnas, filas)
+
+    def obtener_capas_de_bloques(self, grilla, filas, columnas):
+        return GtkCapasDeBloques(grilla, filas, columnas)
+
+    def actualizar_pantalla(self, *args):
+        # El dibujado ocurre solamente al llamar a ``avanzar``.
+        pass
+
+    def definir_rendimiento(self, rendimiento, economico):
+        self.fps.rendimiento = rendimiento
+        self.reloj.definir_rendimiento(rendimiento)
+
+    def despertar(self):
+        # La simulacion solo avanza al llamar a ``avanzar``.
+        pass
+
+    def definir_centro_de_la_camara(self, x, y):
+        self.camara_x = x
+        self.camara_y = y
+
+    def obtener_centro_de_la_camara(self):
+        return (self.camara_x, self.camara_y)
+
+    def cargar_sonido(self, ruta):
+        return SonidoMudo(ruta)
+
+    def cargar_imagen(self, ruta):
+        return GtkImagen(ruta)
+
+    def obtener_lienzo(self):
+        return GtkLienzo()
+
+    def obtener_superficie(self, ancho, alto):
+        return GtkSuperficie(ancho, alto, self)
+
+    def avanzar(self, n_cuadros=1, dibujar=True):
+        """Simula ``n_cuadros`` cuadros del juego y luego dibuja el resultado.
+
+        Cada cuadro es una actualizacion logica completa, sin importar
+        cuanto tiempo real haya transcurrido. Si ``dibujar`` es False
+        solo se actualiza la logica."""
+
+        for x in range(n_cuadros):
+            if not self.pausa_habilitada and not self.reloj.pausado:
+                self.reloj.registrar_pasos(1)
+                motor_cairo.actualizar_actores(self)
+
+            self.fps.cuadros += 1
+
+        if dibujar:
+            self.dibujar()
+
+    def dibujar(self):
+        "Dibuja la escena completa sobre la superficie en memoria."
+        self.context = cairo.Context(self.superficie)
+        eventos.redibujar.limpiar()
+        self.perfilador.comenzar('dibujado_fondo')
+        self.fondo.pintar(self, 0, 0, self.ancho, self.alto)
+        self.perfilador.terminar('dibujado_fondo')
+        motor_cairo.dibujar_actores(self)
+        self.superficie.flush()
+
+    def obtener_imagen_cairo(self, imagen=None):
+        "Retorna la superficie de cairo donde se dibuja la escena."
+        return self.superficie
+
+    def guardar(self, ruta):
+        "Guarda el ultimo cuadro dibujado en un archivo png."
+        self.superficie.write_to_png(ruta)
+
+    def ejecutar_bucle_principal(self, mundo, ignorar_errores):
+        intervalo = 1.0 / self.fps.rendimiento
+
+        while True:
+            inicio = time.time()
+
+            try:
+                self.avanzar(1)
+
+            except Exception as e:
+                if not ignorar_errores:
+                    raise
+
+            demora = intervalo - (time.time() - inicio)
+
+            if demora > 0:
+                time.sleep(demora)
+
+    def escala(self):
+        "El motor sin ventana nunca cambia de escala."
+        return 1
+
+    def obtener_area_de_texto(self, texto, magnitud=10):
+        ancho, alto, ascenso = motor_cairo.textos.medir(texto, None, magnitud)
+        return ancho, alto
+
+    def alternar_pausa(self):
+        if self.pausa_habilitada:
+            self.pausa_habilitada = False
+            self.actor_pausa.eliminar()
+
+        else:
+            self.pausa_habilitada = True
+            self.actor_pausa = actores.Pausa()
+
+    def ocultar_puntero_del_mouse(self):
+        pass
+
+    def mostrar_puntero_del_mouse(self, cursor=None):
+        pass
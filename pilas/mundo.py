@@ -6,7 +6,7 @@
 #
 # website - http://www.pilas-engine.com.ar
 
-import pytweener
+import interpolador
 from pilas import eventos
 from pilas import tareas
 from pilas import control
@@ -14,6 +14,7 @@ from pilas import fisica
 from pilas import escenas
 from pilas import colisiones
 from pilas import camara
+from pilas import puntero
 
 CON_FISICA = True
 try:
@@ -33,13 +34,16 @@ class Mundo(object):
     def __init__(self, motor, ancho, alto, titulo, fps=60, economico=True,
             gravedad=(0, -90), pantalla_completa=False):
         self.motor = motor
+        self.perfilador = motor.perfilador
+        self.reloj = motor.reloj
         self.motor.iniciar_ventana(ancho, alto, titulo, pantalla_completa)
 
-        self.tweener = pytweener.Tweener()
+        self.tweener = interpolador.Interpolador()
         self.tareas = tareas.Tareas()
         self.control = control.Control()
         self.colisiones = colisiones.Colisiones()
         self.camara = camara.Camara(self)
+        self.puntero = puntero.Puntero()
 
         eventos.actualizar.conectar(self.actualizar_simuladores)
 
@@ -50,22 +54,105 @@ class Mundo(object):
             self.fisica = None
 
         self.escena_actual = None
+        self.motor.definir_rendimiento(fps, economico)
 
     def reiniciar(self):
         if CON_FISICA:
             self.fisica.reiniciar()
 
     def actualizar_simuladores(self, evento):
-        self.tweener.update(16)
-        self.tareas.actualizar(1 / 60.0)
+        perfilador = self.perfilador
+        dt = self.reloj.dt
 
-        if CON_FISICA:
-            self.fisica.actualizar()
+        perfilador.comenzar('interpolaciones')
+        self.tweener.update(dt * 1000.0)
+        perfilador.terminar('interpolaciones')
 
-        else:
-            self.motor.actualizar_pantalla()
+        perfilador.comenzar('tareas')
+        self.tareas.actualizar(dt)
+        perfilador.terminar('tareas')
+
+        if CON_FISICA:
+            perfilador.comenzar('fisica')
+            self.fisica.actualizar(dt)
+            perfilador.terminar('fisica')
+            perfilador.registrar_medicion('cuerpos_sincronizados', self.fisica.sincronizados)
+            perfilador.registrar_medicion('cuerpos_omitidos', self.fisica.omitidos)
 
+        perfilador.comenzar('colisiones')
         self.colisiones.verificar_colisiones()
+        perfilador.terminar('colisiones')
+
+        # Un solo pedido de redibujado por cuadro, sin importar cuantos
+        # actores hayan cambiado.
+        eventos.redibujar.avisar()
+
+    def esta_inactivo(self):
+        """Indica si no hay nada que simular en el proximo cuadro.
+
+        El motor usa esta consulta en modo economico para dejar de
+        actualizar la logica hasta que algo vuelva a ocurrir."""
+        from pilas import actores
+        from pilas import habilidades
+
+        if self.reloj.pausado:
+            return True
+
+        if self.tweener.hasTweens() or self.tareas.hay_tareas_pendientes():
+            return False
+
+        if self.control.hay_teclas_pulsadas():
+            return False
+
+        if CON_FISICA and self.fisica.hay_cuerpos_despiertos():
+            return False
+
+        # El mundo es el unico receptor de la actualizacion, salvo que
+        # algun objeto quiera enterarse de cada cuadro.
+        if len(eventos.actualizar.receivers) > 1:
+            return False
+
+        for actor in actores.todos:
+            if actor.comportamiento_actual or actor.comportamientos:
+                return False
+
+            if _redefine_actualizar(actor, actores.Actor):
+                return False
+
+            for habilidad in actor.habilidades:
+                if _redefine_actualizar(habilidad, habilidades.Habilidad):
+                    return False
+
+        return True
+
+    def estadisticas(self):
+        """Retorna cuanto tiempo demora cada etapa del cuadro, en milisegundos.
+
+        Para cada etapa se informa el ultimo valor, el promedio, el
+        maximo y los percentiles 50, 90 y 99 de las ultimas mediciones.
+        Esto es util para hacer pruebas automaticas de rendimiento."""
+        return self.perfilador.estadisticas()
+
+    def despertar(self):
+        "Solicita al motor que vuelva a actualizar la logica del juego."
+        self.motor.despertar()
+
+    def pausar(self):
+        "Detiene el tiempo del juego: interpolaciones, tareas, fisica y actores."
+        self.reloj.pausar()
+
+    def continuar(self):
+        "Reanuda el tiempo del juego luego de ``pausar``."
+        self.reloj.continuar()
+        self.despertar()
+
+    def definir_escala_de_tiempo(self, escala):
+        """Cambia la velocidad a la que transcurre el tiempo del juego.
+
+        Con 1 el juego avanza normalmente, con 0.5 en camara lenta y
+        con 2 al doble de velocidad."""
+        self.reloj.definir_escala(escala)
+        self.despertar()
 
     def terminar(self):
         import sys
@@ -85,10 +172,18 @@ class Mundo(object):
         escena_nueva.iniciar()
 
     def agregar_tarea_una_vez(self, time_out, function, *params):
+        self.despertar()
         return self.tareas.una_vez(time_out, function, params)
 
     def agregar_tarea_siempre(self, time_out, function, *params):
+        self.despertar()
         return self.tareas.siempre(time_out, function, params)
 
     def agregar_tarea(self, time_out, funcion, *parametros):
+        self.despertar()
         return self.tareas.condicional(time_out, funcion, parametros)
+
+
+def _redefine_actualizar(objeto, clase_base):
+    "Indica si la clase del objeto redefine el metodo actualizar."
+    return type(objeto).actualizar.im_func is not clase_base.actualizar.im_func
@@ -0,0 +1,153 @@
+# -*- encoding: utf-8 -*-
+# Pilas engine - A video game framework.
+#
+# Copyright 2010 - Hugo Ruscitti
+# License: LGPLv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# Website - http://www.pilas-engine.com.ar
+
+import collections
+import timeit
+
+__doc__ = """
+Módulo pilas.perfilador
+=======================
+
+Permite medir cuanto tiempo demora cada una de las etapas
+de un cuadro: actualizar las interpolaciones, las tareas, la
+fisica, las colisiones, los actores y el dibujado.
+"""
+
+# Etapas que mide el motor, en el orden en que ocurren dentro de un cuadro.
+ETAPAS = [
+    'entrada',
+    'interpolaciones',
+    'tareas',
+    'fisica',
+    'colisiones',
+    'actores',
+    'dibujado_fondo',
+    'dibujado_actores',
+    'dibujado_depurador',
+    ]
+
+
+class Perfilador(object):
+    """Guarda los tiempos de las ultimas ``muestras`` ejecuciones de cada etapa.
+
+    Cada etapa se mide llamando a ``comenzar`` y ``terminar``::
+
+        perfilador.comenzar('tareas')
+        tareas.actualizar(dt)
+        perfilador.terminar('tareas')
+
+    y ademas se suman los tiempos de todas las etapas de un mismo
+    cuadro, que se cierra llamando a ``terminar_cuadro``.
+    """
+
+    def __init__(self, muestras=120):
+        self.muestras = muestras
+        self.tiempos = {}
+        self.inicios = {}
+        self.cuadro_actual = {}
+        self.historial = collections.deque(maxlen=muestras)
+        # Mediciones que no son tiempos de una etapa, como la cantidad
+        # de eventos en la cola de entrada.
+        self.mediciones = {}
+
+        for etapa in ETAPAS:
+            self.tiempos[etapa] = collections.deque(maxlen=muestras)
+
+    def comenzar(self, etapa):
+        self.inicios[etapa] = timeit.default_timer()
+
+    def terminar(self, etapa):
+        inicio = self.inicios.pop(etapa, None)
+
+        if inicio is not None:
+            self.registrar(etapa, timeit.default_timer() - inicio)
+
+    def registrar(self, etapa, segundos):
+        "Agrega una medicion de ``segundos`` a la etapa indicada."
+        if etapa not in self.tiempos:
+            self.tiempos[etapa] = collections.deque(maxlen=self.muestras)
+
+        self.tiempos[etapa].append(segundos)
+        self.cuadro_actual[etapa] = self.cuadro_actual.get(etapa, 0) + segundos
+
+    def registrar_medicion(self, nombre, valor):
+        "Agrega un valor a una medicion que no es el tiempo de una etapa."
+        if nombre not in self.mediciones:
+            self.mediciones[nombre] = collections.deque(maxlen=self.muestras)
+
+        self.mediciones[nombre].append(valor)
+
+    def terminar_cuadro(self):
+        "Guarda el tiempo de cada etapa del cuadro que acaba de dibujarse."
+        self.historial.append(self.cuadro_actual)
+        self.cuadro_actual = {}
+
+    def percentil(self, etapa, porcentaje):
+        "Retorna el percentil indicado de una etapa, en milisegundos."
+        return _percentil(self.tiempos.get(etapa, []), porcentaje) * 1000
+
+    def estadisticas(self):
+        """Retorna un diccionario con los tiempos de cada etapa en milisegundos.
+
+        Por ejemplo::
+
+            >>> pilas.mundo.estadisticas()['tareas']
+            {'muestras': 120, 'ultimo': 0.01, 'promedio': 0.01, 'p50': 0.01, 'p90': 0.02, 'p99': 0.03, 'maximo': 0.05}
+
+        Las mediciones registradas con ``registrar_medicion`` se
+        informan con las mismas claves, pero en su propia unidad.
+        """
+        resultado = {}
+
+        for etapa, tiempos in self.tiempos.items():
+            resultado[etapa] = _resumir(tiempos, 1000)
+
+        for nombre, valores in self.mediciones.items():
+            resultado[nombre] = _resumir(valores, 1)
+
+        return resultado
+
+    def limpiar(self):
+        for tiempos in self.tiempos.values():
+            tiempos.clear()
+
+        for valores in self.mediciones.values():
+            valores.clear()
+
+        self.historial.clear()
+        self.cuadro_actual = {}
+
+
+def _percentil(muestras, porcentaje):
+    muestras = sorted(muestras)
+
+    if not muestras:
+        return 0
+
+    indice = min(len(muestras) - 1, int(len(muestras) * porcentaje / 100.0))
+    return muestras[indice]
+
+
+def _resumir(muestras, factor):
+    "Resume una serie de muestras, multiplicando cada valor por ``factor``."
+    if muestras:
+        ultimo = muestras[-1] * factor
+        promedio = sum(muestras) * factor / float(len(muestras))
+        maximo = max(muestras) * factor
+    else:
+        ultimo = promedio = maximo = 0
+
+    return {
+            'muestras': len(muestras),
+            'ultimo': ultimo,
+            'promedio': promedio,
+            'p50': _percentil(muestras, 50) * factor,
+            'p90': _percentil(muestras, 90) * factor,
+            'p99': _percentil(muestras, 99) * factor,
+            'maximo': maximo,
+            }
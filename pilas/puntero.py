@@ -0,0 +1,278 @@
+# -*- encoding: utf-8 -*-
+# Pilas engine - A video game framework.
+#
+# Copyright 2010 - Hugo Ruscitti
+# License: LGPLv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# Website - http://www.pilas-engine.com.ar
+
+import math
+
+import pilas
+from pilas import eventos
+
+__doc__ = """
+Módulo pilas.puntero
+====================
+
+Reparte los eventos del mouse entre los actores interactivos.
+
+En lugar de que cada boton, deslizador o actor arrastrable se
+conecte a los eventos del mouse y pregunte si el puntero esta sobre
+el, el puntero mantiene un indice espacial de los actores
+interactivos y le avisa solamente al que esta mas arriba bajo el
+cursor. Por ejemplo::
+
+    class Interruptor(object):
+
+        def cuando_pulsa_el_puntero(self, evento):
+            print "Han pulsado sobre", evento.actor
+
+    pilas.mundo.puntero.conectar(un_actor, Interruptor())
+
+Los receptores pueden definir cualquiera de estos metodos:
+
+    - ``cuando_entra_el_puntero(evento)``
+    - ``cuando_sale_el_puntero(evento)``
+    - ``cuando_mueve_el_puntero(evento)``
+    - ``cuando_pulsa_el_puntero(evento)``, si retorna True el actor
+      captura al puntero hasta que se suelte el boton.
+    - ``cuando_arrastra_el_puntero(evento)``
+    - ``cuando_suelta_el_puntero(evento)``
+"""
+
+# Lado de cada celda del indice, en pixeles.
+TAMANO_DE_CELDA = 64
+
+
+class EventoDelPuntero(object):
+    "Datos de un evento del mouse, junto con el actor que lo recibe."
+
+    def __init__(self, evento, actor):
+        self.x = evento.x
+        self.y = evento.y
+        self.dx = evento.dx or 0
+        self.dy = evento.dy or 0
+        self.boton = evento.button
+        self.actor = actor
+
+
+class IndiceEspacial(object):
+    """Reparte los rectangulos de los actores en celdas cuadradas.
+
+    Para saber que actores estan bajo un punto solo hace falta
+    revisar a los de la celda que lo contiene."""
+
+    def __init__(self, tamano_de_celda=TAMANO_DE_CELDA):
+        self.tamano_de_celda = float(tamano_de_celda)
+        self.celdas = {}
+        self.rectangulos = {}
+
+    def __contains__(self, actor):
+        return actor in self.rectangulos
+
+    def _celdas_de(self, (izquierda, derecha, abajo, arriba)):
+        tamano = self.tamano_de_celda
+
+        for i in xrange(int(math.floor(izquierda / tamano)), int(math.floor(derecha / tamano)) + 1):
+            for j in xrange(int(math.floor(abajo / tamano)), int(math.floor(arriba / tamano)) + 1):
+                yield (i, j)
+
+    def actualizar(self, actor):
+        "Ubica al actor segun su rectangulo actual, si cambio desde la ultima vez."
+        rectangulo = (actor.izquierda, actor.derecha, actor.abajo, actor.arriba)
+        anterior = self.rectangulos.get(actor)
+
+        if rectangulo == anterior:
+            return
+
+        if anterior is not None:
+            self.quitar(actor)
+
+        self.rectangulos[actor] = rectangulo
+
+        for celda in self._celdas_de(rectangulo):
+            self.celdas.setdefault(celda, set()).add(actor)
+
+    def quitar(self, actor):
+        rectangulo = self.rectangulos.pop(actor, None)
+
+        if rectangulo is None:
+            return
+
+        for celda in self._celdas_de(rectangulo):
+            actores = self.celdas.get(celda)
+
+            if actores is not None:
+                actores.discard(actor)
+
+                if not actores:
+                    del self.celdas[celda]
+
+    def consultar_punto(self, x, y):
+        "Retorna los actores cuyo rectangulo contiene al punto (x, y)."
+        celda = (int(math.floor(x / self.tamano_de_celda)), int(math.floor(y / self.tamano_de_celda)))
+        resultado = []
+
+        for actor in self.celdas.get(celda, ()):
+            izquierda, derecha, abajo, arriba = self.rectangulos[actor]
+
+            if izquierda <= x <= derecha and abajo <= y <= arriba:
+                resultado.append(actor)
+
+        return resultado
+
+    def limpiar(self):
+        self.celdas = {}
+        self.rectangulos = {}
+
+
+def _ordenar_desde_arriba(actores):
+    "Ordena a los actores desde el mas cercano al observador, como se ven en pantalla."
+    posiciones = pilas.actores.lista_de_dibujado.posiciones
+
+    def clave(actor):
+        z, indice = posiciones.get(actor, (actor.z, 0))
+        return (z, -indice)
+
+    return sorted(actores, key=clave)
+
+
+class Puntero(object):
+    """Envia los eventos del mouse al actor interactivo que esta bajo el cursor.
+
+    Los actores avisan cuando se mueven o cambian de tamano, y solo
+    esos se vuelven a ubicar en el indice, recien cuando llega una
+    consulta o un evento del mouse.
+    """
+
+    def __init__(self):
+        self.receptores = {}
+        self.interactivos = IndiceEspacial()
+        self.todos = IndiceEspacial()
+        self.movidos = set()
+
+        self.actor_bajo_el_puntero = None
+        self.capturado = None
+
+        eventos.mueve_mouse.conectar(self._cuando_mueve)
+        eventos.click_de_mouse.conectar(self._cuando_pulsa)
+        eventos.termina_click.conectar(self._cuando_suelta)
+
+    def conectar(self, actor, receptor):
+        "Hace que ``receptor`` reciba los eventos del mouse que ocurren sobre ``actor``."
+        receptores = self.receptores.setdefault(actor, [])
+
+        if receptor not in receptores:
+            receptores.append(receptor)
+
+        self.interactivos.actualizar(actor)
+
+    def desconectar(self, actor, receptor):
+        receptores = self.receptores.get(actor, [])
+
+        if receptor in receptores:
+            receptores.remove(receptor)
+
+        if not receptores:
+            self.olvidar(actor)
+
+    def olvidar(self, actor):
+        "Deja de enviar eventos al actor, por ejemplo porque fue eliminado."
+        self.receptores.pop(actor, None)
+        self.interactivos.quitar(actor)
+        self.todos.quitar(actor)
+        self.movidos.discard(actor)
+
+        if self.actor_bajo_el_puntero is actor:
+            self.actor_bajo_el_puntero = None
+
+        if self.capturado is actor:
+            self.capturado = None
+
+    def marcar_movido(self, actor):
+        "Indica que el rectangulo del actor cambio, se vuelve a ubicar en la proxima consulta."
+        self.movidos.add(actor)
+
+    def _actualizar_indices(self):
+        "Vuelve a ubicar solamente a los actores que se movieron."
+        if not self.movidos:
+            return
+
+        movidos, self.movidos = self.movidos, set()
+        registro = pilas.actores.registro
+
+        for actor in movidos:
+            if actor in self.receptores:
+                self.interactivos.actualizar(actor)
+
+            if actor in registro:
+                self.todos.actualizar(actor)
+
+    def obtener_actores_en(self, x, y):
+        "Retorna todos los actores en la posicion (x, y), desde el mas cercano al observador."
+        self._actualizar_indices()
+        candidatos = self.todos.consultar_punto(x, y)
+        return [a for a in _ordenar_desde_arriba(candidatos) if a.colisiona_con_un_punto(x, y)]
+
+    def obtener_actor_en(self, x, y):
+        "Retorna el actor mas cercano al observador en la posicion (x, y)."
+        actores = self.obtener_actores_en(x, y)
+
+        if actores:
+            return actores[0]
+
+        return None
+
+    def obtener_interactivo_en(self, x, y):
+        "Retorna el actor interactivo que esta mas arriba en la posicion (x, y)."
+        self._actualizar_indices()
+
+        for actor in _ordenar_desde_arriba(self.interactivos.consultar_punto(x, y)):
+            if actor.colisiona_con_un_punto(x, y):
+                return actor
+
+        return None
+
+    def _enviar(self, actor, metodo, evento):
+        "Invoca ``metodo`` en todos los receptores del actor, retorna True si alguno lo pide."
+        resultado = False
+
+        for receptor in list(self.receptores.get(actor, ())):
+            funcion = getattr(receptor, metodo, None)
+
+            if funcion and funcion(EventoDelPuntero(evento, actor)):
+                resultado = True
+
+        return resultado
+
+    def _cuando_mueve(self, evento):
+        if self.capturado is not None:
+            self._enviar(self.capturado, 'cuando_arrastra_el_puntero', evento)
+
+        actor = self.obtener_interactivo_en(evento.x, evento.y)
+
+        if actor is not self.actor_bajo_el_puntero:
+            anterior = self.actor_bajo_el_puntero
+            self.actor_bajo_el_puntero = actor
+
+            if anterior is not None:
+                self._enviar(anterior, 'cuando_sale_el_puntero', evento)
+
+            if actor is not None:
+                self._enviar(actor, 'cuando_entra_el_puntero', evento)
+
+        if actor is not None:
+            self._enviar(actor, 'cuando_mueve_el_puntero', evento)
+
+    def _cuando_pulsa(self, evento):
+        actor = self.obtener_interactivo_en(evento.x, evento.y)
+
+        if actor is not None and self._enviar(actor, 'cuando_pulsa_el_puntero', evento):
+            self.capturado = actor
+
+    def _cuando_suelta(self, evento):
+        if self.capturado is not None:
+            actor = self.capturado
+            self.capturado = None
+            self._enviar(actor, 'cuando_suelta_el_puntero', evento)
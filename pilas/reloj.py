@@ -0,0 +1,149 @@
+# -*- encoding: utf-8 -*-
+# Pilas engine - A video game framework.
+#
+# Copyright 2010 - Hugo Ruscitti
+# License: LGPLv3 (see http://www.gnu.org/licenses/lgpl.html)
+#
+# Website - http://www.pilas-engine.com.ar
+
+import time
+
+__doc__ = """
+Módulo pilas.reloj
+==================
+
+Mide el tiempo real que transcurre entre cuadros y lo convierte en
+pasos fijos de simulacion. Las interpolaciones, las tareas, la fisica
+y las animaciones leen el tiempo de cada paso desde aqui, asi que
+todas avanzan al mismo ritmo y se pueden hacer mas lentas, mas
+rapidas o detener juntas::
+
+    >>> pilas.mundo.definir_escala_de_tiempo(0.5)   # camara lenta
+    >>> pilas.mundo.pausar()
+"""
+
+
+def _crear_tiempo_monotonico():
+    "Retorna una funcion que informa segundos desde un instante fijo, sin retroceder nunca."
+    if hasattr(time, 'monotonic'):
+        return time.monotonic
+
+    try:
+        from gi.repository import GLib
+        return lambda: GLib.get_monotonic_time() / 1000000.0
+    except ImportError:
+        return time.time
+
+tiempo_monotonico = _crear_tiempo_monotonico()
+
+
+class Reloj(object):
+    """Acumula el tiempo real y lo reparte en pasos de ``1 / rendimiento`` segundos.
+
+    Cada llamada a ``avanzar`` retorna cuantos pasos de logica hay
+    que ejecutar. Si se acumulan mas de ``maximo_de_pasos`` en una
+    sola llamada el resto se descarta, para no quedar atrapado
+    recuperando el tiempo perdido.
+
+    Todos los pasos duran lo mismo, pero cada uno representa ``dt``
+    segundos de juego: el tamano del paso multiplicado por ``escala``,
+    o cero mientras el reloj esta pausado.
+    """
+
+    def __init__(self, rendimiento=60, maximo_de_pasos=5):
+        self.maximo_de_pasos = maximo_de_pasos
+        self.escala = 1.0
+        self.pausado = False
+        self.definir_rendimiento(rendimiento)
+
+        self.anterior = None
+        self.acumulado = 0
+        self.tiempo = 0
+        self.pasos = 0
+
+        self.cuadros = 0
+        self.inicio_de_medicion = None
+        self.cuadros_por_segundo = "??"
+
+    def definir_rendimiento(self, rendimiento):
+        self.rendimiento = rendimiento
+        self.paso = 1.0 / rendimiento
+
+    def definir_escala(self, escala):
+        "Cambia la velocidad del juego, 1 es la normal y 0.5 la mitad."
+        if escala < 0:
+            raise Exception("La escala de tiempo no puede ser negativa.")
+
+        self.escala = escala
+
+    def pausar(self):
+        self.pausado = True
+
+    def continuar(self):
+        self.pausado = False
+        self.anterior = None
+
+    def obtener_dt(self):
+        if self.pausado:
+            return 0
+        return self.paso * self.escala
+
+    dt = property(obtener_dt, doc="Segundos de juego que representa cada paso")
+
+    def reiniciar(self):
+        "Olvida el tiempo acumulado, por ejemplo luego de estar detenido."
+        self.anterior = None
+        self.acumulado = 0
+
+    def avanzar(self, ahora=None):
+        """Registra el paso del tiempo y retorna la cantidad de pasos a ejecutar.
+
+        ``ahora`` es el instante actual en segundos, si no se indica
+        se consulta el reloj monotono del sistema."""
+        if ahora is None:
+            ahora = tiempo_monotonico()
+
+        if self.pausado:
+            self.anterior = ahora
+            return 0
+
+        if self.anterior is None:
+            self.acumulado += self.paso
+        else:
+            self.acumulado += max(0, ahora - self.anterior)
+
+        self.anterior = ahora
+        pasos = int(self.acumulado / self.paso)
+
+        if pasos > self.maximo_de_pasos:
+            pasos = self.maximo_de_pasos
+            self.acumulado = 0
+        else:
+            self.acumulado -= pasos * self.paso
+
+        self.registrar_pasos(pasos)
+        return pasos
+
+    def registrar_pasos(self, pasos=1):
+        "Suma ``pasos`` al tiempo de juego sin consultar el reloj del sistema."
+        self.tiempo += pasos * self.dt
+        self.pasos += pasos
+
+    def contar_cuadro(self, ahora=None):
+        "Cuenta un cuadro dibujado para calcular los cuadros por segundo."
+        if ahora is None:
+            ahora = tiempo_monotonico()
+
+        if self.inicio_de_medicion is None:
+            self.inicio_de_medicion = ahora
+
+        self.cuadros += 1
+        transcurrido = ahora - self.inicio_de_medicion
+
+        if transcurrido >= 1:
+            self.cuadros_por_segundo = str(int(round(self.cuadros / transcurrido)))
+            self.cuadros = 0
+            self.inicio_de_medicion = ahora
+
+    def obtener_cuadros_por_segundo(self):
+        return self.cuadros_por_segundo
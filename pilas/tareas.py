@@ -6,6 +6,15 @@
 #
 # Website - http://www.pilas-engine.com.ar
 
+import heapq
+import itertools
+
+# Politicas para las tareas periodicas que se atrasan mas de un periodo.
+TODAS = 'todas'         # ejecuta todas las repeticiones perdidas.
+AGRUPAR = 'agrupar'     # ejecuta una sola vez y mantiene la frecuencia original.
+SALTEAR = 'saltear'     # ejecuta una sola vez y vuelve a contar desde ahora.
+
+
 class Tarea(object):
 
     def __init__(self, time_out, dt, funcion, parametros, una_vez):
@@ -18,6 +27,10 @@ class Tarea(object):
             - funcion: la funcion a invocar.
             - parametros: una lista de argumentos para la funcion anterior.
             - una_vez: indica si la funcion se tiene que ejecutar una sola vez.
+
+        La tarea tambien tiene un atributo ``politica``, que indica que
+        hacer si se atrasa (ver ``Tareas``). Si es None se usa la
+        politica del planificador.
         """
 
         self.time_out = time_out
@@ -26,6 +39,9 @@ class Tarea(object):
         self.parametros = parametros
         self.una_vez = una_vez
         self.activa = True
+        self.politica = None
+        self.planificador = None
+        self._en_monticulo = False
 
     def ejecutar(self):
         return self.funcion(*self.parametros)
@@ -33,6 +49,9 @@ class Tarea(object):
     def eliminar(self):
         self.activa = False
 
+        if self.planificador:
+            self.planificador._olvidar(self)
+
 
 class TareaCondicional(Tarea):
 
@@ -42,6 +61,8 @@ class TareaCondicional(Tarea):
         if not retorno:
             self.una_vez = True
 
+        return retorno
+
 
 class Tareas(object):
     """Contenedor de tareas a ejecutar por tiempo.
@@ -63,43 +84,168 @@ class Tareas(object):
     tiene que retornar True o False. Si retorna True será
     colocada nuevamente en la cola de tareas una vez que se
     ejecute (esto es útil para crear bucles).
+
+    Las tareas se guardan en un monticulo ordenado por tiempo, asi
+    que en cada cuadro solo se revisan las tareas que vencen. Cuando
+    una tarea periodica se atrasa mas de un periodo se sigue la
+    politica indicada:
+
+        - ``'todas'``: ejecuta todas las repeticiones perdidas (el
+          comportamiento por omision).
+        - ``'agrupar'``: ejecuta la tarea una sola vez, pero la
+          siguiente ejecucion respeta la frecuencia original.
+        - ``'saltear'``: ejecuta la tarea una sola vez y la siguiente
+          ejecucion se cuenta a partir de ahora.
+
+    por ejemplo:
+
+        tarea = pilas.mundo.agregar_tarea_siempre(1, avanzar)
+        tarea.politica = 'saltear'
     """
 
-    def __init__(self):
+    def __init__(self, politica=TODAS):
         self.tareas_planificadas = []
         self.contador_de_tiempo = 0
+        self.politica = politica
+        self.secuencia = itertools.count()
+        self.cantidad_de_tareas = 0
+        self.canceladas = 0
+
+        self.vencidas = 0
+        self.ejecutadas = 0
+        self.demora_total = 0
+        self.demora_maxima = 0
 
     def actualizar(self, dt):
         "Actualiza los contadores de tiempo y ejecuta las tareas pendientes."
         self.contador_de_tiempo += dt
-        to_remove = []
-         
-        for tarea in self.tareas_planificadas:
-            if self.contador_de_tiempo > tarea.time_out:
-                if tarea.activa:
-                    tarea.ejecutar()
-                
-                    if tarea.una_vez:
-                        self.tareas_planificadas.remove(tarea)
+        ahora = self.contador_de_tiempo
+        planificadas = self.tareas_planificadas
+
+        while planificadas and planificadas[0][0] < ahora:
+            time_out, _, tarea = heapq.heappop(planificadas)
+            tarea._en_monticulo = False
+
+            if tarea.planificador is not self:
+                # Fue eliminada mientras esperaba.
+                self.canceladas -= 1
+                continue
+
+            if not tarea.activa:
+                # Se desactivo sin llamar a ``eliminar``.
+                self._olvidar(tarea)
+                continue
+
+            demora = ahora - time_out
+            self.vencidas += 1
+            self.demora_total += demora
+            self.demora_maxima = max(self.demora_maxima, demora)
+
+            if tarea.una_vez:
+                self._olvidar(tarea)
+                self._ejecutar(tarea)
+            else:
+                self._ejecutar_tarea_periodica(tarea, demora, ahora)
 
-                    else:
-                        w = self.contador_de_tiempo - tarea.time_out
-                        parte_entera = int((w) / float(tarea.dt))
-                        resto = w - (parte_entera * tarea.dt)
+    def _ejecutar(self, tarea):
+        self.ejecutadas += 1
+        return tarea.ejecutar()
 
-                        for x in range(parte_entera):
-                            tarea.ejecutar()
+    def _ejecutar_tarea_periodica(self, tarea, demora, ahora):
+        politica = tarea.politica or self.politica
 
-                        tarea.time_out += tarea.dt + (parte_entera * tarea.dt) - resto
+        if tarea.dt > 0:
+            periodos_perdidos = int(demora / tarea.dt)
+        else:
+            periodos_perdidos = 0
 
-                else:
-                    self.tareas_planificadas.remove(tarea)
+        if politica == TODAS:
+            repeticiones = 1 + periodos_perdidos
+        else:
+            repeticiones = 1
 
+        for x in range(repeticiones):
+            self._ejecutar(tarea)
 
+            # Una tarea condicional deja de repetirse cuando retorna False.
+            if tarea.una_vez or not tarea.activa or tarea.planificador is not self:
+                break
+
+        if tarea.planificador is not self:
+            return
+
+        if tarea.una_vez or not tarea.activa:
+            self._olvidar(tarea)
+            return
+
+        if politica == SALTEAR or tarea.dt <= 0:
+            tarea.time_out = ahora + tarea.dt
+        else:
+            tarea.time_out += (1 + periodos_perdidos) * tarea.dt
+
+        self._apilar(tarea)
+
+    def _olvidar(self, tarea):
+        """Quita una tarea del planificador.
+
+        La tarea puede seguir dentro del monticulo, se descarta
+        recien cuando llega su turno."""
+        if tarea.planificador is not self:
+            return
+
+        tarea.planificador = None
+        self.cantidad_de_tareas -= 1
+
+        if tarea._en_monticulo:
+            self.canceladas += 1
+
+        # Si la mayoria de las tareas guardadas ya no sirven se
+        # reconstruye el monticulo para no ocupar memoria de mas.
+        if self.canceladas > 32 and self.canceladas > len(self.tareas_planificadas) / 2:
+            self._compactar()
+
+    def _compactar(self):
+        # Se modifica la misma lista, porque ``actualizar`` puede estar
+        # recorriendola si una tarea elimina a otras.
+        for _, _, tarea in self.tareas_planificadas:
+            if tarea.planificador is not self:
+                tarea._en_monticulo = False
+
+        self.tareas_planificadas[:] = [x for x in self.tareas_planificadas if x[2].planificador is self]
+        heapq.heapify(self.tareas_planificadas)
+        self.canceladas = 0
+
+    def hay_tareas_pendientes(self):
+        "Indica si queda alguna tarea activa por ejecutar."
+        return self.cantidad_de_tareas > 0
+
+    def estadisticas(self):
+        """Retorna los contadores del planificador.
+
+        La demora es el tiempo (en segundos) que paso entre el
+        vencimiento de una tarea y su ejecucion."""
+        if self.vencidas:
+            demora_promedio = self.demora_total / self.vencidas
+        else:
+            demora_promedio = 0
+
+        return {
+                'pendientes': self.cantidad_de_tareas,
+                'vencidas': self.vencidas,
+                'ejecutadas': self.ejecutadas,
+                'demora_promedio': demora_promedio,
+                'demora_maxima': self.demora_maxima,
+                }
 
     def _agregar(self, tarea):
         "Agrega una nueva tarea para ejecutarse luego."
-        self.tareas_planificadas.append(tarea)
+        tarea.planificador = self
+        self.cantidad_de_tareas += 1
+        self._apilar(tarea)
+
+    def _apilar(self, tarea):
+        tarea._en_monticulo = True
+        heapq.heappush(self.tareas_planificadas, (tarea.time_out, self.secuencia.next(), tarea))
 
     def una_vez(self, time_out, function, params=[]):
         tarea = Tarea(self.contador_de_tiempo + time_out, time_out, function, params, True)
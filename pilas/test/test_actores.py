@@ -71,3 +71,94 @@ def test_colisiones_contra_un_punto():
     mono = pilas.actores.Mono()
     assert mono.colisiona_con_un_punto(0, 0)
     assert not mono.colisiona_con_un_punto(200, 200)
+
+
+def test_orden_de_dibujado_por_valor_z():
+    pilas.iniciar(usar_motor='sin_ventana')
+    lejano = pilas.actores.Mono()
+    cercano = pilas.actores.Mono()
+    intermedio = pilas.actores.Mono()
+
+    lejano.z = 10
+    cercano.z = -10
+
+    orden = [a for a in pilas.actores.lista_de_dibujado if a in (lejano, cercano, intermedio)]
+    assert orden == [lejano, intermedio, cercano]
+
+    # Al cambiar z el actor pasa al final de su nueva capa.
+    lejano.z = 0
+    orden = [a for a in pilas.actores.lista_de_dibujado if a in (lejano, cercano, intermedio)]
+    assert orden == [intermedio, lejano, cercano]
+
+def test_cambiar_z_durante_el_recorrido():
+    pilas.iniciar(usar_motor='sin_ventana')
+    lejano = pilas.actores.Mono()
+    cercano = pilas.actores.Mono()
+    lejano.z = 10
+    visitados = []
+
+    for actor in pilas.actores.lista_de_dibujado:
+        visitados.append(actor)
+
+        # Baja a una capa que todavia no se recorrio.
+        if actor is lejano:
+            lejano.z = 0
+
+    # El cambio se aplica al terminar, sin visitar dos veces al actor.
+    assert visitados.count(lejano) == 1
+    orden = [a for a in pilas.actores.lista_de_dibujado if a in (lejano, cercano)]
+    assert orden == [cercano, lejano]
+
+
+def test_registro_por_clase_y_etiqueta():
+    pilas.iniciar(usar_motor='sin_ventana')
+    bomba = pilas.actores.Bomba()
+    mono = pilas.actores.Mono()
+    mono.agregar_etiqueta('enemigo')
+
+    assert bomba in pilas.actores.registro.obtener_por_clase(pilas.actores.Bomba)
+    assert mono not in pilas.actores.registro.obtener_por_clase(pilas.actores.Bomba)
+    assert pilas.actores.registro.obtener_por_etiqueta('enemigo') == [mono]
+
+    # Los actores que se eliminan mientras se recorre el registro se
+    # quitan al terminar el recorrido.
+    for actor in pilas.actores.todos:
+        if actor is bomba:
+            mono.destruir()
+
+    assert mono not in pilas.actores.todos
+    assert pilas.actores.registro.obtener_por_etiqueta('enemigo') == []
+
+
+def test_arrastrar_solo_al_actor_de_arriba():
+    pilas.iniciar(usar_motor='sin_ventana')
+    abajo = pilas.actores.Mono()
+    arriba = pilas.actores.Mono()
+    abajo.aprender(pilas.habilidades.Arrastrable)
+    arriba.aprender(pilas.habilidades.Arrastrable)
+
+    pilas.eventos.click_de_mouse.send("test", x=0, y=0, dx=0, dy=0)
+    pilas.eventos.mueve_mouse.send("test", x=50, y=0, dx=50, dy=0)
+    pilas.eventos.termina_click.send("test", x=50, y=0, dx=0, dy=0)
+
+    assert arriba.x == 50
+    assert abajo.x == 0
+    assert pilas.actores.utils.obtener_actor_en(0, 0) is abajo
+
+def test_puntero_solo_actualiza_actores_movidos():
+    pilas.iniciar(usar_motor='sin_ventana')
+    quieto = pilas.actores.Mono(x=-200)
+    movil = pilas.actores.Mono()
+    puntero = pilas.mundo.puntero
+
+    assert puntero.obtener_actor_en(-200, 0) is quieto
+    assert not puntero.movidos
+
+    movil.x = 200
+    pilas.mundo.motor.avanzar(1)
+
+    # Solo el actor que cambio de lugar espera volver al indice.
+    assert movil in puntero.movidos
+    assert quieto not in puntero.movidos
+    assert puntero.obtener_actor_en(200, 0) is movil
+    assert movil not in puntero.obtener_actores_en(0, 0)
@@ -0,0 +1,45 @@
+import pilas
+
+def test_colisiones_con_grilla_espacial():
+    pilas.iniciar(usar_motor='sin_ventana')
+
+    monos = [pilas.actores.Mono(x=x * 5, y=0) for x in range(20)]
+    bananas = [pilas.actores.Banana(x=x * 5, y=200) for x in range(20)]
+    banana_cercana = bananas[3]
+    banana_cercana.y = 0
+
+    comidas = []
+
+    def comer(mono, banana):
+        comidas.append(banana)
+        banana.eliminar()
+
+    pilas.mundo.colisiones.agregar(monos, bananas, comer)
+    pilas.mundo.colisiones.verificar_colisiones()
+
+    # La banana se come una sola vez y sale del grupo.
+    assert comidas == [banana_cercana]
+    assert len(bananas) == 19
+    assert banana_cercana.esta_eliminado()
+
+def test_eventos_de_colision():
+    pilas.iniciar(usar_motor='sin_ventana')
+    mono = pilas.actores.Mono(x=-200)
+    banana = pilas.actores.Banana()
+    eventos = []
+
+    pilas.mundo.colisiones.agregar_con_eventos(mono, banana,
+            al_comenzar=lambda a, b: eventos.append('comienza'),
+            al_continuar=lambda a, b: eventos.append('continua'),
+            al_terminar=lambda a, b: eventos.append('termina'))
+
+    pilas.mundo.colisiones.verificar_colisiones()
+    assert eventos == []
+
+    mono.x = 0
+    pilas.mundo.colisiones.verificar_colisiones()
+    pilas.mundo.colisiones.verificar_colisiones()
+    mono.x = 200
+    pilas.mundo.colisiones.verificar_colisiones()
+
+    assert eventos == ['comienza', 'continua', 'termina']
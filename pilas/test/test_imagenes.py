@@ -0,0 +1,23 @@
+import pilas
+
+def test_cache_de_imagenes():
+    pilas.iniciar(usar_motor='sin_ventana')
+
+    mono_1 = pilas.actores.Mono()
+    mono_2 = pilas.actores.Mono()
+
+    # La imagen se lee del disco una sola vez y se comparte.
+    assert mono_1.imagen is mono_2.imagen
+    assert pilas.imagenes.cache.aciertos > 0
+
+def test_grillas_comparten_la_imagen():
+    pilas.iniciar(usar_motor='sin_ventana')
+
+    grilla_1 = pilas.imagenes.cargar_grilla("pingu.png", 10)
+    grilla_2 = pilas.imagenes.cargar_grilla("pingu.png", 10)
+
+    # Cada grilla tiene su propio cuadro actual.
+    assert grilla_1 is not grilla_2
+    grilla_1.avanzar()
+    assert grilla_1.obtener_cuadro() == 1
+    assert grilla_2.obtener_cuadro() == 0
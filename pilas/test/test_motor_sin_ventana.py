@@ -0,0 +1,113 @@
+import pilas
+
+def test_iniciar_sin_ventana():
+    pilas.iniciar(ancho=320, alto=240, usar_motor='sin_ventana')
+    superficie = pilas.mundo.motor.obtener_imagen_cairo()
+
+    assert superficie.get_width() == 320
+    assert superficie.get_height() == 240
+
+def test_avanzar_cuadros():
+    pilas.iniciar(usar_motor='sin_ventana')
+    mono = pilas.actores.Mono()
+    mono.x = [100], 1
+
+    # Un segundo y medio de simulacion a 60 cuadros por segundo, sin
+    # importar cuanto tiempo real demore.
+    pilas.mundo.motor.avanzar(90)
+    assert pilas.mundo.motor.fps.cuadros == 90
+    assert mono.x == 100
+
+def test_mapa_por_porciones():
+    pilas.iniciar(usar_motor='sin_ventana')
+    mapa = pilas.actores.Mapa()
+    cantidad_de_actores = len(pilas.actores.todos)
+
+    # Los bloques no generan actores nuevos.
+    mapa.definir_bloque(0, 0, 1)
+    mapa.definir_bloque(20, 20, 2)
+    assert len(pilas.actores.todos) == cantidad_de_actores
+    assert mapa.obtener_bloque(20, 20) == 2
+
+    pilas.mundo.motor.avanzar(1)
+    assert len(mapa.imagen.porciones[0]) == 2
+
+def test_estadisticas_por_etapa():
+    pilas.iniciar(usar_motor='sin_ventana')
+    pilas.actores.Mono()
+    pilas.mundo.motor.avanzar(10)
+
+    estadisticas = pilas.mundo.estadisticas()
+    assert estadisticas['actores']['muestras'] == 10
+    assert estadisticas['dibujado_actores']['muestras'] == 1
+    assert estadisticas['dibujado_depurador']['muestras'] == 1
+    assert estadisticas['tareas']['p90'] >= estadisticas['tareas']['p50']
+
+def test_interpolacion_con_varios_valores():
+    pilas.iniciar(usar_motor='sin_ventana')
+    mono = pilas.actores.Mono()
+    mono.x = [10, 20, 30, 40], 1
+
+    # Todos los valores forman una sola interpolacion.
+    assert len(pilas.mundo.tweener.getTweensAffectingObject(mono)) == 1
+
+    pilas.mundo.motor.avanzar(70)
+    assert mono.x == 40
+    assert not pilas.mundo.tweener.hasTweens()
+
+def test_escala_de_tiempo():
+    pilas.iniciar(usar_motor='sin_ventana')
+    mono = pilas.actores.Mono()
+    mono.x = [100], 1
+
+    # En camara lenta 60 cuadros equivalen a medio segundo de juego.
+    pilas.mundo.definir_escala_de_tiempo(0.5)
+    pilas.mundo.motor.avanzar(60)
+    assert abs(mono.x - 50) < 1
+
+    pilas.mundo.pausar()
+    pilas.mundo.motor.avanzar(60)
+    assert abs(mono.x - 50) < 1
+
+def test_cola_de_entrada_combina_movimientos():
+    from pilas import entrada
+
+    pilas.iniciar(usar_motor='sin_ventana')
+    mono = pilas.actores.Mono()
+    mono.aprender(pilas.habilidades.Arrastrable)
+    cola = entrada.ColaDeEntrada(pilas.mundo.perfilador)
+
+    cola.agregar(pilas.eventos.click_de_mouse, "test", x=0, y=0, dx=0, dy=0)
+
+    for x in range(1, 11):
+        cola.agregar(pilas.eventos.mueve_mouse, "test", x=x * 5, y=0, dx=5, dy=0)
+
+    cola.agregar(pilas.eventos.termina_click, "test", x=50, y=0, dx=0, dy=0)
+
+    # Los diez movimientos se combinan en uno solo.
+    assert len(cola) == 3
+    cola.despachar()
+
+    assert mono.x == 50
+    assert pilas.mundo.estadisticas()['eventos_en_cola']['ultimo'] == 3
+
+def test_lote_de_dibujo():
+    pilas.iniciar(ancho=320, alto=240, usar_motor='sin_ventana')
+    motor = pilas.mundo.motor
+    lienzo = motor.obtener_lienzo()
+
+    with lienzo.lote(motor) as lote:
+        lote.rectangulo(0, 0, 10, 10, color=pilas.colores.rojo, relleno=True)
+        lote.rectangulo(-20, 0, 10, 10, color=pilas.colores.rojo, relleno=True)
+        lote.linea(0, 0, 50, 50, color=pilas.colores.verde)
+
+        # Los rectangulos del mismo color se rellenan juntos.
+        assert len(lote.grupos) == 2
+
+    assert not lote.grupos
+
+    # El punto (0, 0) esta en el centro de la ventana.
+    superficie = motor.obtener_imagen_cairo()
+    superficie.flush()
+    indice = 125 * superficie.get_stride() + 165 * 4
+    assert superficie.get_data()[indice + 2] == '\xff'
@@ -0,0 +1,57 @@
+import pilas
+
+def test_politicas_de_tareas_atrasadas():
+    pilas.iniciar(usar_motor='sin_ventana')
+    ejecuciones = []
+
+    todas = pilas.mundo.agregar_tarea_siempre(1, ejecuciones.append, 'todas')
+    saltear = pilas.mundo.agregar_tarea_siempre(1, ejecuciones.append, 'saltear')
+    saltear.politica = 'saltear'
+
+    # Un atraso de casi cuatro segundos.
+    pilas.mundo.tareas.actualizar(4.5)
+
+    assert ejecuciones.count('todas') == 4
+    assert ejecuciones.count('saltear') == 1
+    assert pilas.mundo.tareas.estadisticas()['vencidas'] == 2
+
+def test_eliminar_tareas():
+    pilas.iniciar(usar_motor='sin_ventana')
+    tarea = pilas.mundo.agregar_tarea_una_vez(1, pilas.terminar)
+    tarea.eliminar()
+
+    pilas.mundo.tareas.actualizar(2)
+    assert not pilas.mundo.tareas.hay_tareas_pendientes()
+
+def test_eliminar_tareas_desde_otra_tarea():
+    pilas.iniciar(usar_motor='sin_ventana')
+    ejecuciones = []
+    tareas = [pilas.mundo.agregar_tarea_siempre(1, ejecuciones.append, i) for i in range(100)]
+
+    def eliminar_varias():
+        for tarea in tareas[:60]:
+            tarea.eliminar()
+
+    pilas.mundo.agregar_tarea_una_vez(1, eliminar_varias)
+
+    # Eliminar tantas tareas reconstruye el monticulo mientras se recorre.
+    pilas.mundo.tareas.actualizar(1.1)
+    pilas.mundo.tareas.actualizar(10)
+
+    assert ejecuciones.count(99) == 11
+    assert ejecuciones.count(0) == 1
+    assert pilas.mundo.tareas.canceladas == 0
+    assert len(pilas.mundo.tareas.tareas_planificadas) == 40
+
+def test_tarea_desactivada_no_se_ejecuta():
+    pilas.iniciar(usar_motor='sin_ventana')
+    ejecuciones = []
+    tarea = pilas.mundo.agregar_tarea_siempre(1, ejecuciones.append, 'a')
+    tarea.activa = False
+
+    pilas.mundo.tareas.actualizar(1.5)
+
+    assert ejecuciones == []
+    assert not pilas.mundo.tareas.hay_tareas_pendientes()
+    assert pilas.mundo.tareas.canceladas == 0
+    assert len(pilas.mundo.tareas.tareas_planificadas) == 0
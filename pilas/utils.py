@@ -42,6 +42,179 @@ def es_interpolacion(an_object):
     return isinstance(an_object, interpolaciones.Interpolacion)
 
 
+class IndiceDeRecursos(object):
+    """Recuerda el contenido de los directorios donde se buscan los recursos.
+
+    Los recursos (imagenes, sonidos, mapas...) se buscan en varios
+    directorios, en este orden:
+
+        * el directorio actual.
+        * el directorio del programa que se esta ejecutando.
+        * el directorio 'data'.
+        * el directorio de la biblioteca y su directorio 'data'.
+
+    En lugar de consultar al sistema de archivos en cada carga, el
+    indice lista cada directorio una sola vez y luego resuelve las
+    rutas en memoria. Si un archivo no aparece se vuelven a revisar
+    los directorios que hayan cambiado desde que se listaron.
+    """
+
+    def __init__(self, raices=None):
+        if raices is None:
+            raices = ['./', os.path.dirname(sys.argv[0]), 'data', PATH, PATH + '/data']
+
+        self.raices = raices
+        self.directorios = {}
+        self.rutas = {}
+
+    def construir(self):
+        "Olvida todo lo listado y vuelve a listar los directorios de recursos."
+        self.directorios.clear()
+        self.rutas.clear()
+
+        for raiz in self.raices:
+            self._listar(raiz)
+
+        for directorio, _, _ in os.walk(os.path.join(PATH, 'data')):
+            self._listar(directorio)
+
+    def _listar(self, directorio):
+        "Retorna los nombres de archivo de un directorio, o None si no existe."
+        clave = os.path.abspath(directorio)
+
+        if clave not in self.directorios:
+            try:
+                self.directorios[clave] = (os.stat(clave).st_mtime, set(os.listdir(clave)))
+            except OSError:
+                self.directorios[clave] = None
+
+        entrada = self.directorios[clave]
+
+        if entrada:
+            return entrada[1]
+
+    def refrescar(self):
+        """Descarta los directorios que han cambiado desde que se listaron.
+
+        Retorna True si encontro algun cambio."""
+        cambios = False
+
+        for clave, entrada in self.directorios.items():
+            try:
+                mtime = os.stat(clave).st_mtime
+            except OSError:
+                mtime = None
+
+            if entrada:
+                anterior = entrada[0]
+            else:
+                anterior = None
+
+            if mtime != anterior:
+                del self.directorios[clave]
+                cambios = True
+
+        if cambios:
+            self.rutas.clear()
+
+        return cambios
+
+    def buscar(self, ruta):
+        if ruta in self.rutas:
+            encontrada, revisados = self.rutas[ruta]
+
+            if self._sin_cambios(revisados):
+                return encontrada
+
+            self.refrescar()
+
+        encontrada = self._buscar_en_raices(ruta)
+
+        if encontrada is None and self.refrescar():
+            encontrada = self._buscar_en_raices(ruta)
+
+        if encontrada is None:
+            raise IOError("El archivo '%s' no existe." %(ruta))
+
+        return encontrada
+
+    def _buscar_en_raices(self, ruta):
+        """Busca la ruta en cada raiz y recuerda el resultado.
+
+        Junto con la ruta encontrada se guardan los directorios que se
+        revisaron, para notar si el archivo se borra o si aparece otro
+        con el mismo nombre en un directorio de mayor prioridad."""
+        directorio, nombre = os.path.split(ruta)
+        revisados = []
+
+        for raiz in self.raices:
+            nombres = self._listar(os.path.join(raiz, directorio))
+            clave = os.path.abspath(os.path.join(raiz, directorio))
+            entrada = self.directorios[clave]
+
+            if entrada:
+                revisados.append((clave, entrada[0]))
+            else:
+                revisados.append((clave, None))
+
+            if nombres is not None and nombre in nombres:
+                encontrada = os.path.join(raiz, ruta)
+                self.rutas[ruta] = (encontrada, revisados)
+                return encontrada
+
+    def _sin_cambios(self, revisados):
+        "Indica si los directorios revisados siguen igual que cuando se listaron."
+        for clave, anterior in revisados:
+            try:
+                mtime = os.stat(clave).st_mtime
+            except OSError:
+                mtime = None
+
+            if mtime != anterior:
+                return False
+
+        return True
+
+    def listar(self):
+        """Retorna los nombres de todos los recursos que se pueden cargar.
+
+        La respuesta sale de los directorios que ya estan en el indice,
+        solo se vuelven a listar los que cambiaron desde la ultima vez.
+        Si un mismo nombre aparece en varios directorios solo se tiene
+        en cuenta una vez."""
+        if not self.directorios:
+            self.construir()
+
+        directorios = list(self.directorios)
+
+        if self.refrescar():
+            for clave in directorios:
+                self._listar(clave)
+
+        recursos = set()
+
+        for raiz in self.raices:
+            raiz = os.path.abspath(raiz)
+
+            for clave, entrada in self.directorios.items():
+                if not entrada or (clave != raiz and not clave.startswith(raiz + os.sep)):
+                    continue
+
+                relativo = os.path.relpath(clave, raiz)
+
+                for nombre in entrada[1]:
+                    # Ignora los archivos ocultos y los subdirectorios listados.
+                    if nombre.startswith('.') or os.path.join(clave, nombre) in self.directorios:
+                        continue
+
+                    recursos.add(os.path.normpath(os.path.join(relativo, nombre)))
+
+        return sorted(recursos)
+
+
+indice_de_recursos = IndiceDeRecursos()
+
+
 def obtener_ruta_al_recurso(ruta):
     """Busca la ruta a un archivo de recursos.
 
@@ -49,19 +222,15 @@ def obtener_ruta_al_recurso(ruta):
     directorios (ver docstring de image.load), así que esta
     función intentará dar con el archivo en cuestión.
     """
+    return indice_de_recursos.buscar(ruta)
 
-    dirs = ['./', os.path.dirname(sys.argv[0]), 'data', PATH, PATH + '/data']
-
-
-    for x in dirs:
-        full_path = os.path.join(x, ruta)
-        #DEBUG: print "buscando en: '%s'" %(full_path)
-
-        if os.path.exists(full_path):
-            return full_path
+def listar_recursos():
+    "Retorna una lista con los nombres de todos los recursos disponibles."
+    return indice_de_recursos.listar()
 
-    # Si no ha encontrado el archivo lo reporta.
-    raise IOError("El archivo '%s' no existe." %(ruta))
+def actualizar_indice_de_recursos():
+    "Vuelve a listar los directorios de recursos, por ejemplo luego de copiar archivos."
+    indice_de_recursos.construir()
 
 
 def esta_en_sesion_interactiva():
@@ -93,7 +262,10 @@ def distancia_entre_dos_actores(a, b):
 
 def colisionan(a, b):
     "Retorna True si dos actores estan en contacto."
-    return distancia_entre_dos_actores(a, b) < a.radio_de_colision + b.radio_de_colision
+    dx = a.x - b.x
+    dy = a.y - b.y
+    distancia = a.radio_de_colision + b.radio_de_colision
+    return dx * dx + dy * dy < distancia * distancia
 
 def crear_juego():
     nombre = raw_input("Indica el nombre del juego: ")